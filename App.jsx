@@ -9,35 +9,232 @@ import { Avatar, AvatarFallback, AvatarImage } from '@/components/ui/avatar.jsx'
 import { Separator } from '@/components/ui/separator.jsx'
 import { motion, AnimatePresence } from 'framer-motion'
 import './App.css'
-import data from './assets/data.json'
+
+// Compact list index; each issue's body and comments are a separate shard.
+// The manifest names the current content-hashed index, whose entries name their shards.
+const MANIFEST_URL = '/web_data/manifest.json'
+const dataUrl = (path) => `/web_data/${path}`
+// Full web data, used when web_data/ has not been generated (e.g. a fresh checkout)
+const WEB_DATA_URL = '/web_app_data.json'
+
+const fetchJson = (url, options) => fetch(url, options).then((response) => {
+  if (!response.ok) throw new Error(`${url}: HTTP ${response.status}`)
+  return response.json()
+})
+
+// The list index, or the full web data turned into index entries that are their own detail
+const loadIndex = () => fetchJson(MANIFEST_URL, { cache: 'no-cache' })
+  .then((manifest) => fetchJson(dataUrl(manifest.index)).then((index) => ({ ...index, manifest })))
+  .catch(() => fetchJson(WEB_DATA_URL).then((data) => ({
+    manifest: null,
+    summary: data.summary,
+    issues: data.issues.map((issue) => ({
+      ...issue,
+      goal: issue.project_info.goal,
+      latest_cuevasm_comment_preview: issue.latest_cuevasm_comment
+        ? issue.latest_cuevasm_comment.body.slice(0, 100)
+        : null
+    }))
+  })))
+
+// Used when there is no search index to score against
+const matchesText = (issue, searchTerm) => {
+  const term = searchTerm.toLowerCase()
+  return issue.title.toLowerCase().includes(term) ||
+    issue.applicant.login.toLowerCase().includes(term) ||
+    (issue.goal || '').toLowerCase().includes(term)
+}
+
+// Query matching mirrors SearchIndex.search(prefix=True) in search_index.py,
+// so the dashboard and the query server return the same issues: every word
+// and "quoted phrase" must match, words by stem, except the last word, which
+// also matches any indexed word it begins while it is being typed.
+const PHRASE = /"([^"]*)"/g
+const hasPhrase = (query) => /"[^"]*"/.test(query)
+// search_index.py SUFFIXES and MIN_STEM; keep in step with stem() there
+const STEM_SUFFIXES = [
+  ['ational', 'ate'], ['ization', 'ize'], ['iveness', 'ive'], ['fulness', 'ful'],
+  ['ations', 'ate'], ['ation', 'ate'], ['ments', 'ment'], ['ities', 'ity'],
+  ['sses', 'ss'], ['ies', 'y'], ['ing', ''], ['ed', ''], ['ly', ''], ['es', ''], ['s', '']
+]
+const MIN_STEM = 3
+
+function stem(word) {
+  if (/^[0-9]+$/.test(word)) return word
+  for (const [suffix, replacement] of STEM_SUFFIXES) {
+    if (word.endsWith(suffix) && word.length - suffix.length + replacement.length >= MIN_STEM) {
+      if (suffix === 's' && ['ss', 'us', 'is'].some((end) => word.endsWith(end))) continue
+      if (suffix === 'es' && !['shes', 'ches', 'xes', 'zes'].some((end) => word.endsWith(end))) continue
+      return word.slice(0, word.length - suffix.length) + replacement
+    }
+  }
+  return word
+}
+
+// [position, word] of each word; stop words are dropped but keep their slot
+const tokenize = (index, text) => (text.toLowerCase().match(/[a-z0-9]+/g) || [])
+  .map((word, position) => [position, word])
+  .filter(([, word]) => !index.stop_words.includes(word))
+
+// First position in a sorted array not before value
+function lowerBound(sorted, value) {
+  let lo = 0
+  let hi = sorted.length
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1
+    if (sorted[mid] < value) lo = mid + 1
+    else hi = mid
+  }
+  return lo
+}
+
+function termId(index, term) {
+  const i = lowerBound(index.terms, term)
+  return index.terms[i] === term ? i : -1
+}
+
+function prefixTerms(index, prefix) {
+  const termIds = new Set()
+  for (let i = lowerBound(index.words, prefix); i < index.words.length && index.words[i].startsWith(prefix); i++) {
+    termIds.add(index.word_terms[i])
+  }
+  return [...termIds]
+}
+
+// Weighted occurrence count per issue slot for any of the terms
+function termScores(index, termIds) {
+  const scores = new Map()
+  for (const id of termIds) {
+    for (const entry of index.postings[id]) {
+      scores.set(entry[0], (scores.get(entry[0]) || 0) + index.field_weights[entry[1]] * entry[2])
+    }
+  }
+  return scores
+}
+
+// Absolute positions per "slot:field" of one term, from the word positions file
+function termPositions(index, positions, id) {
+  const decoded = new Map()
+  index.postings[id].forEach((entry, k) => {
+    let position = 0
+    decoded.set(`${entry[0]}:${entry[1]}`, positions.positions[id][k].map((delta) => (position += delta)))
+  })
+  return decoded
+}
+
+// Weighted counts of the phrase's words occurring in order, per issue slot
+function phraseScores(index, positions, phrase) {
+  const scores = new Map()
+  const tokens = tokenize(index, phrase)
+  if (!tokens.length) return scores
+  const ids = tokens.map(([, word]) => termId(index, stem(word)))
+  if (ids.includes(-1)) return scores
+
+  const offsets = tokens.map(([position]) => position - tokens[0][0])
+  const decoded = ids.map((id) => termPositions(index, positions, id))
+  for (const [key, starts] of decoded[0]) {
+    let matches = starts
+    for (let k = 1; k < decoded.length && matches.length; k++) {
+      const following = new Set((decoded[k].get(key) || []).map((position) => position - offsets[k]))
+      matches = matches.filter((position) => following.has(position))
+    }
+    if (matches.length) {
+      const [slot, field] = key.split(':').map(Number)
+      scores.set(slot, (scores.get(slot) || 0) + index.field_weights[field] * matches.length)
+    }
+  }
+  return scores
+}
+
+// Scores of the issues matching the query, by issue number; positions are
+// only read, and only need to be loaded, when the query has a phrase
+function searchScores(index, positions, query) {
+  const clauses = [...query.matchAll(PHRASE)].map((match) => phraseScores(index, positions, match[1]))
+  const words = tokenize(index, query.replace(PHRASE, ' '))
+  words.forEach(([, word], i) => {
+    const typing = i === words.length - 1 && !query.trimEnd().endsWith('"')
+    const id = typing ? -1 : termId(index, stem(word))
+    clauses.push(termScores(index, typing ? prefixTerms(index, word) : id === -1 ? [] : [id]))
+  })
+
+  const scores = new Map()
+  if (!clauses.length) return scores
+  clauses.sort((a, b) => a.size - b.size)
+  for (const [slot, score] of clauses[0]) {
+    let total = score
+    for (const clause of clauses.slice(1)) {
+      if (!clause.has(slot)) {
+        total = null
+        break
+      }
+      total += clause.get(slot)
+    }
+    if (total !== null) scores.set(index.issues[slot], total)
+  }
+  return scores
+}
 
 function App() {
+  const [summary, setSummary] = useState(null)
   const [issues, setIssues] = useState([])
   const [filteredIssues, setFilteredIssues] = useState([])
   const [searchTerm, setSearchTerm] = useState('')
   const [statusFilter, setStatusFilter] = useState('all')
   const [selectedIssue, setSelectedIssue] = useState(null)
   const [loading, setLoading] = useState(true)
+  const [error, setError] = useState(null)
+  const [manifest, setManifest] = useState(null)
+  // null until fetched, false if it could not be loaded
+  const [searchIndex, setSearchIndex] = useState(null)
+  const [searchPositions, setSearchPositions] = useState(null)
 
   useEffect(() => {
-    // Simulate loading and set data
-    setTimeout(() => {
-      setIssues(data.issues)
-      setFilteredIssues(data.issues)
-      setLoading(false)
-    }, 500)
+    // First paint only needs the index
+    loadIndex()
+      .then((index) => {
+        setManifest(index.manifest)
+        setSummary(index.summary)
+        setIssues(index.issues)
+        setFilteredIssues(index.issues)
+      })
+      .catch((err) => setError(err.message))
+      .finally(() => setLoading(false))
   }, [])
 
+  useEffect(() => {
+    // The search index is only fetched once the user starts searching
+    if (searchTerm && manifest && searchIndex === null) {
+      fetchJson(dataUrl(manifest.search))
+        .then(setSearchIndex)
+        .catch(() => setSearchIndex(false))
+    }
+  }, [searchTerm, manifest, searchIndex])
+
+  useEffect(() => {
+    // Word positions are only needed, and fetched, for "quoted phrases"
+    if (hasPhrase(searchTerm) && manifest && searchPositions === null) {
+      fetchJson(dataUrl(manifest.search_positions))
+        .then(setSearchPositions)
+        .catch(() => setSearchPositions(false))
+    }
+  }, [searchTerm, manifest, searchPositions])
+
   useEffect(() => {
     let filtered = issues
 
-    // Filter by search term
+    // Filter by search term, best matches first. While the search index (or
+    // for a phrase, the word positions) is still loading only the status
+    // filter applies.
     if (searchTerm) {
-      filtered = filtered.filter(issue =>
-        issue.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        issue.applicant.login.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        issue.project_info.goal.toLowerCase().includes(searchTerm.toLowerCase())
-      )
+      const phrase = hasPhrase(searchTerm)
+      if (searchIndex && (!phrase || searchPositions)) {
+        const scores = searchScores(searchIndex, searchPositions, searchTerm)
+        filtered = filtered
+          .filter(issue => scores.has(issue.number))
+          .sort((a, b) => scores.get(b.number) - scores.get(a.number) || b.number - a.number)
+      } else if (!manifest || searchIndex === false || (phrase && searchPositions === false)) {
+        filtered = filtered.filter(issue => matchesText(issue, searchTerm))
+      }
     }
 
     // Filter by status
@@ -59,7 +256,7 @@ function App() {
     }
 
     setFilteredIssues(filtered)
-  }, [issues, searchTerm, statusFilter])
+  }, [issues, searchTerm, statusFilter, manifest, searchIndex, searchPositions])
 
   const getStatusBadgeVariant = (type) => {
     switch (type) {
@@ -91,6 +288,17 @@ function App() {
     )
   }
 
+  if (error) {
+    return (
+      <div className="min-h-screen bg-gradient-to-br from-slate-50 to-slate-100 flex items-center justify-center">
+        <div className="text-center">
+          <AlertCircle className="h-12 w-12 text-red-500 mx-auto mb-4" />
+          <p className="text-slate-600">Error loading data: {error}</p>
+        </div>
+      </div>
+    )
+  }
+
   return (
     <div className="min-h-screen bg-gradient-to-br from-slate-50 to-slate-100">
       {/* Header */}
@@ -108,10 +316,10 @@ function App() {
             </div>
             <div className="flex items-center space-x-4">
               <Badge variant="outline" className="hidden sm:flex">
-                {data.summary.total_issues} Issues
+                {summary.total_issues} Issues
               </Badge>
               <Badge variant="outline" className="hidden sm:flex">
-                {data.summary.total_cuevasm_comments} Comments
+                {summary.total_cuevasm_comments} Comments
               </Badge>
             </div>
           </div>
@@ -127,7 +335,7 @@ function App() {
                 <Award className="h-8 w-8 text-green-600" />
                 <div className="ml-4">
                   <p className="text-sm font-medium text-slate-600">Awarded</p>
-                  <p className="text-2xl font-bold text-slate-900">{data.summary.awarded_count}</p>
+                  <p className="text-2xl font-bold text-slate-900">{summary.awarded_count}</p>
                 </div>
               </div>
             </CardContent>
@@ -138,7 +346,7 @@ function App() {
                 <Clock className="h-8 w-8 text-yellow-600" />
                 <div className="ml-4">
                   <p className="text-sm font-medium text-slate-600">In Review</p>
-                  <p className="text-2xl font-bold text-slate-900">{data.summary.in_review_count}</p>
+                  <p className="text-2xl font-bold text-slate-900">{summary.in_review_count}</p>
                 </div>
               </div>
             </CardContent>
@@ -149,7 +357,7 @@ function App() {
                 <AlertCircle className="h-8 w-8 text-slate-600" />
                 <div className="ml-4">
                   <p className="text-sm font-medium text-slate-600">Pending</p>
-                  <p className="text-2xl font-bold text-slate-900">{data.summary.pending_count}</p>
+                  <p className="text-2xl font-bold text-slate-900">{summary.pending_count}</p>
                 </div>
               </div>
             </CardContent>
@@ -160,7 +368,7 @@ function App() {
                 <MessageSquare className="h-8 w-8 text-blue-600" />
                 <div className="ml-4">
                   <p className="text-sm font-medium text-slate-600">Total Comments</p>
-                  <p className="text-2xl font-bold text-slate-900">{data.summary.total_cuevasm_comments}</p>
+                  <p className="text-2xl font-bold text-slate-900">{summary.total_cuevasm_comments}</p>
                 </div>
               </div>
             </CardContent>
@@ -249,7 +457,7 @@ function App() {
                         </div>
                         <CardTitle className="text-lg leading-tight mb-2">{issue.title}</CardTitle>
                         <CardDescription className="line-clamp-2">
-                          {issue.project_info.goal || issue.body_preview}
+                          {issue.goal || issue.body_preview}
                         </CardDescription>
                       </div>
                     </div>
@@ -276,9 +484,9 @@ function App() {
                           <span className="text-sm font-medium text-blue-900">cuevasm's Activity</span>
                         </div>
                         <p className="text-sm text-blue-800">{issue.cuevasm_activity_summary}</p>
-                        {issue.latest_cuevasm_comment && (
+                        {issue.latest_cuevasm_comment_preview && (
                           <p className="text-xs text-blue-600 mt-2 line-clamp-2">
-                            "{issue.latest_cuevasm_comment.body.substring(0, 100)}..."
+                            "{issue.latest_cuevasm_comment_preview}..."
                           </p>
                         )}
                       </div>
@@ -329,7 +537,51 @@ function App() {
 }
 
 // Issue Detail Modal Component
-function IssueDetailModal({ issue, onClose }) {
+function IssueDetailModal({ issue: entry, onClose }) {
+  const [issue, setIssue] = useState(null)
+  const [error, setError] = useState(null)
+
+  useEffect(() => {
+    // Fetch this issue's detail shard only when its card is opened;
+    // entries loaded from the full web data are their own detail
+    if (!entry.detail) {
+      setIssue(entry)
+      return
+    }
+    let cancelled = false
+    setIssue(null)
+    setError(null)
+    fetchJson(dataUrl(entry.detail))
+      .then((shard) => {
+        if (!cancelled) setIssue(shard)
+      })
+      .catch((err) => {
+        if (!cancelled) setError(err.message)
+      })
+    return () => { cancelled = true }
+  }, [entry])
+
+  if (!issue) {
+    return (
+      <div className="fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center p-4 z-50">
+        <div className="bg-white rounded-lg p-8 text-center">
+          {error ? (
+            <>
+              <AlertCircle className="h-8 w-8 text-red-500 mx-auto mb-4" />
+              <p className="text-slate-600 mb-4">Error loading #{entry.number}: {error}</p>
+              <Button variant="outline" onClick={onClose}>Close</Button>
+            </>
+          ) : (
+            <>
+              <div className="animate-spin rounded-full h-8 w-8 border-b-2 border-slate-900 mx-auto mb-4"></div>
+              <p className="text-slate-600">Loading #{entry.number}...</p>
+            </>
+          )}
+        </div>
+      </div>
+    )
+  }
+
   return (
     <div className="fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center p-4 z-50">
       <motion.div
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Artifact Storage
+Reads and writes the issue artifacts shared by the extractor, analyzer and
+processor. Files ending in .jsonl are streamed as JSON Lines (a header record,
+one record per issue, then a summary record); files ending in .db or .sqlite
+are SQLite stores (see sqlite_store.py); anything else is a single JSON
+document with an 'issues' list, as produced by earlier versions.
+
+Issues changed after a JSON Lines file was written (by webhook events) are
+appended after its summary as further issue and removed records, followed
+by a new summary. Readers resolve each issue to its last record, in the
+position of its first, and the last summary wins.
+"""
+
+import json
+import os
+from contextlib import closing
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from sqlite_store import IssueStore, is_sqlite, write_issues
+
+# Directory the pipeline artifacts are read from and written to
+DATA_DIR = os.environ.get('SIP31_DATA_DIR', '.')
+# Extracted issues artifact; e.g. github_issues_data.db keeps them in SQLite
+ISSUES_FILE = os.environ.get('SIP31_ISSUES_FILE', 'github_issues_data.jsonl')
+# Single-document artifact written by earlier versions and shipped with the repository
+LEGACY_ISSUES_FILE = 'github_issues_data.json'
+
+def data_path(name: str, data_dir: Optional[str] = None) -> str:
+    """Path of an artifact inside the data directory"""
+    return os.path.join(data_dir or DATA_DIR, name)
+
+def issues_path(data_dir: Optional[str] = None) -> str:
+    """Path of the issues artifact in the data directory.
+    
+    Until the extractor has written github_issues_data.jsonl, the legacy
+    github_issues_data.json is read instead; a SIP31_ISSUES_FILE set in
+    the environment is always used as given.
+    """
+    path = data_path(ISSUES_FILE, data_dir)
+    if 'SIP31_ISSUES_FILE' not in os.environ and not os.path.exists(path):
+        legacy = data_path(LEGACY_ISSUES_FILE, data_dir)
+        if os.path.exists(legacy):
+            return legacy
+    return path
+
+# Start of a summary line as JsonlWriter writes it; issue records before it need no parsing to find it
+SUMMARY_PREFIX = '{"type": "summary"'
+
+def is_jsonl(path: str) -> bool:
+    return path.endswith('.jsonl')
+
+class JsonlWriter:
+    """Appends issue records to a JSON Lines artifact as they complete.
+    
+    Every record is flushed immediately, so a crashed run leaves a file whose
+    complete lines are all readable.
+    """
+    
+    def __init__(self, path: str, header: Dict[str, Any], mode: str = 'w'):
+        self.path = path
+        self.issue_count = 0
+        self._file = open(path, mode, encoding='utf-8')
+        if mode == 'w':
+            self._write('header', header)
+    
+    def _write(self, record_type: str, data: Dict[str, Any]):
+        self._file.write(json.dumps({'type': record_type, 'data': data}, ensure_ascii=False) + '\n')
+        self._file.flush()
+    
+    def write_issue(self, issue: Dict[str, Any]):
+        self._write('issue', issue)
+        self.issue_count += 1
+    
+    def write_removed(self, number: int):
+        self._write('removed', {'number': number})
+    
+    def close(self, summary: Optional[Dict[str, Any]] = None):
+        if summary is not None:
+            self._write('summary', summary)
+        self._file.close()
+    
+    def __enter__(self) -> 'JsonlWriter':
+        return self
+    
+    def __exit__(self, *exc):
+        if not self._file.closed:
+            self._file.close()
+
+def iter_records(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (type, data) records, stopping at a truncated final line"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-write leaves at most one partial trailing line
+                break
+            yield record['type'], record['data']
+
+def _appended_issues(path: str) -> Dict[int, Optional[Dict[str, Any]]]:
+    """The last record of every issue appended after the first summary; None if it was removed"""
+    appended: Dict[int, Optional[Dict[str, Any]]] = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.startswith(SUMMARY_PREFIX):
+                break
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if record['type'] == 'issue':
+                appended[record['data']['number']] = record['data']
+            elif record['type'] == 'removed':
+                appended[record['data']['number']] = None
+    return appended
+
+def iter_issues(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield issues one at a time from any artifact format"""
+    if is_sqlite(path):
+        with closing(IssueStore(path)) as store:
+            yield from store.iter_issues()
+        return
+    
+    if is_jsonl(path):
+        appended = _appended_issues(path)
+        for record_type, data in iter_records(path):
+            if record_type == 'summary':
+                break
+            if record_type == 'issue':
+                issue = appended.pop(data['number'], data) if appended else data
+                if issue is not None:
+                    yield issue
+        # Issues that were new when they were appended
+        yield from (issue for issue in appended.values() if issue is not None)
+        return
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from json.load(f)['issues']
+
+def read_metadata(path: str) -> Dict[str, Any]:
+    """Everything in an artifact except the issues themselves"""
+    if is_sqlite(path):
+        with closing(IssueStore(path)) as store:
+            return store.read_metadata()
+    
+    if not is_jsonl(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return {key: value for key, value in data.items() if key != 'issues'}
+    
+    metadata: Dict[str, Any] = {}
+    for record_type, data in iter_records(path):
+        if record_type == 'header':
+            metadata.update(data)
+        elif record_type == 'summary':
+            metadata['summary'] = data
+    return metadata
+
+def append_issues(path: str, changed: Iterable[Dict[str, Any]], removed: Iterable[int],
+                  summary: Dict[str, Any]) -> int:
+    """Append changed issues, removed issue numbers and the new summary to a
+    JSON Lines artifact instead of rewriting it; returns the records appended"""
+    with JsonlWriter(path, {}, mode='a') as writer:
+        for issue in changed:
+            writer.write_issue(issue)
+        count = writer.issue_count
+        for number in removed:
+            writer.write_removed(number)
+            count += 1
+        writer.close(summary)
+    return count
+
+def load_artifact(path: str) -> Dict[str, Any]:
+    """Load a whole artifact into the single-document shape"""
+    data = read_metadata(path)
+    data['issues'] = list(iter_issues(path))
+    return data
+
+def write_artifact(path: str, data: Dict[str, Any]):
+    """Write a single-document artifact in the format implied by the path"""
+    if is_sqlite(path):
+        header = {key: value for key, value in data.items() if key not in ('issues', 'summary')}
+        write_issues(path, header, data['issues'])
+        return
+    
+    if not is_jsonl(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        return
+    
+    header = {key: value for key, value in data.items() if key not in ('issues', 'summary')}
+    with JsonlWriter(path, header) as writer:
+        for issue in data['issues']:
+            writer.write_issue(issue)
+        writer.close(data.get('summary'))
+
+def index_issues(path: str) -> List[Tuple[int, int]]:
+    """(issue number, byte offset) of the last record of every issue in a JSON Lines artifact"""
+    index: Dict[int, int] = {}
+    with open(path, 'rb') as f:
+        offset = f.tell()
+        for line in iter(f.readline, b''):
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if record['type'] == 'issue':
+                index[record['data']['number']] = offset
+            elif record['type'] == 'removed':
+                index.pop(record['data']['number'], None)
+            offset = f.tell()
+    return list(index.items())
+
+def read_issue_at(f, offset: int) -> Dict[str, Any]:
+    """Read the issue record starting at a byte offset of an open binary file"""
+    f.seek(offset)
+    return json.loads(f.readline())['data']
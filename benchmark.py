@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Extraction Benchmarks
+Times the extractor against a local stub of the GitHub API, the Markdown
+renderer against the regex-based converter it replaced, and the whole
+extract/analyze/process chain on synthetic repositories of 10^2-10^5 issues
+"""
+
+import argparse
+import contextlib
+import html
+import io
+import json
+import os
+import platform
+import re
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Dict, Any, List, Tuple
+
+import requests
+
+from artifacts import write_artifact
+from comment_analyzer import CommentAnalyzer
+from data_processor import WebDataProcessor
+from github_extractor import COMMENT_STRATEGIES, GitHubExtractor
+from stub_github_server import StubGitHubServer
+from github_graphql import GraphQLBackend, RecordingTransport, ReplayTransport
+from instrumentation import recorder
+from markdown_renderer import MarkdownRenderer
+from query_server import GrantsStore, QueryServer
+from static_output import read_manifest
+from synthetic_repo import generate_repository
+
+DEFAULT_SCALES = [100, 1000, 10000, 100000]
+# Openers without closers, repeated to one long line by the worst-case Markdown benchmark
+UNCLOSED_DELIMITERS = ['*a ', '_a ', '**a ', '~~a ', '`a ', '[a ', '[a](']
+
+def time_extraction(server: StubGitHubServer, max_workers: int, comment_strategy: str = 'per_issue',
+                    backend: str = 'rest', graphql_transport=None) -> Dict[str, Any]:
+    """Run a full extraction against the stub server and time it"""
+    extractor = GitHubExtractor(max_workers=max_workers, comment_strategy=comment_strategy,
+                                backend=backend, graphql_transport=graphql_transport)
+    extractor.base_url = server.url
+    # The stub enforces no secondary limits, so measure raw concurrency
+    extractor.scheduler.min_interval = 0.0
+    
+    server.request_count = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = extractor.extract_all_data()
+    elapsed = time.perf_counter() - start
+    
+    return {
+        'workers': max_workers,
+        'seconds': round(elapsed, 3),
+        'requests': server.request_count,
+        'issues': result['issues']
+    }
+
+def benchmark_comment_fetching(data: Dict[str, Any], workers: int, latency: float) -> Dict[str, Any]:
+    """Compare sequential and concurrent comment fetching on the same data"""
+    with StubGitHubServer(data, latency=latency) as server:
+        sequential = time_extraction(server, 1)
+        concurrent = time_extraction(server, workers)
+    
+    return {
+        'latency_seconds': latency,
+        'sequential_seconds': sequential['seconds'],
+        'concurrent_seconds': concurrent['seconds'],
+        'workers': workers,
+        'requests': concurrent['requests'],
+        'speedup': round(sequential['seconds'] / concurrent['seconds'], 2) if concurrent['seconds'] else None,
+        'identical_output': sequential['issues'] == concurrent['issues']
+    }
+
+def benchmark_comment_strategies(data: Dict[str, Any], latency: float) -> Dict[str, Any]:
+    """Compare per-issue comment listing with one repository-wide listing"""
+    with StubGitHubServer(data, latency=latency) as server:
+        per_issue = time_extraction(server, 1, 'per_issue')
+        repository = time_extraction(server, 1, 'repository')
+    
+    differing = [a['number'] for a, b in zip(per_issue['issues'], repository['issues']) if a != b]
+    
+    return {
+        'per_issue_requests': per_issue['requests'],
+        'per_issue_seconds': per_issue['seconds'],
+        'repository_requests': repository['requests'],
+        'repository_seconds': repository['seconds'],
+        'differing_issues': differing
+    }
+
+def benchmark_backends(data: Dict[str, Any], latency: float) -> Dict[str, Any]:
+    """Compare the REST and GraphQL backends, then replay the recorded
+    GraphQL responses offline"""
+    fixture_file = os.path.join(tempfile.mkdtemp(), 'graphql_fixture.json')
+    
+    with StubGitHubServer(data, latency=latency) as server:
+        rest = time_extraction(server, 1)
+        
+        probe = GitHubExtractor()
+        probe.base_url = server.url
+        probe.scheduler.min_interval = 0.0
+        recording = RecordingTransport(GraphQLBackend(probe)._http_transport, fixture_file)
+        graphql = time_extraction(server, 1, backend='graphql', graphql_transport=recording)
+        recording.save()
+    
+    replay = ReplayTransport(fixture_file)
+    with contextlib.redirect_stdout(io.StringIO()):
+        replayed = GitHubExtractor(backend='graphql', graphql_transport=replay).extract_all_data()
+    
+    return {
+        'rest_requests': rest['requests'],
+        'rest_seconds': rest['seconds'],
+        'graphql_requests': graphql['requests'],
+        'graphql_seconds': graphql['seconds'],
+        'identical_output': rest['issues'] == graphql['issues'],
+        'replay_identical_output': replayed['issues'] == graphql['issues'],
+        'replay_requests': replay.request_count
+    }
+
+def legacy_markdown_to_html(text: str) -> str:
+    """The sequential re.sub converter WebDataProcessor used before MarkdownRenderer"""
+    if not text:
+        return ""
+    
+    text = html.escape(text)
+    text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'__(.*?)__', r'<strong>\1</strong>', text)
+    text = re.sub(r'\*(.*?)\*', r'<em>\1</em>', text)
+    text = re.sub(r'_(.*?)_', r'<em>\1</em>', text)
+    text = re.sub(r'`(.*?)`', r'<code>\1</code>', text)
+    text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2" target="_blank">\1</a>', text)
+    return text.replace('\n', '<br>')
+
+def time_renderer(render, bodies: List[str], repeat: int) -> float:
+    """Best-of-repeat seconds to render every body once"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for body in bodies:
+            render(body)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def benchmark_markdown(data: Dict[str, Any], repeat: int = 20) -> Dict[str, Any]:
+    """Render every issue body and cuevasm comment with both converters"""
+    bodies = []
+    for issue in data['issues']:
+        bodies.append(issue['body'] or '')
+        bodies.extend(comment['body'] for comment in issue['cuevasm_comments'])
+    
+    renderer = MarkdownRenderer()
+    legacy_seconds = time_renderer(legacy_markdown_to_html, bodies, repeat)
+    renderer_seconds = time_renderer(renderer.render, bodies, repeat)
+    
+    # Identifiers and URLs the legacy converter turned into <em> runs
+    underscores = re.compile(r'\w_\w')
+    mangled = sum(1 for body in bodies if underscores.search(body) and '<em>' in legacy_markdown_to_html(body)
+                  and '<em>' not in renderer.render(body))
+    
+    return {
+        'bodies': len(bodies),
+        'characters': sum(len(body) for body in bodies),
+        'legacy_ms': round(legacy_seconds * 1000, 3),
+        'renderer_ms': round(renderer_seconds * 1000, 3),
+        'speedup': round(legacy_seconds / renderer_seconds, 2) if renderer_seconds else None,
+        'bodies_fixed': mangled
+    }
+
+def benchmark_markdown_worst_case(sizes: Tuple[int, int] = (2000, 8000)) -> Dict[str, Any]:
+    """Render runs of delimiters that never close at two lengths
+    
+    A renderer that rescans the rest of the line for every unclosed opener
+    takes 16 times as long for 4 times the input; a linear one about 4.
+    """
+    renderer = MarkdownRenderer()
+    results = {}
+    for pattern in UNCLOSED_DELIMITERS:
+        times = [time_renderer(renderer.render, [pattern * size], 3) for size in sizes]
+        results[pattern] = {
+            'ms': [round(seconds * 1000, 3) for seconds in times],
+            'growth': round(times[1] / times[0], 1) if times[0] else None
+        }
+    return {
+        'sizes': list(sizes),
+        'patterns': results,
+        'linear': all(r['growth'] is not None and r['growth'] < (sizes[1] / sizes[0]) ** 1.5
+                      for r in results.values())
+    }
+
+def benchmark_rebuild(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Analyze the issues and write the split web data twice over, serving
+    the first build from the query server.
+    
+    Nothing changed in between, so the second build should find every
+    hashed file already written and keep the same index name, and the
+    query server should answer the first build's ETags with 304.
+    """
+    builds = []
+    etags: Dict[str, str] = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        issues_file = os.path.join(work_dir, 'github_issues_data.jsonl')
+        analysis_file = os.path.join(work_dir, 'cuevasm_analysis_report.json')
+        web_dir = os.path.join(work_dir, 'web_data')
+        write_artifact(issues_file, data)
+        server = None
+        
+        try:
+            for _ in range(2):
+                start = time.perf_counter()
+                with open(analysis_file, 'w', encoding='utf-8') as f:
+                    json.dump(CommentAnalyzer(issues_file).generate_analysis_report(), f, ensure_ascii=False)
+                with WebDataProcessor(issues_file, analysis_file) as processor:
+                    writer = processor.write_split_web_data(web_dir)
+                build = {
+                    'seconds': round(time.perf_counter() - start, 3),
+                    'files_written': writer.files_written,
+                    'index': read_manifest(web_dir)['index']
+                }
+                
+                if server is None:
+                    server = QueryServer(GrantsStore(web_dir), port=0).start()
+                    paths = ['/api/issues', '/api/summary', '/api/facets', f"/api/issues/{data['issues'][0]['number']}"]
+                    etags = {path: requests.get(server.url + path).headers['ETag'] for path in paths}
+                else:
+                    build['not_modified'] = sum(
+                        requests.get(server.url + path, headers={'If-None-Match': etag}).status_code == 304
+                        for path, etag in etags.items()
+                    )
+                builds.append(build)
+        finally:
+            if server:
+                server.stop()
+    
+    return {
+        'builds': builds,
+        'same_index': builds[0]['index'] == builds[1]['index'],
+        'conditional_requests': len(etags)
+    }
+
+def _phase(seconds: float, issues: int) -> Dict[str, Any]:
+    return {
+        'seconds': round(seconds, 3),
+        'issues_per_second': round(issues / seconds, 1) if seconds else None,
+        'peak_rss_bytes': recorder.peak_memory()
+    }
+
+def benchmark_scale_point(issue_count: int, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate one synthetic repository, then time extraction from the stub,
+    analysis and web processing on it.
+    
+    Runs in a fresh process per size, so peak memory belongs to this size
+    alone; it is read after each phase and only ever grows.
+    """
+    data = generate_repository(issue_count, seed=options['seed'], mean_comments=options['mean_comments'],
+                               body_size=options['body_size'])
+    comments = sum(issue['total_comments'] for issue in data['issues'])
+    point = {
+        'issues': issue_count,
+        'comments': comments,
+        'reviewer_comments': data['summary']['total_cuevasm_comments'],
+        'body_characters': sum(len(issue['body']) for issue in data['issues'])
+    }
+    
+    with tempfile.TemporaryDirectory() as work_dir:
+        with StubGitHubServer(data) as server:
+            extractor = GitHubExtractor(max_workers=options['workers'], comment_strategy=options['comment_strategy'])
+            extractor.base_url = server.url
+            extractor.scheduler.min_interval = 0.0
+            recorder.reset()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                result = extractor.extract_all_data()
+            point['extract'] = _phase(time.perf_counter() - start, issue_count)
+            http = recorder.report()['http']
+            point['extract'].update(requests=http['requests'], response_bytes=http['bytes'])
+        del data
+        
+        issues_file = os.path.join(work_dir, 'github_issues_data.jsonl')
+        analysis_file = os.path.join(work_dir, 'cuevasm_analysis_report.json')
+        write_artifact(issues_file, result)
+        del result
+        
+        start = time.perf_counter()
+        report = CommentAnalyzer(issues_file).generate_analysis_report()
+        point['analyze'] = _phase(time.perf_counter() - start, issue_count)
+        with open(analysis_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False)
+        del report
+        
+        start = time.perf_counter()
+        with WebDataProcessor(issues_file, analysis_file) as processor:
+            web_data = processor.process_for_web()
+        point['process'] = _phase(time.perf_counter() - start, issue_count)
+        point['process']['web_issues'] = len(web_data['issues'])
+    
+    return point
+
+def git_revision() -> str:
+    """Commit the benchmark ran against, or None outside a git checkout"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def benchmark_scaling(scales: List[int], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run every scale point, each in its own process, and describe the run"""
+    run = {
+        'started_at': datetime.now().isoformat(),
+        'label': options.get('label'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'options': {key: value for key, value in options.items() if key != 'label'},
+        'points': []
+    }
+    
+    for issue_count in scales:
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            point = executor.submit(benchmark_scale_point, issue_count, options).result()
+        run['points'].append(point)
+        print(f"{issue_count:>7} issues: " + ", ".join(
+            f"{phase} {point[phase]['seconds']}s ({point[phase]['issues_per_second']}/s)"
+            for phase in ('extract', 'analyze', 'process'))
+            + f", peak {point['process']['peak_rss_bytes'] / 2 ** 20:.0f} MiB")
+    
+    return run
+
+def append_results(results_file: str, run: Dict[str, Any]):
+    """Add a run to the results history, so throughput can be compared across versions"""
+    history = {'runs': []}
+    if os.path.exists(results_file):
+        with open(results_file, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+    history['runs'].append(run)
+    with open(results_file, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2, ensure_ascii=False)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the extractor against a local GitHub stub')
+    parser.add_argument('--data', default='github_issues_data.json', help='Extracted data served by the stub')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent comment fetch workers')
+    parser.add_argument('--latency', type=float, default=0.05, help='Simulated per-request latency in seconds')
+    parser.add_argument('--markdown-only', action='store_true', help='Only run the offline Markdown rendering benchmark')
+    parser.add_argument('--scale', type=int, nargs='*', metavar='ISSUES',
+                        help=f"Run the synthetic scaling suite instead, at these issue counts "
+                             f"(default: {' '.join(map(str, DEFAULT_SCALES))})")
+    parser.add_argument('--results', default='benchmark_results.json',
+                        help='Scaling suite results history; each run is appended')
+    parser.add_argument('--label', help='Name recorded with the scaling run, e.g. a version')
+    parser.add_argument('--seed', type=int, default=31, help='Synthetic repository seed')
+    parser.add_argument('--mean-comments', type=float, default=5.0, help='Mean comments per synthetic issue')
+    parser.add_argument('--body-size', type=int, default=4000, help='Approximate synthetic issue body length')
+    parser.add_argument('--comment-strategy', choices=COMMENT_STRATEGIES, default='repository',
+                        help='How the scaling suite fetches comments (per_issue makes one request per issue)')
+    args = parser.parse_args()
+    
+    if args.scale is not None:
+        options = {
+            'label': args.label,
+            'seed': args.seed,
+            'mean_comments': args.mean_comments,
+            'body_size': args.body_size,
+            'comment_strategy': args.comment_strategy,
+            'workers': args.workers
+        }
+        print("=== SCALING BENCHMARK ===")
+        run = benchmark_scaling(args.scale or DEFAULT_SCALES, options)
+        append_results(args.results, run)
+        print(f"\nResults appended to: {args.results}")
+        return
+    
+    with open(args.data, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    result = benchmark_markdown(data)
+    
+    print("=== MARKDOWN RENDER BENCHMARK ===")
+    print(f"Bodies: {result['bodies']} ({result['characters']} characters)")
+    print(f"Regex passes: {result['legacy_ms']}ms")
+    print(f"Single-pass renderer: {result['renderer_ms']}ms ({result['speedup']}x)")
+    print(f"Bodies with snake_case/URL underscores no longer mangled: {result['bodies_fixed']}")
+    
+    worst = benchmark_markdown_worst_case()
+    small, large = worst['sizes']
+    print(f"Unclosed delimiters, {small} vs {large} repeats on one line:")
+    for pattern, timing in worst['patterns'].items():
+        print(f"  {pattern!r}: {timing['ms'][0]}ms -> {timing['ms'][1]}ms ({timing['growth']}x)")
+    print(f"Linear in the text length: {worst['linear']}")
+    
+    if args.markdown_only:
+        return
+    
+    print()
+    result = benchmark_rebuild(data)
+    
+    print("=== REBUILD BENCHMARK ===")
+    for run, build in enumerate(result['builds'], 1):
+        print(f"Build {run}: {build['seconds']}s, {build['files_written']} files written, {build['index']}")
+    print(f"Same index name: {result['same_index']}")
+    print(f"Query server answers the first build's ETags with 304: "
+          f"{result['builds'][1]['not_modified']}/{result['conditional_requests']}")
+    
+    print()
+    result = benchmark_comment_fetching(data, args.workers, args.latency)
+    
+    print("=== COMMENT FETCH BENCHMARK ===")
+    print(f"Requests per run: {result['requests']}")
+    print(f"Sequential: {result['sequential_seconds']}s")
+    print(f"Concurrent ({result['workers']} workers): {result['concurrent_seconds']}s")
+    print(f"Speedup: {result['speedup']}x")
+    print(f"Identical output: {result['identical_output']}")
+    
+    result = benchmark_comment_strategies(data, args.latency)
+    
+    print("\n=== COMMENT STRATEGY BENCHMARK ===")
+    print(f"Per-issue: {result['per_issue_requests']} requests, {result['per_issue_seconds']}s")
+    print(f"Repository-wide: {result['repository_requests']} requests, {result['repository_seconds']}s")
+    print(f"Issues that differ: {result['differing_issues'] or 'none'}")
+    
+    result = benchmark_backends(data, args.latency)
+    
+    print("\n=== BACKEND BENCHMARK ===")
+    print(f"REST: {result['rest_requests']} requests, {result['rest_seconds']}s")
+    print(f"GraphQL: {result['graphql_requests']} requests, {result['graphql_seconds']}s")
+    print(f"Identical output: {result['identical_output']}")
+    print(f"Offline replay: {result['replay_requests']} recorded responses, identical output: {result['replay_identical_output']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Extraction Checkpoints
+Append-only log of every API page an extraction has completed, so a run
+that dies halfway can be resumed without refetching those pages
+"""
+
+import json
+import os
+import threading
+from typing import List, Dict, Any, Optional
+
+class ExtractionCheckpoint:
+    """Records completed pages keyed by request URL and query.
+    
+    Each completed page is appended as one JSON line and flushed, so the log
+    survives a crash up to its last complete line. Only a key -> byte offset
+    index is kept in memory; page contents are read back on demand.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._offsets: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        
+        if os.path.exists(path):
+            self._load_index()
+        
+        self._file = open(path, 'ab')
+    
+    def _load_index(self):
+        with open(self.path, 'rb') as f:
+            offset = f.tell()
+            for line in iter(f.readline, b''):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                self._offsets[record['key']] = offset
+                offset = f.tell()
+        
+        # Cut off a torn final line so new records start on a fresh line
+        if os.path.getsize(self.path) != offset:
+            with open(self.path, 'r+b') as f:
+                f.truncate(offset)
+    
+    @property
+    def completed_pages(self) -> int:
+        return len(self._offsets)
+    
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the recorded page for a key, or None if it was never completed"""
+        with self._lock:
+            offset = self._offsets.get(key)
+            if offset is None:
+                return None
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                return json.loads(f.readline())['items']
+    
+    def put(self, key: str, items: List[Dict[str, Any]]):
+        """Record a completed page"""
+        line = (json.dumps({'key': key, 'items': items}, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+            self._offsets[key] = offset
+    
+    def close(self):
+        self._file.close()
+    
+    def discard(self):
+        """Remove the log once the extraction it covers has completed"""
+        self.close()
+        os.remove(self.path)
@@ -4,19 +4,343 @@ Comment Analyzer for cuevasm's GitHub Comments
 Processes and analyzes cuevasm's comments to extract insights and patterns
 """
 
+import argparse
 import json
 import re
+from array import array
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from collections import Counter
 
+from artifacts import data_path, issues_path, iter_issues, read_metadata
+from comment_table import review_throughput
+from instrumentation import timed
+from parallel import chunked, ordered_map
+from sqlite_store import IssueStore, is_sqlite
+from timestamps import to_epoch, to_iso
+
+# Common decision-making keywords counted across all comments
+DECISION_KEYWORDS = [
+    'approved', 'denied', 'rejected', 'accepted', 'awarded', 'granted',
+    'needs', 'requires', 'missing', 'incomplete', 'complete',
+    'good', 'excellent', 'strong', 'weak', 'concerns', 'issues',
+    'budget', 'funding', 'amount', 'timeline', 'milestone',
+    'team', 'experience', 'track record', 'previous work',
+    'impact', 'value', 'benefit', 'risk', 'feasible'
+]
+
+# Comment categories, checked in order; the first rule with a hit wins
+CATEGORY_RULES = [
+    ('approvals', ['approved', 'awarded', 'granted', 'accepted', 'looks good', 'lgtm']),
+    ('rejections', ['rejected', 'denied', 'not approved', 'cannot approve']),
+    ('requests_for_info', ['need more', 'please provide', 'missing', 'incomplete', 'clarify']),
+    ('questions', ['?', 'what', 'how', 'when', 'where', 'why']),
+    ('status_updates', ['update', 'progress', 'status', 'milestone', 'completed']),
+    ('feedback', ['feedback', 'suggestion', 'recommend', 'consider', 'think'])
+]
+CATEGORIES = ['approvals', 'rejections', 'requests_for_info', 'feedback', 'status_updates', 'questions', 'other']
+
+# Decision status read from the latest comment on an issue, checked in order
+DECISION_RULES = [
+    ('approved', ['approved', 'awarded', 'granted']),
+    ('rejected', ['rejected', 'denied']),
+    ('needs_info', ['need more', 'missing', 'incomplete'])
+]
+DECISION_STATUSES = [name for name, _ in DECISION_RULES] + ['pending']
+
+class KeywordScanner:
+    """Finds every keyword occurrence in a text in a single regex pass.
+    
+    All terms are compiled into one alternation (longest first) inside a
+    lookahead, so overlapping terms such as 'not approved' and 'approved'
+    are both counted. Terms must start at a word boundary and may end in a
+    plural or verb suffix, so 'milestones', 'updated' and 'thinking' count while
+    'needs' no longer matches inside longer words; punctuation terms like
+    '?' match anywhere.
+    """
+    
+    SUFFIXES = ('s', 'es', 'd', 'ed', 'ing')
+    
+    def __init__(self, terms):
+        self.terms = sorted(set(terms), key=len, reverse=True)
+        # Counts are returned as an array indexed by each term's position here
+        self.positions = {term: position for position, term in enumerate(self.terms)}
+        suffix = '(?:' + '|'.join(self.SUFFIXES) + r')?\b'
+        alternatives = []
+        for term in self.terms:
+            start = r'\b' if term[0].isalnum() else ''
+            # The suffix is checked in a lookahead so the captured text is the term itself
+            end = f'(?={suffix})' if term[-1].isalnum() else ''
+            alternatives.append(start + re.escape(term) + end)
+        self.pattern = re.compile('(?=(' + '|'.join(alternatives) + '))')
+        # 'completed' is also an occurrence of 'complete', which the longer
+        # alternative hides at the same position
+        self.implied = {
+            term: [self.positions[other] for other in self.terms
+                   if term[len(other):] in self.SUFFIXES and term.startswith(other)]
+            for term in self.terms
+        }
+    
+    def scan(self, text: str) -> array:
+        """Occurrences of each term in the text (case-insensitive), in term order"""
+        # 'I' rather than 'H': a 65536-character comment of '?' would overflow 16 bits
+        hits = array('I', bytes(4 * len(self.terms)))
+        positions = self.positions
+        implied = self.implied
+        for match in self.pattern.finditer(text.lower()):
+            term = match.group(1)
+            hits[positions[term]] += 1
+            for position in implied[term]:
+                hits[position] += 1
+        return hits
+    
+    def rule_positions(self, rules) -> List[Tuple[str, List[int]]]:
+        """(name, term positions) of each rule, for first_matching_rule"""
+        return [(name, [self.positions[term] for term in terms]) for name, terms in rules]
+
+def first_matching_rule(rules, hits: array, default: str) -> str:
+    """Name of the first rule with any term present in the hits"""
+    for name, positions in rules:
+        if any(hits[position] for position in positions):
+            return name
+    return default
+
+# One scanner shared by every analysis over comment bodies
+SCANNER = KeywordScanner(
+    DECISION_KEYWORDS
+    + [term for _, terms in CATEGORY_RULES for term in terms]
+    + [term for _, terms in DECISION_RULES for term in terms]
+)
+CATEGORY_POSITIONS = SCANNER.rule_positions(CATEGORY_RULES)
+DECISION_POSITIONS = SCANNER.rule_positions(DECISION_RULES)
+KEYWORD_POSITIONS = [(keyword, SCANNER.positions[keyword]) for keyword in DECISION_KEYWORDS]
+
+class CommentFeatures:
+    """Everything the report sections need from one comment, computed once.
+    
+    hits is the scanner's array of term counts (see KeywordScanner.scan).
+    """
+    
+    __slots__ = ('comment_id', 'issue_number', 'created', 'length', 'hits', 'category', 'decision')
+    
+    def __init__(self, comment: Dict[str, Any], issue_number: int):
+        hits = SCANNER.scan(comment['body'])
+        
+        self.comment_id = comment['id']
+        self.issue_number = issue_number
+        # Epoch seconds: compared and subtracted as integers
+        self.created = to_epoch(comment['created_at'])
+        self.length = len(comment['body'])
+        self.hits = hits
+        self.category = first_matching_rule(CATEGORY_POSITIONS, hits, 'other')
+        # Decision this comment implies if it is the latest on its issue
+        self.decision = first_matching_rule(DECISION_POSITIONS, hits, 'pending')
+    
+    def hit_counts(self) -> Dict[str, int]:
+        """The terms found in the comment and how often"""
+        return {term: self.hits[position] for term, position in SCANNER.positions.items() if self.hits[position]}
+
+class AnalysisAggregate:
+    """Report totals built from per-issue fragments (see CommentAnalyzer.issue_fragment).
+    
+    Sums (keyword hits, category and decision counts, comment lengths) are
+    kept as running totals, so replacing or removing one issue's fragment
+    patches them without rescanning any other issue.
+    """
+    
+    def __init__(self, fragments: Optional[Dict[int, Dict[str, Any]]] = None,
+                 totals: Optional[Dict[str, Any]] = None):
+        self.fragments: Dict[int, Dict[str, Any]] = {}
+        self.totals = {
+            'issues': 0,
+            'issues_with_comments': 0,
+            'comments': 0,
+            'length_total': 0,
+            'keyword_hits': Counter(),
+            'categories': Counter(),
+            'decisions': Counter(),
+            'reviewer_comments': Counter(),
+            'reviewer_issues': Counter()
+        }
+        if totals is None:
+            for fragment in (fragments or {}).values():
+                self.add(fragment)
+        else:
+            self.fragments.update(fragments or {})
+            self.totals.update(totals)
+            for key in ('keyword_hits', 'categories', 'decisions', 'reviewer_comments', 'reviewer_issues'):
+                self.totals[key] = Counter(totals[key])
+    
+    def _apply(self, fragment: Dict[str, Any], sign: int):
+        totals = self.totals
+        totals['issues'] += sign
+        totals['issues_with_comments'] += sign if fragment['comment_count'] else 0
+        totals['comments'] += sign * fragment['comment_count']
+        totals['length_total'] += sign * fragment['length_total']
+        for keyword, count in fragment['keyword_hits'].items():
+            totals['keyword_hits'][keyword] += sign * count
+        for category, comments in fragment['categories'].items():
+            totals['categories'][category] += sign * len(comments)
+        if fragment['summary']:
+            totals['decisions'][fragment['summary']['decision_status']] += sign
+        for reviewer, count in fragment['reviewer_comments'].items():
+            totals['reviewer_comments'][reviewer] += sign * count
+            totals['reviewer_issues'][reviewer] += sign
+    
+    def add(self, fragment: Dict[str, Any]):
+        """Add an issue's fragment, replacing any previous one for that issue"""
+        self.remove(fragment['issue_number'])
+        self.fragments[fragment['issue_number']] = fragment
+        self._apply(fragment, 1)
+    
+    def remove(self, issue_number: int):
+        """Subtract an issue's fragment from the totals"""
+        fragment = self.fragments.pop(issue_number, None)
+        if fragment:
+            self._apply(fragment, -1)
+    
+    def report(self, issue_order: Optional[Iterable[int]] = None) -> Dict[str, Any]:
+        """Assemble the analysis report; list sections follow issue_order"""
+        totals = self.totals
+        order = [number for number in (issue_order or self.fragments) if number in self.fragments]
+        active = [self.fragments[number] for number in order if self.fragments[number]['comment_count']]
+        
+        hits = totals['keyword_hits']
+        keyword_counts = {keyword: hits[keyword] for keyword in DECISION_KEYWORDS if hits[keyword] > 0}
+        
+        earliest = min((f['earliest'] for f in active), default=None)
+        latest = max((f['latest'] for f in active), default=None)
+        date_range = (latest - earliest) // 86400 if earliest is not None else 0
+        
+        patterns = {
+            'total_comments': totals['comments'],
+            'keyword_frequency': dict(sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)),
+            'average_comment_length': round(totals['length_total'] / totals['comments'], 2) if totals['comments'] else 0,
+            'comment_length_range': {
+                'min': min((f['length_min'] for f in active), default=0),
+                'max': max((f['length_max'] for f in active), default=0)
+            },
+            'temporal_analysis': {
+                'earliest_comment': to_iso(earliest) if earliest is not None else None,
+                'latest_comment': to_iso(latest) if latest is not None else None,
+                'activity_span_days': date_range
+            }
+        }
+        
+        categories = {
+            category: [comment for f in active for comment in f['categories'].get(category, [])]
+            for category in CATEGORIES
+        }
+        summaries = sorted((f['summary'] for f in active if f['summary']), key=lambda x: x['issue_number'])
+        throughput = review_throughput(self.fragments[number] for number in order)
+        
+        report = {
+            'analysis_date': datetime.now().isoformat(),
+            'overview': {
+                'total_issues_analyzed': totals['issues'],
+                'issues_with_cuevasm_comments': totals['issues_with_comments'],
+                'total_cuevasm_comments': totals['comments']
+            },
+            'comment_patterns': patterns,
+            'comment_categories': {category: totals['categories'][category] for category in CATEGORIES},
+            'decision_analysis': {
+                status: totals['decisions'][status] for status in DECISION_STATUSES if totals['decisions'][status]
+            },
+            'issue_summaries': summaries,
+            'detailed_categories': categories,
+            'reviewer_activity': {
+                reviewer: {'comments': totals['reviewer_comments'][reviewer], 'issues': totals['reviewer_issues'][reviewer]}
+                for reviewer in sorted(totals['reviewer_comments']) if totals['reviewer_comments'][reviewer]
+            }
+        }
+        if throughput is not None:
+            report['review_throughput'] = throughput
+        return report
+    
+    def to_state(self) -> Dict[str, Any]:
+        """JSON-serializable form, restored with AnalysisAggregate(**state)"""
+        return {'fragments': self.fragments, 'totals': self.totals}
+
 class CommentAnalyzer:
-    def __init__(self, data_file: str):
-        with open(data_file, 'r', encoding='utf-8') as f:
-            self.data = json.load(f)
+    def __init__(self, data_file: str, reviewers: Optional[List[str]] = None, processes: int = 1):
+        self.data = read_metadata(data_file)
+        # Analyze only these reviewers' comments (all extracted reviewers if None)
+        self.reviewers = reviewers
+        
+        # Issues are streamed in one at a time; their bodies are not needed for
+        # comment analysis, so memory grows with comments rather than bodies
+        self._load(iter_issues(data_file), processes)
+        
+        if is_sqlite(data_file) and reviewers is None:
+            # Keep the per-comment features queryable next to the comments
+            with IssueStore(data_file) as store:
+                store.save_comment_features(self.features)
+    
+    @classmethod
+    def from_issues(cls, issues: Iterable[Dict[str, Any]], metadata: Dict[str, Any],
+                    processes: int = 1) -> 'CommentAnalyzer':
+        """Analyzer over issues already in memory, e.g. only the ones that changed"""
+        analyzer = cls.__new__(cls)
+        analyzer.data = metadata
+        analyzer.reviewers = None
+        analyzer._load(issues, processes)
+        return analyzer
+    
+    def comment_reviewer(self, comment: Dict[str, Any]) -> str:
+        """Who wrote a comment; artifacts from before reviewer tagging only had target_user"""
+        return comment.get('reviewer') or self.data['target_user']
+    
+    def _select(self, issue: Dict[str, Any]) -> Dict[str, Any]:
+        """An issue as the analyzer keeps it: no body, and only the selected reviewers' comments"""
+        issue = {key: value for key, value in issue.items() if key != 'body'}
+        if self.reviewers is not None:
+            issue['cuevasm_comments'] = [
+                comment for comment in issue['cuevasm_comments']
+                if self.comment_reviewer(comment) in self.reviewers
+            ]
+            issue['cuevasm_comment_count'] = len(issue['cuevasm_comments'])
+        return issue
+    
+    @timed('analyzer.scan')
+    def _load(self, issues: Iterable[Dict[str, Any]], processes: int = 1):
+        # Fragments are only precomputed when workers produced them
+        self._fragments = None
+        if processes > 1:
+            self._load_parallel(issues, processes)
+            return
+        
+        self.issues = [self._select(issue) for issue in issues]
+        self.cuevasm_comments = self._extract_all_cuevasm_comments()
+        
+        # Scan and parse every comment once; all report sections read these
+        self.features = [CommentFeatures(c, c['issue_number']) for c in self.cuevasm_comments]
+        self.features_by_id = {f.comment_id: f for f in self.features}
+        self.comments_by_id = {c['id']: c for c in self.cuevasm_comments}
+    
+    def _load_parallel(self, issues: Iterable[Dict[str, Any]], processes: int):
+        """Scan comments and build issue fragments in worker processes.
+        
+        Chunks come back in issue order, so features and fragments line up
+        exactly as a serial load would produce them.
+        """
+        self.issues = []
+        
+        def selected() -> Iterable[Dict[str, Any]]:
+            for issue in issues:
+                issue = self._select(issue)
+                self.issues.append(issue)
+                yield issue
+        
+        self.features = []
+        self._fragments = []
+        for features, fragments in ordered_map(_analyze_chunk, chunked(selected()), processes,
+                                               initializer=_init_worker, initargs=(self.data,)):
+            self.features.extend(features)
+            self._fragments.extend(fragments)
         
-        self.issues = self.data['issues']
         self.cuevasm_comments = self._extract_all_cuevasm_comments()
+        self.features_by_id = {f.comment_id: f for f in self.features}
+        self.comments_by_id = {c['id']: c for c in self.cuevasm_comments}
     
     def _extract_all_cuevasm_comments(self) -> List[Dict[str, Any]]:
         """Extract all cuevasm comments with issue context"""
@@ -35,179 +359,106 @@ class CommentAnalyzer:
         
         return all_comments
     
-    def analyze_comment_patterns(self) -> Dict[str, Any]:
-        """Analyze patterns in cuevasm's comments"""
-        
-        # Keywords analysis
-        all_text = ' '.join([comment['body'].lower() for comment in self.cuevasm_comments])
-        
-        # Common decision-making keywords
-        decision_keywords = [
-            'approved', 'denied', 'rejected', 'accepted', 'awarded', 'granted',
-            'needs', 'requires', 'missing', 'incomplete', 'complete',
-            'good', 'excellent', 'strong', 'weak', 'concerns', 'issues',
-            'budget', 'funding', 'amount', 'timeline', 'milestone',
-            'team', 'experience', 'track record', 'previous work',
-            'impact', 'value', 'benefit', 'risk', 'feasible'
-        ]
-        
-        keyword_counts = {}
-        for keyword in decision_keywords:
-            count = all_text.count(keyword)
-            if count > 0:
-                keyword_counts[keyword] = count
-        
-        # Comment length analysis
-        comment_lengths = [len(comment['body']) for comment in self.cuevasm_comments]
-        avg_length = sum(comment_lengths) / len(comment_lengths) if comment_lengths else 0
-        
-        # Temporal analysis
-        comment_dates = [datetime.fromisoformat(comment['created_at'].replace('Z', '+00:00')) 
-                        for comment in self.cuevasm_comments]
-        
-        if comment_dates:
-            earliest = min(comment_dates)
-            latest = max(comment_dates)
-            date_range = (latest - earliest).days
-        else:
-            earliest = latest = None
-            date_range = 0
+    def summarize_issue(self, issue: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Summary of cuevasm's involvement in one issue, or None without comments"""
+        if issue['cuevasm_comment_count'] == 0:
+            return None
         
-        return {
-            'total_comments': len(self.cuevasm_comments),
-            'keyword_frequency': dict(sorted(keyword_counts.items(), key=lambda x: x[1], reverse=True)),
-            'average_comment_length': round(avg_length, 2),
-            'comment_length_range': {
-                'min': min(comment_lengths) if comment_lengths else 0,
-                'max': max(comment_lengths) if comment_lengths else 0
-            },
-            'temporal_analysis': {
-                'earliest_comment': earliest.isoformat() if earliest else None,
-                'latest_comment': latest.isoformat() if latest else None,
-                'activity_span_days': date_range
-            }
-        }
-    
-    def categorize_comments(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Categorize comments by type/intent"""
-        categories = {
-            'approvals': [],
-            'rejections': [],
-            'requests_for_info': [],
-            'feedback': [],
-            'status_updates': [],
-            'questions': [],
-            'other': []
-        }
+        # Analyze cuevasm's comments for this issue
+        comments = issue['cuevasm_comments']
         
-        for comment in self.cuevasm_comments:
-            body_lower = comment['body'].lower()
-            
-            # Approval indicators
-            if any(word in body_lower for word in ['approved', 'awarded', 'granted', 'accepted', 'looks good', 'lgtm']):
-                categories['approvals'].append(comment)
-            
-            # Rejection indicators
-            elif any(word in body_lower for word in ['rejected', 'denied', 'not approved', 'cannot approve']):
-                categories['rejections'].append(comment)
-            
-            # Request for information
-            elif any(word in body_lower for word in ['need more', 'please provide', 'missing', 'incomplete', 'clarify']):
-                categories['requests_for_info'].append(comment)
-            
-            # Questions
-            elif '?' in comment['body'] or any(word in body_lower for word in ['what', 'how', 'when', 'where', 'why']):
-                categories['questions'].append(comment)
-            
-            # Status updates
-            elif any(word in body_lower for word in ['update', 'progress', 'status', 'milestone', 'completed']):
-                categories['status_updates'].append(comment)
-            
-            # Feedback
-            elif any(word in body_lower for word in ['feedback', 'suggestion', 'recommend', 'consider', 'think']):
-                categories['feedback'].append(comment)
-            
-            else:
-                categories['other'].append(comment)
-        
-        return categories
-    
-    def generate_issue_summaries(self) -> List[Dict[str, Any]]:
-        """Generate summaries for each issue with cuevasm's involvement"""
-        summaries = []
+        # Determine decision status
+        latest_comment = max(comments, key=lambda x: self.features_by_id[x['id']].created)
+        decision_status = self.features_by_id[latest_comment['id']].decision
         
-        for issue in self.issues:
-            if issue['cuevasm_comment_count'] > 0:
-                # Analyze cuevasm's comments for this issue
-                comments = issue['cuevasm_comments']
-                
-                # Determine decision status
-                decision_status = 'pending'
-                latest_comment = max(comments, key=lambda x: x['created_at'])
-                latest_body = latest_comment['body'].lower()
-                
-                if any(word in latest_body for word in ['approved', 'awarded', 'granted']):
-                    decision_status = 'approved'
-                elif any(word in latest_body for word in ['rejected', 'denied']):
-                    decision_status = 'rejected'
-                elif any(word in latest_body for word in ['need more', 'missing', 'incomplete']):
-                    decision_status = 'needs_info'
-                
-                # Extract key themes from comments
-                all_comment_text = ' '.join([c['body'] for c in comments])
-                
-                summary = {
-                    'issue_number': issue['number'],
-                    'title': issue['title'],
-                    'state': issue['state'],
-                    'labels': issue['labels'],
-                    'applicant': issue['user']['login'],
-                    'cuevasm_comment_count': issue['cuevasm_comment_count'],
-                    'decision_status': decision_status,
-                    'latest_cuevasm_comment': latest_comment,
-                    'first_cuevasm_comment': min(comments, key=lambda x: x['created_at']),
-                    'comment_summary': all_comment_text[:200] + '...' if len(all_comment_text) > 200 else all_comment_text,
-                    'html_url': issue['html_url']
-                }
-                
-                summaries.append(summary)
+        # Extract key themes from comments
+        all_comment_text = ' '.join([c['body'] for c in comments])
         
-        return sorted(summaries, key=lambda x: x['issue_number'])
+        return {
+            'issue_number': issue['number'],
+            'title': issue['title'],
+            'state': issue['state'],
+            'labels': issue['labels'],
+            'applicant': issue['user']['login'],
+            'cuevasm_comment_count': issue['cuevasm_comment_count'],
+            'decision_status': decision_status,
+            'latest_cuevasm_comment': latest_comment,
+            'first_cuevasm_comment': min(comments, key=lambda x: self.features_by_id[x['id']].created),
+            'comment_summary': all_comment_text[:200] + '...' if len(all_comment_text) > 200 else all_comment_text,
+            'html_url': issue['html_url']
+        }
     
-    def generate_analysis_report(self) -> Dict[str, Any]:
-        """Generate comprehensive analysis report"""
-        patterns = self.analyze_comment_patterns()
-        categories = self.categorize_comments()
-        summaries = self.generate_issue_summaries()
+    @timed('analyzer.issue_fragment')
+    def issue_fragment(self, issue: Dict[str, Any]) -> Dict[str, Any]:
+        """One issue's contribution to every report section (see AnalysisAggregate)"""
+        features = [self.features_by_id[comment['id']] for comment in issue['cuevasm_comments']]
         
-        # Category statistics
-        category_stats = {cat: len(comments) for cat, comments in categories.items()}
+        keyword_hits = Counter()
+        categories: Dict[str, List[Dict[str, Any]]] = {}
+        for f in features:
+            keyword_hits.update({keyword: f.hits[position] for keyword, position in KEYWORD_POSITIONS if f.hits[position]})
+            categories.setdefault(f.category, []).append(self.comments_by_id[f.comment_id])
         
-        # Decision statistics
-        decision_stats = Counter([s['decision_status'] for s in summaries])
+        lengths = [f.length for f in features]
+        dates = [f.created for f in features]
+        reviewer_comments = Counter(self.comment_reviewer(comment) for comment in issue['cuevasm_comments'])
         
-        report = {
-            'analysis_date': datetime.now().isoformat(),
-            'overview': {
-                'total_issues_analyzed': len(self.issues),
-                'issues_with_cuevasm_comments': len([i for i in self.issues if i['cuevasm_comment_count'] > 0]),
-                'total_cuevasm_comments': patterns['total_comments']
+        return {
+            'issue_number': issue['number'],
+            'comment_count': len(features),
+            'length_total': sum(lengths),
+            'length_min': min(lengths, default=0),
+            'length_max': max(lengths, default=0),
+            'earliest': min(dates, default=None),
+            'latest': max(dates, default=None),
+            'keyword_hits': dict(keyword_hits),
+            'categories': categories,
+            'reviewer_comments': dict(reviewer_comments),
+            'timeline': {
+                'created_ts': to_epoch(issue['created_at']),
+                'updated_ts': to_epoch(issue['updated_at']),
+                'labels': issue['labels'],
+                'comments': [[f.created, self.comment_reviewer(self.comments_by_id[f.comment_id])] for f in features]
             },
-            'comment_patterns': patterns,
-            'comment_categories': category_stats,
-            'decision_analysis': dict(decision_stats),
-            'issue_summaries': summaries,
-            'detailed_categories': categories
+            'summary': self.summarize_issue(issue)
         }
-        
-        return report
+    
+    def issue_fragments(self) -> List[Dict[str, Any]]:
+        """Fragments for every loaded issue, in issue order"""
+        if self._fragments is not None:
+            return self._fragments
+        return [self.issue_fragment(issue) for issue in self.issues]
+    
+    def generate_analysis_report(self) -> Dict[str, Any]:
+        """Generate comprehensive analysis report"""
+        aggregate = AnalysisAggregate({f['issue_number']: f for f in self.issue_fragments()})
+        return aggregate.report([issue['number'] for issue in self.issues])
+
+# Run metadata of a pool worker process, set once by _init_worker
+_worker_metadata: Dict[str, Any] = {}
+
+def _init_worker(metadata: Dict[str, Any]):
+    _worker_metadata.update(metadata)
+
+def _analyze_chunk(issues: List[Dict[str, Any]]):
+    """Features and fragments of one chunk of already selected issues"""
+    analyzer = CommentAnalyzer.from_issues(issues, _worker_metadata)
+    return analyzer.features, analyzer.issue_fragments()
 
 def main():
-    analyzer = CommentAnalyzer('/home/ubuntu/github_issues_data.json')
+    parser = argparse.ArgumentParser(description='Analyze reviewer comments on SIP-31 grant issues')
+    parser.add_argument('--reviewer', action='append', dest='reviewers',
+                        help='Only analyze comments by this reviewer (repeatable; defaults to every extracted reviewer)')
+    parser.add_argument('--output', help='Report file (defaults to cuevasm_analysis_report.json in the data directory)')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='Worker processes scanning comments (output is identical to a serial run)')
+    args = parser.parse_args()
+    
+    analyzer = CommentAnalyzer(issues_path(), reviewers=args.reviewers, processes=args.processes)
     report = analyzer.generate_analysis_report()
     
     # Save analysis report
-    output_file = '/home/ubuntu/cuevasm_analysis_report.json'
+    output_file = args.output or data_path('cuevasm_analysis_report.json')
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(report, f, indent=2, ensure_ascii=False)
     
@@ -223,6 +474,21 @@ def main():
     for category, count in report['comment_categories'].items():
         print(f"  {category}: {count}")
     
+    if len(report['reviewer_activity']) > 1:
+        print(f"\nReviewers:")
+        for reviewer, activity in report['reviewer_activity'].items():
+            print(f"  {reviewer}: {activity['comments']} comments on {activity['issues']} issues")
+    
+    throughput = report.get('review_throughput')
+    if throughput:
+        latency = throughput['response_latency_hours']
+        if latency['count']:
+            print(f"\nFirst response: median {latency['p50']}h, p90 {latency['p90']}h "
+                  f"({latency['unanswered_issues']} issues unanswered)")
+        weeks = throughput['comments_per_week']
+        if weeks:
+            print(f"Comments per week: {sum(weeks.values()) / len(weeks):.1f} on average over {len(weeks)} active weeks")
+    
     print(f"\nTop keywords:")
     for keyword, count in list(report['comment_patterns']['keyword_frequency'].items())[:10]:
         print(f"  {keyword}: {count}")
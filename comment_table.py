@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Comment Table
+Columnar (NumPy) view of reviewer comments and their issues, for review
+throughput metrics computed in bulk: response latency, weekly volume,
+follow-up cadence, time in status and per-reviewer workload
+"""
+
+from typing import List, Dict, Any, Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # optional: without it the report has no review_throughput section
+    np = None
+
+PERCENTILES = [50, 75, 90, 95, 99]
+HOUR = 3600
+WEEK = 7 * 24 * HOUR
+# The Unix epoch is a Thursday; weeks start on the Monday four days later
+WEEK_OFFSET = 4 * 24 * HOUR
+
+def available() -> bool:
+    return np is not None
+
+def epoch_array(seconds: List[int]) -> 'np.ndarray':
+    return np.array(seconds, dtype=np.int64)
+
+def distribution(seconds: 'np.ndarray') -> Dict[str, Any]:
+    """Count, mean, maximum and percentiles of durations, in hours"""
+    if not len(seconds):
+        return {'count': 0}
+    hours = seconds / HOUR
+    result = {'count': int(len(hours)), 'mean': round(float(hours.mean()), 2), 'max': round(float(hours.max()), 2)}
+    for percentile, value in zip(PERCENTILES, np.percentile(hours, PERCENTILES)):
+        result[f"p{percentile}"] = round(float(value), 2)
+    return result
+
+def week_counts(times: 'np.ndarray') -> Dict[str, int]:
+    """Number of timestamps per week, keyed by the Monday starting it"""
+    weeks, counts = np.unique((times - WEEK_OFFSET) // WEEK, return_counts=True)
+    starts = (weeks * WEEK + WEEK_OFFSET).astype('datetime64[s]').astype('datetime64[D]')
+    return {str(start): int(count) for start, count in zip(starts, counts)}
+
+class CommentTable:
+    """Reviewer comments as parallel arrays, built from analysis fragments.
+    
+    Issues are numbered by slot (their position in the fragments); every
+    comment row holds its time, issue slot and reviewer code, and labels
+    are (issue slot, label code) pairs. Each metric is a handful of array
+    operations, however many repositories and years of comments are loaded.
+    """
+    
+    def __init__(self, fragments: Iterable[Dict[str, Any]]):
+        created, updated = [], []
+        comment_times, comment_issues, comment_reviewers = [], [], []
+        label_issues, label_codes = [], []
+        reviewer_codes: Dict[str, int] = {}
+        label_ids: Dict[str, int] = {}
+        
+        for slot, fragment in enumerate(fragments):
+            timeline = fragment['timeline']
+            created.append(timeline['created_ts'])
+            updated.append(timeline['updated_ts'])
+            for label in timeline['labels']:
+                label_issues.append(slot)
+                label_codes.append(label_ids.setdefault(label, len(label_ids)))
+            for comment_time, reviewer in timeline['comments']:
+                comment_times.append(comment_time)
+                comment_issues.append(slot)
+                comment_reviewers.append(reviewer_codes.setdefault(reviewer, len(reviewer_codes)))
+        
+        self.reviewers = list(reviewer_codes)
+        self.labels = list(label_ids)
+        self.issue_created = epoch_array(created)
+        self.issue_updated = epoch_array(updated)
+        self.comment_time = epoch_array(comment_times)
+        self.comment_issue = np.array(comment_issues, dtype=np.int64)
+        self.comment_reviewer = np.array(comment_reviewers, dtype=np.int64)
+        self.label_issue = np.array(label_issues, dtype=np.int64)
+        self.label_code = np.array(label_codes, dtype=np.int64)
+    
+    def _first_comment(self, mask: Optional['np.ndarray'] = None) -> 'np.ndarray':
+        """Time of each issue's first (masked) comment; int64 max where there is none"""
+        first = np.full(len(self.issue_created), np.iinfo(np.int64).max, dtype=np.int64)
+        if mask is None:
+            np.minimum.at(first, self.comment_issue, self.comment_time)
+        else:
+            np.minimum.at(first, self.comment_issue[mask], self.comment_time[mask])
+        return first
+    
+    def response_latency(self) -> Dict[str, Any]:
+        """Issue creation to first reviewer comment"""
+        first = self._first_comment()
+        answered = first != np.iinfo(np.int64).max
+        latency = first[answered] - self.issue_created[answered]
+        return {**distribution(latency), 'unanswered_issues': int((~answered).sum())}
+    
+    def follow_up_gaps(self) -> Dict[str, Any]:
+        """Time between consecutive reviewer comments on the same issue"""
+        order = np.lexsort((self.comment_time, self.comment_issue))
+        times = self.comment_time[order]
+        same_issue = np.diff(self.comment_issue[order]) == 0
+        return distribution(np.diff(times)[same_issue])
+    
+    def time_in_status(self) -> Dict[str, Dict[str, Any]]:
+        """Per status label, how long its issues have gone without reviewer activity.
+        
+        Label history is not extracted, so an issue's time in its current
+        status is measured from its latest reviewer comment (or its creation)
+        to the newest timestamp in the data.
+        """
+        if not len(self.issue_created):
+            return {}
+        last = self.issue_created.copy()
+        np.maximum.at(last, self.comment_issue, self.comment_time)
+        reference = max(self.issue_updated.max(), last.max())
+        age = reference - last
+        return {
+            label: distribution(age[self.label_issue[self.label_code == code]])
+            for code, label in sorted(enumerate(self.labels), key=lambda item: item[1])
+        }
+    
+    def reviewer_workload(self) -> Dict[str, Dict[str, Any]]:
+        """Comment volume, issues touched, weekly activity and first responses per reviewer"""
+        first = self._first_comment()
+        workload = {}
+        for code, reviewer in sorted(enumerate(self.reviewers), key=lambda item: item[1]):
+            mask = self.comment_reviewer == code
+            times = self.comment_time[mask]
+            weeks = np.unique((times - WEEK_OFFSET) // WEEK)
+            # Issues whose very first reviewer comment is this reviewer's
+            firsts = self.comment_time[mask] == first[self.comment_issue[mask]]
+            workload[reviewer] = {
+                'comments': int(mask.sum()),
+                'issues': int(len(np.unique(self.comment_issue[mask]))),
+                'active_weeks': int(len(weeks)),
+                'comments_per_active_week': round(float(mask.sum()) / len(weeks), 2) if len(weeks) else 0,
+                'first_responses': int(len(np.unique(self.comment_issue[mask][firsts]))),
+                'comments_per_week': week_counts(times)
+            }
+        return workload
+    
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'response_latency_hours': self.response_latency(),
+            'follow_up_gap_hours': self.follow_up_gaps(),
+            'comments_per_week': week_counts(self.comment_time),
+            'time_in_status_hours': self.time_in_status(),
+            'reviewer_workload': self.reviewer_workload()
+        }
+
+def review_throughput(fragments: Iterable[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Review throughput metrics over analysis fragments, or None without NumPy"""
+    if np is None:
+        return None
+    return CommentTable(fragments).metrics()
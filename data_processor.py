@@ -4,25 +4,185 @@ Data Processor for Web Application
 Structures and optimizes the GitHub issues data for web presentation
 """
 
+import argparse
 import json
+import os
 import re
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 import html
 
+from artifacts import data_path, issues_path, is_jsonl, iter_issues, index_issues, read_issue_at, read_metadata
+from instrumentation import timed
+from markdown_renderer import MarkdownRenderer
+from parallel import chunked, ordered_map
+from render_cache import RenderCache
+from search_index import SearchIndex
+from sqlite_store import IssueStore, is_sqlite
+from static_output import StaticWriter, file_sizes, read_manifest
+from timestamps import DISPLAY_FORMAT, DateFormatter, to_epoch
+
+# Grant template fields, matched against a normalized label such as
+# "total budget (usd, stx, or btc)" taken from "- **Total Budget (USD, STX, or BTC):** ..."
+FIELD_RULES = [
+    ('email', re.compile(r'^(contact\s+)?e-?mail\b')),
+    ('twitter', re.compile(r'^(twitter|x)\b')),
+    ('budget', re.compile(r'^(total\s+)?(grant\s+|project\s+)?budget\b')),
+    # One leading word: "grant goal", "project team", "LAB team", even "ggrant goal"
+    ('goal', re.compile(r'^(\w+\s+)?goal\b')),
+    ('team', re.compile(r'^(\w+\s+)?team\b')),
+    ('traction', re.compile(r'^traction\b')),
+    ('milestones', re.compile(r'^milestones\b'))
+]
+MILESTONE_ITEM = re.compile(r'^milestone\b')
+
+BOLD_LABEL_LINE = re.compile(r'^(?P<indent>\s*)(?:[-*+]\s+|\d+\.\s+)?\*\*(?P<label>[^*]+?)\*\*\s*:?\s*(?P<value>.*)$')
+# Label up to the first colon, with any parentheses closed before it, so
+# "Total Budget (USD, STX, or BTC): ..." is a label and "Ross (GitHub: @r0zar)" is not.
+# Digits only inside parentheses: "M1 - Growth metrics:" stays part of the milestones
+PLAIN_LABEL_LINE = re.compile(
+    r'^(?P<indent>\s*)(?:[-*+]\s+)?(?:\*\*)?(?P<label>[A-Za-z](?:[^:()\d\n]|\([^()\n]*\)){0,60}):\s*(?P<value>.*)$'
+)
+# No colon after a currency: "Grant Budget (USD) $24,000", possibly after "Some heading - "
+CURRENCY_LABEL_LINE = re.compile(
+    r'^(?P<indent>\s*)(?:[-*+]\s+)?(?:.*?\s-\s+)?(?P<label>[A-Za-z][A-Za-z ]{0,40}\((?:USD|STX|BTC)[^)]*\))'
+    r'\s*(?P<value>[^\s:*].*)$'
+)
+HEADING_LINE = re.compile(r'^(?P<hashes>#{1,6})\s+(?P<label>.+?)\s*#*\s*$')
+LABEL_PREFIX = re.compile(r'^[^a-z0-9]+')
+MARKDOWN_LINK = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+LIST_MARKER = re.compile(r'^\s*(?:[-*+]|\d+\.)\s+')
+RULE_LINE = re.compile(r'^\s*(?:[-*_]{3,}|\|?[\s:|-]+\|[\s:|-]*)\s*$')
+
+# "$11,995 USD", "USD $21,268", "\\$60,000", "$5k", "≈25,000 STX"
+BUDGET_AMOUNT = re.compile(
+    r'(?:(?P<pre>USD|STX|BTC)\s*)?(?P<dollar>\\?\$)?\s*(?P<number>\d[\d,]*(?:\.\d+)?)'
+    r'(?:\s*(?P<multiplier>[kKmM])\b)?(?:\s*(?P<post>USD|STX|BTC)\b)?'
+)
+MULTIPLIERS = {'k': 1_000, 'm': 1_000_000}
+
+# Fields of a web record the dashboard list view needs; the rest lives in detail shards
+INDEX_FIELDS = [
+    'number', 'title', 'body_preview', 'state', 'created_at', 'created_ts', 'created_at_formatted',
+    'updated_at', 'updated_ts', 'html_url', 'labels', 'status_badge', 'total_comments',
+    'cuevasm_comment_count', 'decision_status', 'has_cuevasm_comments', 'cuevasm_activity_summary'
+]
+COMMENT_PREVIEW_LENGTH = 100
+
+BADGE_COUNTERS = {'success': 'awarded_count', 'warning': 'in_review_count', 'secondary': 'pending_count'}
+
+class SummaryStats:
+    """Running summary statistics over per-issue rows (see WebDataProcessor.summary_row).
+    
+    Rows are keyed by issue number, so adding a changed issue's row or
+    removing a deleted issue patches the counts in place. The latest update
+    is tracked by the rows' epoch updated_ts.
+    """
+    
+    def __init__(self, rows: Optional[Dict[int, Dict[str, Any]]] = None):
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.stats = {
+            'total_issues': 0,
+            'awarded_count': 0,
+            'in_review_count': 0,
+            'pending_count': 0,
+            'total_cuevasm_comments': 0,
+            'issues_with_cuevasm_comments': 0,
+            'last_updated': None
+        }
+        self._last_updated_ts = None
+        for row in (rows or {}).values():
+            self.add(row)
+    
+    def _apply(self, row: Dict[str, Any], sign: int):
+        stats = self.stats
+        stats['total_issues'] += sign
+        counter = BADGE_COUNTERS.get(row['status_badge']['type'])
+        if counter:
+            stats[counter] += sign
+        stats['total_cuevasm_comments'] += sign * row['cuevasm_comment_count']
+        if row['has_cuevasm_comments']:
+            stats['issues_with_cuevasm_comments'] += sign
+    
+    def add(self, row: Dict[str, Any]):
+        """Count an issue's row, replacing any previous row for that issue"""
+        self.remove(row['number'])
+        self.rows[row['number']] = row
+        self._apply(row, 1)
+        if self._last_updated_ts is None or row['updated_ts'] > self._last_updated_ts:
+            self._last_updated_ts = row['updated_ts']
+            self.stats['last_updated'] = row['updated_at']
+    
+    def remove(self, issue_number: int):
+        """Stop counting an issue"""
+        row = self.rows.pop(issue_number, None)
+        if not row:
+            return
+        self._apply(row, -1)
+        if row['updated_ts'] == self._last_updated_ts:
+            # The latest update may have been this issue's
+            latest = max(self.rows.values(), key=lambda r: r['updated_ts'], default=None)
+            self._last_updated_ts = latest['updated_ts'] if latest else None
+            self.stats['last_updated'] = latest['updated_at'] if latest else None
+
 class WebDataProcessor:
-    def __init__(self, issues_file: str, analysis_file: str):
-        with open(issues_file, 'r', encoding='utf-8') as f:
-            self.raw_data = json.load(f)
+    def __init__(self, issues_file: str, analysis_file: str, render_cache: Optional[RenderCache] = None,
+                 processes: int = 1, display_timezone: Optional[str] = None,
+                 date_format: str = DISPLAY_FORMAT):
+        # Issues are streamed from the artifact on demand; only its metadata is
+        # kept. The metadata and the analysis report are read on first use, so
+        # rendering a few changed issues (see process_issues) reads neither.
+        self.issues_file = issues_file
+        self.analysis_file = analysis_file
+        self._raw_data: Optional[Dict[str, Any]] = None
+        self._analysis_data: Optional[Dict[str, Any]] = None
+        # With more than one process, issues are rendered in a worker pool
+        self.processes = processes
+        # Dates are shown in this timezone; artifacts also carry epoch *_ts fields for sorting
+        self.dates = DateFormatter(display_timezone, date_format)
         
-        with open(analysis_file, 'r', encoding='utf-8') as f:
-            self.analysis_data = json.load(f)
+        self.renderer = MarkdownRenderer()
+        # Rendered bodies keyed by content hash; in-memory only unless a path is given
+        self.render_cache = render_cache or RenderCache()
+        # With a SQLite source the rendered HTML is stored next to the issues;
+        # the store is opened by the first shard written and closed by close()
+        self.store: Optional[IssueStore] = None
+    
+    @property
+    def raw_data(self) -> Dict[str, Any]:
+        if self._raw_data is None:
+            self._raw_data = read_metadata(self.issues_file)
+        return self._raw_data
+    
+    @property
+    def analysis_data(self) -> Dict[str, Any]:
+        if self._analysis_data is None:
+            with open(self.analysis_file, 'r', encoding='utf-8') as f:
+                self._analysis_data = json.load(f)
+        return self._analysis_data
+    
+    def close(self):
+        """Close the SQLite store the rendered HTML was saved to, if any"""
+        if self.store:
+            self.store.close()
+            self.store = None
+    
+    def __enter__(self) -> 'WebDataProcessor':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
     
     def clean_markdown_text(self, text: str) -> str:
         """Clean markdown text for better web display"""
         if not text:
             return ""
         
+        return self.render_cache.render('clean', text, self._clean_markdown_text)
+    
+    @timed('processor.clean_markdown')
+    def _clean_markdown_text(self, text: str) -> str:
+        """Collapse blank runs and escape HTML"""
         # Remove excessive whitespace
         text = re.sub(r'\n\s*\n\s*\n', '\n\n', text)
         text = text.strip()
@@ -32,93 +192,147 @@ class WebDataProcessor:
         
         return text
     
-    def extract_project_info(self, issue_body: str) -> Dict[str, str]:
-        """Extract structured project information from issue body"""
+    def _plain_text(self, text: str) -> str:
+        """Strip the markdown wrapping applicants put around template values"""
+        text = MARKDOWN_LINK.sub(r'\1', text).replace('**', '').strip()
+        if len(text) > 1 and text[0] == text[-1] == '_':
+            text = text[1:-1].strip()
+        return text
+    
+    def parse_budget_amount(self, budget: str) -> Optional[Dict[str, Any]]:
+        """Normalize a budget string to a numeric amount and currency"""
+        match = BUDGET_AMOUNT.search(budget or '')
+        if not match:
+            return None
+        
+        amount = float(match.group('number').replace(',', ''))
+        if match.group('multiplier'):
+            amount *= MULTIPLIERS[match.group('multiplier').lower()]
+        
+        currency = match.group('pre') or match.group('post')
+        if currency is None and match.group('dollar'):
+            currency = 'USD'
+        
+        return {'amount': amount, 'currency': currency.upper() if currency else None}
+    
+    def _match_label(self, line: str):
+        """Return (field or milestone marker, indent, heading level, inline value) for a labelled line"""
+        heading = HEADING_LINE.match(line)
+        if heading:
+            label, value, indent, level = heading.group('label'), '', 0, len(heading.group('hashes'))
+        else:
+            labelled = BOLD_LABEL_LINE.match(line) or PLAIN_LABEL_LINE.match(line) or CURRENCY_LABEL_LINE.match(line)
+            if not labelled:
+                return None
+            label, value = labelled.group('label'), labelled.group('value')
+            indent, level = len(labelled.group('indent')), None
+        
+        label = LABEL_PREFIX.sub('', label.replace('*', '').lower()).strip()
+        if ':' in label and not value:
+            # Whole line in bold: "**Total Budget: $5,000**"
+            label, value = label.split(':', 1)
+        label = label.rstrip(':').strip()
+        
+        if MILESTONE_ITEM.match(label) and not label.startswith('milestones'):
+            return 'milestone_item', indent, level, value
+        for field, pattern in FIELD_RULES:
+            if pattern.match(label):
+                return field, indent, level, value
+        return '', indent, level, value
+    
+    @timed('processor.extract_project_info')
+    def extract_project_info(self, issue_body: str) -> Dict[str, Any]:
+        """Extract structured project information from issue body.
+        
+        Walks the body once, line by line, recognising template labels
+        ("- **Email:** ...", "### Traction") through FIELD_RULES. A label's
+        value is its inline text, or the lines nested under it. Milestones
+        are collected as a list and the budget is also parsed into a
+        numeric amount and currency.
+        """
         info = {
             'email': '',
             'twitter': '',
             'budget': '',
             'goal': '',
             'team': '',
-            'traction': ''
+            'traction': '',
+            'milestones': [],
+            'budget_amount': None
         }
         
         if not issue_body:
             return info
         
-        # Extract email
-        email_match = re.search(r'[Ee]mail[:\s]*([^\n\r]+)', issue_body)
-        if email_match:
-            info['email'] = email_match.group(1).strip()
+        blocks: Dict[str, List[str]] = {}
+        milestone_items: List[str] = []
+        current = None  # (field, indent, heading level) of the open label
         
-        # Extract Twitter
-        twitter_match = re.search(r'[Tt]witter[:\s]*([^\n\r]+)', issue_body)
-        if twitter_match:
-            info['twitter'] = twitter_match.group(1).strip()
-        
-        # Extract budget
-        budget_match = re.search(r'[Bb]udget[:\s]*([^\n\r]+)', issue_body)
-        if budget_match:
-            info['budget'] = budget_match.group(1).strip()
+        for line in issue_body.splitlines():
+            if not line.strip() or RULE_LINE.match(line):
+                continue
+            
+            matched = self._match_label(line)
+            
+            if current and matched:
+                field, indent, level, _ = matched
+                _, open_indent, open_level = current
+                if open_level is not None:
+                    closes = level is not None and level <= open_level
+                else:
+                    closes = level is not None or (indent <= open_indent and field != 'milestone_item')
+                if closes:
+                    current = None
+            
+            if matched and matched[0] == 'milestone_item':
+                milestone_items.append(self._plain_text(LIST_MARKER.sub('', line.lstrip('# '))))
+                continue
+            
+            if matched and matched[0] and matched[0] not in blocks:
+                field, indent, level, value = matched
+                blocks[field] = [self._plain_text(value)] if value.strip() else []
+                current = (field, indent, level)
+                continue
+            
+            if current and (not matched or matched[0] != current[0]):
+                blocks[current[0]].append(self._plain_text(line.lstrip('# ') if matched else line))
         
-        # Extract goal
-        goal_match = re.search(r'[Gg]oal[:\s]*([^\n\r]+)', issue_body)
-        if goal_match:
-            info['goal'] = goal_match.group(1).strip()
+        for field in ('email', 'twitter', 'budget', 'goal', 'team'):
+            lines = [line for line in blocks.get(field, []) if line]
+            info[field] = LIST_MARKER.sub('', lines[0]) if lines else ''
         
-        # Extract team
-        team_match = re.search(r'[Tt]eam[:\s]*([^\n\r]+)', issue_body)
-        if team_match:
-            info['team'] = team_match.group(1).strip()
+        info['traction'] = '\n'.join(line for line in blocks.get('traction', []) if line)
+        info['milestones'] = milestone_items or [
+            LIST_MARKER.sub('', line) for line in blocks.get('milestones', []) if line
+        ]
+        info['budget_amount'] = self.parse_budget_amount(info['budget'])
         
         return info
     
     def format_comment_for_display(self, comment: Dict[str, Any]) -> Dict[str, Any]:
         """Format comment for web display"""
+        created_ts = to_epoch(comment['created_at'])
         return {
             'id': comment['id'],
             'body': self.clean_markdown_text(comment['body']),
-            'body_html': self.markdown_to_html_basic(comment['body']),
+            'body_html': self.markdown_to_html(comment['body']),
             'created_at': comment['created_at'],
-            'created_at_formatted': self.format_date(comment['created_at']),
-            'html_url': comment['html_url']
+            'created_ts': created_ts,
+            'created_at_formatted': self.dates.format(created_ts),
+            'html_url': comment['html_url'],
+            'reviewer': comment.get('reviewer') or self.raw_data['target_user']
         }
     
-    def markdown_to_html_basic(self, text: str) -> str:
-        """Basic markdown to HTML conversion"""
+    def markdown_to_html(self, text: str) -> str:
+        """Render markdown to HTML, reusing the cached HTML for unchanged text"""
         if not text:
             return ""
         
-        # Escape HTML first
-        text = html.escape(text)
-        
-        # Convert basic markdown
-        # Bold
-        text = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', text)
-        text = re.sub(r'__(.*?)__', r'<strong>\1</strong>', text)
-        
-        # Italic
-        text = re.sub(r'\*(.*?)\*', r'<em>\1</em>', text)
-        text = re.sub(r'_(.*?)_', r'<em>\1</em>', text)
-        
-        # Code
-        text = re.sub(r'`(.*?)`', r'<code>\1</code>', text)
-        
-        # Links
-        text = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'<a href="\2" target="_blank">\1</a>', text)
-        
-        # Line breaks
-        text = text.replace('\n', '<br>')
-        
-        return text
+        return self.render_cache.render('html', text, self.renderer.render)
     
     def format_date(self, iso_date: str) -> str:
         """Format ISO date for display"""
-        try:
-            dt = datetime.fromisoformat(iso_date.replace('Z', '+00:00'))
-            return dt.strftime('%B %d, %Y at %I:%M %p')
-        except:
-            return iso_date
+        return self.dates.format_iso(iso_date)
     
     def determine_status_badge(self, issue: Dict[str, Any], analysis_summary: Dict[str, Any]) -> Dict[str, str]:
         """Determine status badge for issue"""
@@ -143,89 +357,303 @@ class WebDataProcessor:
         else:
             return {'type': 'secondary', 'text': 'Pending', 'color': '#6c757d'}
     
-    def process_for_web(self) -> Dict[str, Any]:
-        """Process all data for web application"""
+    def iter_raw_issues(self) -> Iterator[Dict[str, Any]]:
+        """Yield raw issues newest (highest number) first.
         
-        # Create lookup for analysis summaries
-        analysis_lookup = {s['issue_number']: s for s in self.analysis_data['issue_summaries']}
+        For JSON Lines artifacts only the (number, offset) index is sorted and
+        each issue is read back by seeking, so bodies are never all in memory;
+        a SQLite store returns them in that order itself.
+        """
+        if is_sqlite(self.issues_file):
+            with IssueStore(self.issues_file) as store:
+                yield from store.iter_issues(order='number_desc')
+            return
         
-        processed_issues = []
+        if not is_jsonl(self.issues_file):
+            yield from sorted(iter_issues(self.issues_file), key=lambda x: x['number'], reverse=True)
+            return
         
-        for issue in self.raw_data['issues']:
-            analysis_summary = analysis_lookup.get(issue['number'], {})
-            project_info = self.extract_project_info(issue['body'])
-            
-            # Format cuevasm comments
-            formatted_comments = [
-                self.format_comment_for_display(comment) 
-                for comment in issue['cuevasm_comments']
-            ]
-            
-            # Sort comments by date
-            formatted_comments.sort(key=lambda x: x['created_at'])
-            
-            processed_issue = {
-                'number': issue['number'],
-                'title': issue['title'],
-                'body': self.clean_markdown_text(issue['body']),
-                'body_html': self.markdown_to_html_basic(issue['body']),
-                'body_preview': (issue['body'][:200] + '...') if issue['body'] and len(issue['body']) > 200 else (issue['body'] or ''),
-                'state': issue['state'],
-                'created_at': issue['created_at'],
-                'created_at_formatted': self.format_date(issue['created_at']),
-                'updated_at': issue['updated_at'],
-                'updated_at_formatted': self.format_date(issue['updated_at']),
-                'html_url': issue['html_url'],
-                'applicant': {
-                    'login': issue['user']['login'],
-                    'avatar_url': issue['user']['avatar_url'],
-                    'profile_url': f"https://github.com/{issue['user']['login']}"
-                },
-                'labels': issue['labels'],
-                'status_badge': self.determine_status_badge(issue, analysis_summary),
-                'project_info': project_info,
-                'total_comments': issue['total_comments'],
-                'cuevasm_comments': formatted_comments,
-                'cuevasm_comment_count': len(formatted_comments),
-                'decision_status': analysis_summary.get('decision_status', 'pending'),
-                'has_cuevasm_comments': len(formatted_comments) > 0,
-                'latest_cuevasm_comment': formatted_comments[-1] if formatted_comments else None,
-                'cuevasm_activity_summary': self.generate_activity_summary(formatted_comments)
-            }
-            
-            processed_issues.append(processed_issue)
-        
-        # Sort issues by number (descending for newest first)
-        processed_issues.sort(key=lambda x: x['number'], reverse=True)
-        
-        # Generate summary statistics
-        summary_stats = {
-            'total_issues': len(processed_issues),
-            'awarded_count': len([i for i in processed_issues if i['status_badge']['type'] == 'success']),
-            'in_review_count': len([i for i in processed_issues if i['status_badge']['type'] == 'warning']),
-            'pending_count': len([i for i in processed_issues if i['status_badge']['type'] == 'secondary']),
-            'total_cuevasm_comments': sum(i['cuevasm_comment_count'] for i in processed_issues),
-            'issues_with_cuevasm_comments': len([i for i in processed_issues if i['has_cuevasm_comments']]),
-            'last_updated': max([i['updated_at'] for i in processed_issues]) if processed_issues else None
-        }
+        index = sorted(index_issues(self.issues_file), key=lambda x: x[0], reverse=True)
+        with open(self.issues_file, 'rb') as f:
+            for _, offset in index:
+                yield read_issue_at(f, offset)
+    
+    def _analysis_lookup(self) -> Dict[int, Dict[str, Any]]:
+        """Create lookup for analysis summaries"""
+        return {s['issue_number']: s for s in self.analysis_data['issue_summaries']}
+    
+    @timed('processor.process_issue')
+    def process_issue(self, issue: Dict[str, Any], analysis_summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the web record for a single issue"""
+        project_info = self.extract_project_info(issue['body'])
+        
+        # Format cuevasm comments
+        formatted_comments = [
+            self.format_comment_for_display(comment) 
+            for comment in issue['cuevasm_comments']
+        ]
+        
+        # Sort comments by date
+        formatted_comments.sort(key=lambda x: x['created_ts'])
+        created_ts = to_epoch(issue['created_at'])
+        updated_ts = to_epoch(issue['updated_at'])
         
         return {
-            'metadata': {
-                'generated_at': datetime.now().isoformat(),
-                'repository': self.raw_data['repository'],
-                'target_user': self.raw_data['target_user'],
-                'data_source': 'GitHub REST API',
-                'version': '1.0'
+            'number': issue['number'],
+            'title': issue['title'],
+            'body': self.clean_markdown_text(issue['body']),
+            'body_html': self.markdown_to_html(issue['body']),
+            'body_preview': (issue['body'][:200] + '...') if issue['body'] and len(issue['body']) > 200 else (issue['body'] or ''),
+            'state': issue['state'],
+            'created_at': issue['created_at'],
+            'created_ts': created_ts,
+            'created_at_formatted': self.dates.format(created_ts),
+            'updated_at': issue['updated_at'],
+            'updated_ts': updated_ts,
+            'updated_at_formatted': self.dates.format(updated_ts),
+            'html_url': issue['html_url'],
+            'applicant': {
+                'login': issue['user']['login'],
+                'avatar_url': issue['user']['avatar_url'],
+                'profile_url': f"https://github.com/{issue['user']['login']}"
             },
-            'summary': summary_stats,
+            'labels': issue['labels'],
+            'status_badge': self.determine_status_badge(issue, analysis_summary),
+            'project_info': project_info,
+            'total_comments': issue['total_comments'],
+            'cuevasm_comments': formatted_comments,
+            'cuevasm_comment_count': len(formatted_comments),
+            'decision_status': analysis_summary.get('decision_status', 'pending'),
+            'has_cuevasm_comments': len(formatted_comments) > 0,
+            'latest_cuevasm_comment': formatted_comments[-1] if formatted_comments else None,
+            'cuevasm_activity_summary': self.generate_activity_summary(formatted_comments)
+        }
+    
+    def process_issues(self, issues: Iterable[Dict[str, Any]],
+                       analysis_lookup: Optional[Dict[int, Dict[str, Any]]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the web record of each raw issue, in input order.
+        
+        analysis_lookup maps issue numbers to their analysis summaries and
+        defaults to the analysis report's. With processes > 1 the issues are
+        rendered in chunks by worker processes, each holding its own
+        processor and a copy of the render cache; the records come back in
+        order and the workers' new renders are merged into this processor's
+        cache. Only the cache statistics can differ from a serial run, when
+        two workers render the same text.
+        """
+        if analysis_lookup is None:
+            analysis_lookup = self._analysis_lookup()
+        if self.processes <= 1:
+            for issue in issues:
+                yield self.process_issue(issue, analysis_lookup.get(issue['number'], {}))
+            return
+        
+        initargs = (self.issues_file, self.analysis_file, self.render_cache.entries, self.render_cache.max_entries,
+                    self.dates.timezone, self.dates.date_format)
+        pairs = ((issue, analysis_lookup.get(issue['number'], {})) for issue in issues)
+        for web_issues, rendered, hits, misses in ordered_map(_process_chunk, chunked(pairs), self.processes,
+                                                              initializer=_init_worker, initargs=initargs):
+            self.render_cache.merge(rendered, hits, misses)
+            yield from web_issues
+    
+    def iter_web_issues(self) -> Iterator[Dict[str, Any]]:
+        """Yield web records one issue at a time, newest first"""
+        return self.process_issues(self.iter_raw_issues())
+    
+    def summarize(self, processed_issues: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Generate summary statistics in one pass over processed issues"""
+        summary = SummaryStats()
+        for issue in processed_issues:
+            summary.add(issue)
+        return summary.stats
+    
+    def summary_row(self, issue: Dict[str, Any], analysis_summary: Dict[str, Any]) -> Dict[str, Any]:
+        """The fields summarize() reads, derived from a raw issue without rendering"""
+        comment_count = len(issue['cuevasm_comments'])
+        return {
+            'number': issue['number'],
+            'status_badge': self.determine_status_badge(issue, analysis_summary),
+            'cuevasm_comment_count': comment_count,
+            'has_cuevasm_comments': comment_count > 0,
+            'updated_at': issue['updated_at'],
+            'updated_ts': to_epoch(issue['updated_at'])
+        }
+    
+    def _summary_rows(self) -> Iterator[Dict[str, Any]]:
+        analysis_lookup = self._analysis_lookup()
+        
+        for issue in iter_issues(self.issues_file):
+            yield self.summary_row(issue, analysis_lookup.get(issue['number'], {}))
+    
+    def build_metadata(self) -> Dict[str, Any]:
+        return {
+            'generated_at': datetime.now().isoformat(),
+            'repository': self.raw_data['repository'],
+            'target_user': self.raw_data['target_user'],
+            'reviewers': self.raw_data.get('reviewers', [self.raw_data['target_user']]),
+            'data_source': 'GitHub REST API',
+            'version': '1.0',
+            'date_display': self.dates.settings()
+        }
+    
+    def build_analysis_insights(self) -> Dict[str, Any]:
+        return {
+            'top_keywords': list(self.analysis_data['comment_patterns']['keyword_frequency'].items())[:10],
+            'comment_categories': self.analysis_data['comment_categories'],
+            'decision_breakdown': self.analysis_data['decision_analysis']
+        }
+    
+    def process_for_web(self) -> Dict[str, Any]:
+        """Process all data for web application"""
+        processed_issues = list(self.iter_web_issues())
+        
+        return {
+            'metadata': self.build_metadata(),
+            'summary': self.summarize(processed_issues),
             'issues': processed_issues,
-            'analysis_insights': {
-                'top_keywords': list(self.analysis_data['comment_patterns']['keyword_frequency'].items())[:10],
-                'comment_categories': self.analysis_data['comment_categories'],
-                'decision_breakdown': self.analysis_data['decision_analysis']
-            }
+            'analysis_insights': self.build_analysis_insights(),
+            'render_cache': self.render_cache.stats()
         }
     
+    def index_entry(self, web_issue: Dict[str, Any]) -> Dict[str, Any]:
+        """Compact list-view record for one web issue"""
+        entry = {field: web_issue[field] for field in INDEX_FIELDS}
+        entry['applicant'] = {
+            'login': web_issue['applicant']['login'],
+            'avatar_url': web_issue['applicant']['avatar_url']
+        }
+        entry['goal'] = web_issue['project_info']['goal']
+        latest = web_issue['latest_cuevasm_comment']
+        entry['latest_cuevasm_comment_preview'] = latest['body'][:COMMENT_PREVIEW_LENGTH] if latest else None
+        entry['reviewers'] = sorted({comment['reviewer'] for comment in web_issue['cuevasm_comments']})
+        return entry
+    
+    def detail_shard(self, web_issue: Dict[str, Any]) -> Dict[str, Any]:
+        """Full record for the detail view, without the copies the dashboard never shows.
+        
+        The escaped 'body' text duplicates body_html, and the latest comment
+        is already the last entry of cuevasm_comments.
+        """
+        shard = {key: value for key, value in web_issue.items() if key not in ('body', 'latest_cuevasm_comment')}
+        shard['cuevasm_comments'] = [
+            {key: value for key, value in comment.items() if key != 'body'}
+            for comment in web_issue['cuevasm_comments']
+        ]
+        return shard
+    
+    def search_document(self, web_issue: Dict[str, Any]) -> Tuple[int, Dict[str, str]]:
+        """Plain text of one web issue for the search index"""
+        return web_issue['number'], {
+            'title': web_issue['title'],
+            'applicant': web_issue['applicant']['login'],
+            'body': html.unescape(web_issue['body']),
+            'comments': '\n'.join(html.unescape(comment['body']) for comment in web_issue['cuevasm_comments'])
+        }
+    
+    @timed('processor.write_issue_shard')
+    def write_issue_shard(self, writer: StaticWriter, web_issue: Dict[str, Any]) -> str:
+        """Write one issue's detail shard as issues/<number>.<hash>.json; returns its path"""
+        if is_sqlite(self.issues_file):
+            if self.store is None:
+                self.store = IssueStore(self.issues_file)
+            self.store.save_rendered(web_issue)
+        return writer.write(f"issues/{web_issue['number']}", self.detail_shard(web_issue))
+    
+    def write_index(self, writer: StaticWriter, summary_stats: Dict[str, Any],
+                    entries: List[Dict[str, Any]], search_index: SearchIndex) -> Dict[str, Any]:
+        """Write the hashed index, the only file the dashboard loads up front, and point the manifest at it.
+        
+        Each entry's 'detail' names its shard; the search index is written
+        alongside and fetched once the user starts searching, its word
+        positions only on the first quoted phrase. Files from
+        older runs are pruned before the manifest switches over, which
+        alone records when the build ran. Returns the manifest.
+        """
+        metadata = self.build_metadata()
+        # The build time goes in the manifest only, so unchanged data keeps its index name
+        generated_at = metadata.pop('generated_at')
+        search = writer.write('search', search_index.to_data())
+        search_positions = writer.write('search_positions', search_index.positions_data())
+        index = writer.write('index', {
+            'metadata': metadata,
+            'summary': summary_stats,
+            'issues': entries,
+            'analysis_insights': self.build_analysis_insights()
+        })
+        writer.prune([index, search, search_positions] + [entry['detail'] for entry in entries])
+        return writer.write_manifest(index, search, search_positions, generated_at)
+    
+    def _write_shards(self, writer: StaticWriter, web_issues: Iterable[Dict[str, Any]],
+                      entries: List[Dict[str, Any]], documents: List[Tuple[int, Dict[str, str]]]
+                      ) -> Iterator[Dict[str, Any]]:
+        """Write each web issue's detail shard, collecting its index entry and
+        search document, and pass the issue on"""
+        for web_issue in web_issues:
+            entry = self.index_entry(web_issue)
+            entry['detail'] = self.write_issue_shard(writer, web_issue)
+            entries.append(entry)
+            documents.append(self.search_document(web_issue))
+            yield web_issue
+    
+    def write_split_web_data(self, output_dir: str) -> StaticWriter:
+        """Write the dashboard payload as a compact index plus one detail shard per issue.
+        
+        Shards are written as issues are processed; only the small index
+        entries are kept in memory. Returns the writer, whose byte counts
+        cover the whole payload.
+        """
+        writer = StaticWriter(output_dir)
+        entries, documents = [], []
+        for _ in self._write_shards(writer, self.iter_web_issues(), entries, documents):
+            pass
+        
+        self.write_index(writer, self.summarize(entries), entries, SearchIndex.build(documents))
+        return writer
+    
+    def write_web_data(self, output_file: str, output_dir: Optional[str] = None
+                       ) -> Tuple[Dict[str, Any], Optional[StaticWriter]]:
+        """Stream the web data file one issue at a time.
+        
+        Summary statistics are computed first from the raw issues, so the file
+        keeps the same layout as process_for_web() output without holding every
+        rendered issue in memory. With output_dir the split payload (see
+        write_split_web_data) is written in the same pass, so every issue is
+        rendered once for both. Returns the summary and the split writer.
+        """
+        summary_stats = self.summarize(self._summary_rows())
+        web_issues = self.iter_web_issues()
+        writer = None
+        if output_dir:
+            writer = StaticWriter(output_dir)
+            entries, documents = [], []
+            web_issues = self._write_shards(writer, web_issues, entries, documents)
+        
+        self.write_web_document(output_file, summary_stats, web_issues)
+        if writer:
+            self.write_index(writer, self.summarize(entries), entries, SearchIndex.build(documents))
+        return summary_stats, writer
+    
+    def write_web_document(self, output_file: str, summary_stats: Dict[str, Any],
+                           web_issues: Iterable[Dict[str, Any]]):
+        """Write the web data file around already processed issues"""
+        def nested(value: Any, level: int) -> str:
+            return json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n' + '  ' * level)
+        
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write('{\n')
+            f.write(f'  "metadata": {nested(self.build_metadata(), 1)},\n')
+            f.write(f'  "summary": {nested(summary_stats, 1)},\n')
+            f.write('  "issues": [')
+            written = 0
+            for issue in web_issues:
+                f.write(',\n    ' if written else '\n    ')
+                f.write(nested(issue, 2))
+                written += 1
+            f.write('\n  ],\n' if written else '],\n')
+            f.write(f'  "analysis_insights": {nested(self.build_analysis_insights(), 1)},\n')
+            f.write(f'  "render_cache": {nested(self.render_cache.stats(), 1)}\n')
+            f.write('}')
+    
     def generate_activity_summary(self, comments: List[Dict[str, Any]]) -> str:
         """Generate a summary of cuevasm's activity on the issue"""
         if not comments:
@@ -235,31 +663,82 @@ class WebDataProcessor:
         if count == 1:
             return "1 comment from cuevasm"
         else:
-            latest_date = self.format_date(comments[-1]['created_at'])
+            latest_date = comments[-1]['created_at_formatted']
             return f"{count} comments from cuevasm, latest on {latest_date}"
 
+def add_date_arguments(parser):
+    """--timezone and --date-format options for the entry points that render web data"""
+    parser.add_argument('--timezone', metavar='NAME',
+                        help='IANA timezone dates are displayed in, e.g. America/New_York (default: UTC)')
+    parser.add_argument('--date-format', default=DISPLAY_FORMAT,
+                        help='strftime format of displayed dates (default: %(default)r)')
+
+# The processor of a pool worker process, set once by _init_worker
+_worker: Dict[str, Any] = {}
+
+def _init_worker(issues_file: str, analysis_file: str, cache_entries: Dict[str, str], max_entries: int,
+                 display_timezone: str, date_format: str):
+    render_cache = RenderCache(max_entries=max_entries, track_new=True)
+    render_cache.entries.update(cache_entries)
+    processor = WebDataProcessor(issues_file, analysis_file, render_cache=render_cache,
+                                 display_timezone=display_timezone, date_format=date_format)
+    _worker['processor'] = processor
+
+def _process_chunk(pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]]):
+    """Web records for one chunk of (issue, analysis summary) pairs, plus the
+    renders and cache counts it added"""
+    processor = _worker['processor']
+    cache = processor.render_cache
+    hits, misses = cache.hits, cache.misses
+    web_issues = [processor.process_issue(issue, analysis_summary) for issue, analysis_summary in pairs]
+    return web_issues, cache.take_new(), cache.hits - hits, cache.misses - misses
+
 def main():
+    parser = argparse.ArgumentParser(description='Render the analyzed SIP-31 grant issues for the dashboard')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='Worker processes rendering issues (output is identical to a serial run)')
+    add_date_arguments(parser)
+    args = parser.parse_args()
+    
     processor = WebDataProcessor(
-        '/home/ubuntu/github_issues_data.json',
-        '/home/ubuntu/cuevasm_analysis_report.json'
+        issues_path(),
+        data_path('cuevasm_analysis_report.json'),
+        render_cache=RenderCache(data_path('render_cache.json')),
+        processes=args.processes,
+        display_timezone=args.timezone,
+        date_format=args.date_format
     )
     
-    web_data = processor.process_for_web()
-    
-    # Save processed data
-    output_file = '/home/ubuntu/web_app_data.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(web_data, f, indent=2, ensure_ascii=False)
+    # Save processed data, streamed one issue at a time, and the split payload
+    # for the dashboard (hashed index and issue shards plus manifest.json) from
+    # the same rendered issues
+    output_file = data_path('web_app_data.json')
+    web_dir = data_path('web_data')
+    with processor:
+        summary, writer = processor.write_web_data(output_file, web_dir)
+    processor.render_cache.save()
     
     print("=== WEB DATA PROCESSING COMPLETE ===")
-    print(f"Processed {web_data['summary']['total_issues']} issues")
-    print(f"Total cuevasm comments: {web_data['summary']['total_cuevasm_comments']}")
-    print(f"Issues with cuevasm comments: {web_data['summary']['issues_with_cuevasm_comments']}")
+    print(f"Processed {summary['total_issues']} issues")
+    print(f"Total cuevasm comments: {summary['total_cuevasm_comments']}")
+    print(f"Issues with cuevasm comments: {summary['issues_with_cuevasm_comments']}")
     print(f"\nStatus breakdown:")
-    print(f"  Awarded: {web_data['summary']['awarded_count']}")
-    print(f"  In Review: {web_data['summary']['in_review_count']}")
-    print(f"  Pending: {web_data['summary']['pending_count']}")
+    print(f"  Awarded: {summary['awarded_count']}")
+    print(f"  In Review: {summary['in_review_count']}")
+    print(f"  Pending: {summary['pending_count']}")
+    cache_stats = processor.render_cache.stats()
+    print(f"\nRender cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['evictions']} evicted")
     print(f"\nData saved to: {output_file}")
+    print(f"Dashboard index and issue shards saved to: {web_dir}")
+    sizes = writer.bytes
+    print(f"Dashboard payload: {sizes['raw']:,} bytes minified, {sizes['gzip']:,} gzip"
+          + (f", {sizes['brotli']:,} brotli" if sizes['brotli'] else " (install brotli for .br files)")
+          + f" (web data file: {os.path.getsize(output_file):,} bytes)")
+    manifest = read_manifest(web_dir)
+    for name in ('index', 'search', 'search_positions'):
+        sizes = file_sizes(web_dir, manifest[name])
+        print(f"  {manifest[name]}: {sizes['raw']:,} bytes, {sizes['gzip']:,} gzip"
+              + (f", {sizes['brotli']:,} brotli" if sizes['brotli'] else ''))
 
 if __name__ == "__main__":
     main()
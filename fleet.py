@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Extraction Fleet
+Crawls several repositories for several reviewers' comments at once, with
+one shared connection pool and one shared rate-limit budget, then runs the
+incremental pipeline for each repository
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from artifacts import DATA_DIR, data_path
+from data_processor import add_date_arguments
+from github_extractor import DEFAULT_REPOSITORY, DEFAULT_REVIEWERS, create_session
+from instrumentation import add_arguments, recorder, run_instrumented
+from pipeline import IncrementalPipeline
+from request_scheduler import RequestScheduler
+from timestamps import DISPLAY_FORMAT
+
+def repository_dir(data_dir: str, repository: str) -> str:
+    """Artifacts of one repository live under <data_dir>/<owner>/<name>"""
+    owner, name = repository.split('/')
+    return os.path.join(data_dir, owner, name)
+
+class ExtractionFleet:
+    """One IncrementalPipeline per repository, all extracting through one scheduler.
+    
+    The scheduler paces every request against the single budget GitHub
+    grants a token, however many repositories are crawled, and its session's
+    pool is sized for every repository's comment workers at once. Each
+    repository keeps its own artifacts, so the analysis and dashboard can be
+    sliced by repository; comments carry the reviewer who wrote them.
+    """
+    
+    def __init__(self, repositories: List[str], reviewers: Optional[List[str]] = None,
+                 data_dir: str = DATA_DIR, max_workers: int = 8,
+                 display_timezone: Optional[str] = None, date_format: str = DISPLAY_FORMAT):
+        self.repositories = list(dict.fromkeys(repositories))
+        self.reviewers = list(reviewers or DEFAULT_REVIEWERS)
+        self.data_dir = data_dir
+        self.scheduler = RequestScheduler(create_session(max_workers * len(self.repositories)))
+        self.pipelines: Dict[str, IncrementalPipeline] = {}
+        for repository in self.repositories:
+            repo_dir = repository_dir(data_dir, repository)
+            os.makedirs(repo_dir, exist_ok=True)
+            self.pipelines[repository] = IncrementalPipeline(
+                repo_dir, max_workers=max_workers, repository=repository,
+                reviewers=self.reviewers, scheduler=self.scheduler,
+                display_timezone=display_timezone, date_format=date_format)
+    
+    def extract(self, full: bool = False, restart: bool = False) -> Dict[str, Dict[str, Any]]:
+        """Extract every repository concurrently; returns each one's summary"""
+        with ThreadPoolExecutor(max_workers=len(self.repositories)) as executor:
+            futures = {
+                repository: executor.submit(pipeline.extract, full=full, restart=restart)
+                for repository, pipeline in self.pipelines.items()
+            }
+            return {repository: future.result() for repository, future in futures.items()}
+    
+    def run(self, extract: bool = True, full: bool = False, restart: bool = False) -> Dict[str, Any]:
+        """Extract all repositories, then analyze and process each; writes fleet.json"""
+        timings = {}
+        if extract:
+            start = time.perf_counter()
+            self.extract(full=full, restart=restart)
+            timings['extract'] = round(time.perf_counter() - start, 3)
+            recorder.add_stage('fleet.extract', timings['extract'])
+        
+        # Processing is CPU-bound, so the repositories take turns
+        start = time.perf_counter()
+        results = {
+            repository: pipeline.run(extract=False, full=full)
+            for repository, pipeline in self.pipelines.items()
+        }
+        timings['process'] = round(time.perf_counter() - start, 3)
+        recorder.add_stage('fleet.process', timings['process'])
+        
+        fleet = {
+            'reviewers': self.reviewers,
+            'repositories': [
+                {
+                    'repository': repository,
+                    'web_dir': os.path.relpath(self.pipelines[repository].web_dir, self.data_dir).replace(os.sep, '/'),
+                    'summary': results[repository]['summary']
+                }
+                for repository in self.repositories
+            ]
+        }
+        with open(os.path.join(self.data_dir, 'fleet.json'), 'w', encoding='utf-8') as f:
+            json.dump(fleet, f, indent=2, ensure_ascii=False)
+        
+        return {
+            'results': results,
+            'timings': timings,
+            'scheduler': self.scheduler.stats()
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract and process several repositories and reviewers in one pass')
+    parser.add_argument('--repo', action='append', dest='repositories',
+                        help=f"Repository to crawl (owner/name); repeat for several (default: {DEFAULT_REPOSITORY})")
+    parser.add_argument('--reviewer', action='append', dest='reviewers',
+                        help=f"Reviewer whose comments are kept; repeat for several (default: {DEFAULT_REVIEWERS[0]})")
+    parser.add_argument('--data-dir', default=DATA_DIR,
+                        help='Directory holding one artifact directory per repository')
+    parser.add_argument('--skip-extract', action='store_true',
+                        help='Reprocess the existing artifacts without contacting GitHub')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore all previous state and rebuild everything')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Comment threads fetched concurrently per repository')
+    add_date_arguments(parser)
+    add_arguments(parser)
+    args = parser.parse_args()
+    args.report = args.report or data_path('run_report.json', args.data_dir)
+    
+    fleet = ExtractionFleet(args.repositories or [DEFAULT_REPOSITORY], args.reviewers,
+                            data_dir=args.data_dir, max_workers=args.workers,
+                            display_timezone=args.timezone, date_format=args.date_format)
+    result = run_instrumented(args, lambda: fleet.run(extract=not args.skip_extract, full=args.full))
+    
+    print("\n=== FLEET COMPLETE ===")
+    print(f"Reviewers: {', '.join(fleet.reviewers)}")
+    for repository, repo_result in result['results'].items():
+        summary = repo_result['summary']
+        print(f"  {repository}: {repo_result['total_issues']} issues ({repo_result['dirty_issues']} changed), "
+              f"{summary['total_cuevasm_comments']} reviewer comments")
+    print(f"Requests: {result['scheduler']['requests']}")
+    print("Stage timings: " + ", ".join(f"{stage} {seconds}s" for stage, seconds in result['timings'].items()))
+    print(f"\nFleet index: {os.path.join(args.data_dir, 'fleet.json')}")
+
+if __name__ == "__main__":
+    main()
@@ -2,45 +2,216 @@
 """
 GitHub Issues and Comments Extractor
 Extracts all issues and comments from stacksgov/sip31-interim-grants repository
-Focuses on comments by cuevasm user
+Focuses on comments by cuevasm user (or any list of reviewers)
 """
 
 import requests
 import json
+import os
 import time
-from typing import List, Dict, Any
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlencode
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional
+
+from request_scheduler import RequestScheduler
+from github_graphql import GraphQLBackend, RecordingTransport, ReplayTransport
+from checkpoint import ExtractionCheckpoint
+from instrumentation import add_arguments, record_response, run_instrumented, timed
+from artifacts import ISSUES_FILE, data_path, JsonlWriter, is_jsonl, iter_issues, read_metadata, write_artifact
+from sqlite_store import is_sqlite, write_issues
+from timestamps import to_epoch
+
+COMMENT_STRATEGIES = ('per_issue', 'repository')
+BACKENDS = ('rest', 'graphql')
+DEFAULT_REPOSITORY = 'stacksgov/sip31-interim-grants'
+DEFAULT_REVIEWERS = ['cuevasm']
+
+def create_session(pool_size: int) -> requests.Session:
+    """API session with a connection pool for pool_size concurrent requests"""
+    session = requests.Session()
+    
+    # Set headers for better API response
+    session.headers.update({
+        'Accept': 'application/vnd.github+json',
+        'X-GitHub-Api-Version': '2022-11-28'
+    })
+    
+    # Authenticated requests get a 5000/hour budget instead of 60
+    token = os.environ.get('GITHUB_TOKEN')
+    if token:
+        session.headers['Authorization'] = f"Bearer {token}"
+    
+    # Every response is counted, timed and sized for the run report
+    session.hooks['response'].append(record_response)
+    
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
 class GitHubExtractor:
-    def __init__(self):
+    def __init__(self, state_file: Optional[str] = None, max_workers: int = 1,
+                 comment_strategy: str = 'per_issue', backend: str = 'rest',
+                 graphql_transport=None, repository: str = DEFAULT_REPOSITORY,
+                 reviewers: Optional[List[str]] = None, scheduler: Optional[RequestScheduler] = None):
         self.base_url = "https://api.github.com"
-        self.owner = "stacksgov"
-        self.repo = "sip31-interim-grants"
-        self.target_user = "cuevasm"
-        self.session = requests.Session()
-        
-        # Set headers for better API response
-        self.session.headers.update({
-            'Accept': 'application/vnd.github+json',
-            'X-GitHub-Api-Version': '2022-11-28'
-        })
-    
-    def get_all_issues(self) -> List[Dict[str, Any]]:
+        self.owner, self.repo = repository.split('/')
+        # Comments by any of the reviewers are kept, tagged with who wrote them
+        self.reviewers = list(reviewers or DEFAULT_REVIEWERS)
+        self.target_user = self.reviewers[0]
+        
+        # Comment threads are fetched by up to max_workers threads sharing
+        # one connection pool sized to match. A scheduler passed in brings
+        # its session along, so several extractors can share one pool and
+        # one rate-limit budget.
+        self.max_workers = max(1, max_workers)
+        self.session = scheduler.session if scheduler else create_session(self.max_workers)
+        self._lock = threading.Lock()
+        
+        # 'per_issue' lists /issues/{n}/comments for every issue; 'repository'
+        # streams /issues/comments once and buckets comments by issue
+        if comment_strategy not in COMMENT_STRATEGIES:
+            raise ValueError(f"Unknown comment strategy: {comment_strategy}")
+        self.comment_strategy = comment_strategy
+        
+        # 'graphql' fetches issues with their comment threads in batched
+        # queries; graphql_transport can replace HTTP with recorded fixtures
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        self.backend = backend
+        self.graphql_transport = graphql_transport
+        
+        # All requests go through the scheduler, which paces them against the
+        # rate-limit budget and retries transient failures
+        self.scheduler = scheduler or RequestScheduler(self.session)
+        
+        # Persisted sync state: high-water mark plus per-URL validators
+        self.state_file = state_file
+        self.sync_state = self._load_sync_state()
+        self.not_modified_count = 0
+        
+        # Optional log of completed pages that lets a failed run resume
+        self.checkpoint: Optional[ExtractionCheckpoint] = None
+    
+    def _load_sync_state(self) -> Dict[str, Any]:
+        """Load the persisted sync state, or start with an empty one"""
+        state = {'last_sync': None, 'validators': {}}
+        
+        if self.state_file and os.path.exists(self.state_file):
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state.update(json.load(f))
+        
+        return state
+    
+    def save_sync_state(self):
+        """Write the sync state next to the extracted data"""
+        if not self.state_file:
+            return
+        
+        with open(self.state_file, 'w', encoding='utf-8') as f:
+            json.dump(self.sync_state, f, indent=2)
+    
+    def _cache_key(self, url: str, params: Dict[str, Any]) -> str:
+        """Stable key for a request URL and its query parameters"""
+        return f"{url}?{urlencode(sorted(params.items()))}"
+    
+    def _get(self, url: str, params: Dict[str, Any], conditional: bool = False) -> Optional[requests.Response]:
+        """GET a URL, optionally revalidating against stored ETag/Last-Modified.
+        
+        Returns None when the server answers 304 Not Modified.
+        """
+        key = self._cache_key(url, params)
+        headers = {}
+        
+        if conditional:
+            validator = self.sync_state['validators'].get(key, {})
+            if validator.get('etag'):
+                headers['If-None-Match'] = validator['etag']
+            if validator.get('last_modified'):
+                headers['If-Modified-Since'] = validator['last_modified']
+        
+        response = self.scheduler.get(url, params=params, headers=headers)
+        
+        if response.status_code == 304:
+            with self._lock:
+                self.not_modified_count += 1
+            return None
+        
+        if conditional and response.status_code == 200:
+            validator = {}
+            if response.headers.get('ETag'):
+                validator['etag'] = response.headers['ETag']
+            if response.headers.get('Last-Modified'):
+                validator['last_modified'] = response.headers['Last-Modified']
+            if validator:
+                with self._lock:
+                    self.sync_state['validators'][key] = validator
+        
+        return response
+    
+    def _get_page(self, url: str, params: Dict[str, Any], conditional: bool, description: str,
+                  keep: bool = False) -> Optional[List[Dict[str, Any]]]:
+        """Fetch one page of a listing, serving it from the checkpoint when a
+        previous run already completed it. Returns None on 304.
+        
+        With ``keep`` the page is stored alongside its validator, and a 304
+        returns the stored page instead of None.
+        """
+        key = self._cache_key(url[len(self.base_url):], params)
+        
+        if self.checkpoint:
+            items = self.checkpoint.get(key)
+            if items is not None:
+                return items
+        
+        response = self._get(url, params, conditional=conditional)
+        
+        if response is None:
+            if keep:
+                return self.sync_state['validators'].get(self._cache_key(url, params), {}).get('items')
+            return None
+        
+        if response.status_code != 200:
+            # Fail loudly rather than saving a silently truncated listing
+            print(f"Error fetching {description}: {response.status_code}")
+            response.raise_for_status()
+        
+        items = response.json()
+        if self.checkpoint:
+            self.checkpoint.put(key, items)
+        if keep and conditional:
+            with self._lock:
+                validator = self.sync_state['validators'].get(self._cache_key(url, params))
+                if validator is not None:
+                    validator['items'] = items
+        
+        return items
+    
+    def get_all_issues(self, since: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get all issues (both open and closed) from the repository"""
         all_issues = []
         
         # Get open issues
-        open_issues = self._get_issues_by_state('open')
+        open_issues = self._get_issues_by_state('open', since)
         all_issues.extend(open_issues)
         
         # Get closed issues
-        closed_issues = self._get_issues_by_state('closed')
+        closed_issues = self._get_issues_by_state('closed', since)
         all_issues.extend(closed_issues)
         
         print(f"Total issues found: {len(all_issues)}")
         return all_issues
     
-    def _get_issues_by_state(self, state: str) -> List[Dict[str, Any]]:
-        """Get issues by state (open/closed) with pagination"""
+    @timed('extractor.list_issues')
+    def _get_issues_by_state(self, state: str, since: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get issues by state (open/closed) with pagination.
+        
+        With ``since`` only issues updated at or after that timestamp are
+        returned, and pages are revalidated with their stored ETags.
+        """
         issues = []
         page = 1
         per_page = 100
@@ -54,16 +225,17 @@ class GitHubExtractor:
                 'sort': 'created',
                 'direction': 'asc'
             }
+            if since:
+                params['since'] = since
             
             print(f"Fetching {state} issues page {page}...")
-            response = self.session.get(url, params=params)
+            page_issues = self._get_page(url, params, since is not None, 'issues')
             
-            if response.status_code != 200:
-                print(f"Error fetching issues: {response.status_code}")
+            if page_issues is None:
+                # Same query as a previous run and nothing changed since
+                print(f"  {state} issues page {page} not modified")
                 break
             
-            page_issues = response.json()
-            
             if not page_issues:
                 break
             
@@ -77,12 +249,16 @@ class GitHubExtractor:
                 break
             
             page += 1
-            time.sleep(0.1)  # Rate limiting
         
         return issues
     
-    def get_issue_comments(self, issue_number: int) -> List[Dict[str, Any]]:
-        """Get all comments for a specific issue"""
+    @timed('extractor.issue_comments')
+    def get_issue_comments(self, issue_number: int, since: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """Get all comments for a specific issue.
+        
+        With ``since`` only comments updated at or after that timestamp are
+        returned; None means the first page was answered with 304.
+        """
         comments = []
         page = 1
         per_page = 100
@@ -93,14 +269,13 @@ class GitHubExtractor:
                 'page': page,
                 'per_page': per_page
             }
+            if since:
+                params['since'] = since
             
-            response = self.session.get(url, params=params)
+            page_comments = self._get_page(url, params, since is not None, f"comments for issue #{issue_number}")
             
-            if response.status_code != 200:
-                print(f"Error fetching comments for issue #{issue_number}: {response.status_code}")
-                break
-            
-            page_comments = response.json()
+            if page_comments is None:
+                return None if page == 1 else comments
             
             if not page_comments:
                 break
@@ -111,99 +286,373 @@ class GitHubExtractor:
                 break
             
             page += 1
-            time.sleep(0.1)  # Rate limiting
         
         return comments
     
+    @timed('extractor.repository_comments')
+    def get_repository_comments(self, since: Optional[str] = None) -> Dict[int, List[Dict[str, Any]]]:
+        """Stream every issue comment in the repository once, bucketed by issue number"""
+        buckets: Dict[int, List[Dict[str, Any]]] = {}
+        page = 1
+        per_page = 100
+        
+        while True:
+            url = f"{self.base_url}/repos/{self.owner}/{self.repo}/issues/comments"
+            params = {
+                'page': page,
+                'per_page': per_page,
+                'sort': 'created',
+                'direction': 'asc'
+            }
+            if since:
+                params['since'] = since
+            
+            print(f"Fetching repository comments page {page}...")
+            # A 304 means the listing is the one seen last run, and the
+            # changed issues still need their comments from it
+            page_comments = self._get_page(url, params, since is not None, 'repository comments', keep=True)
+            
+            if page_comments is None:
+                break
+            
+            if not page_comments:
+                break
+            
+            for comment in page_comments:
+                issue_number = int(comment['issue_url'].rsplit('/', 1)[1])
+                buckets.setdefault(issue_number, []).append(comment)
+            
+            if len(page_comments) < per_page:
+                break
+            
+            page += 1
+        
+        return buckets
+    
+    def fetch_comment_threads(self, issue_numbers: List[int], since: Optional[List[Optional[str]]] = None,
+                              repository_since: Optional[str] = None) -> Iterator[Optional[List[Dict[str, Any]]]]:
+        """Fetch comment threads for many issues, yielding them in input order.
+        
+        With max_workers > 1 the threads are fetched concurrently; results are
+        still yielded in the order of ``issue_numbers`` so output is
+        deterministic regardless of which request finishes first. With the
+        'repository' strategy a single repository-wide listing (limited by
+        ``repository_since``) replaces the per-issue requests.
+        """
+        if self.comment_strategy == 'repository':
+            buckets = self.get_repository_comments(repository_since)
+            for issue_number in issue_numbers:
+                yield buckets.get(issue_number, [])
+            return
+        
+        if since is None:
+            since = [None] * len(issue_numbers)
+        
+        if self.max_workers == 1:
+            yield from map(self.get_issue_comments, issue_numbers, since)
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            yield from executor.map(self.get_issue_comments, issue_numbers, since)
+    
     def extract_cuevasm_comments(self, comments: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Filter comments to only include those by cuevasm"""
+        """Filter comments to only include those by the reviewers, in one pass"""
         cuevasm_comments = []
         
         for comment in comments:
-            if comment.get('user', {}).get('login') == self.target_user:
+            login = comment.get('user', {}).get('login')
+            if login in self.reviewers:
                 cuevasm_comments.append({
                     'id': comment['id'],
                     'body': comment['body'],
                     'created_at': comment['created_at'],
                     'updated_at': comment['updated_at'],
-                    'html_url': comment['html_url']
+                    'html_url': comment['html_url'],
+                    'reviewer': login
                 })
         
         return cuevasm_comments
     
-    def extract_all_data(self) -> Dict[str, Any]:
-        """Extract all issues and cuevasm's comments"""
+    def process_issue(self, issue: Dict[str, Any], cuevasm_comments: List[Dict[str, Any]], total_comments: int) -> Dict[str, Any]:
+        """Normalize a raw API issue into the stored issue shape"""
+        return {
+            'number': issue['number'],
+            'title': issue['title'],
+            'body': issue['body'],
+            'state': issue['state'],
+            'created_at': issue['created_at'],
+            'updated_at': issue['updated_at'],
+            'html_url': issue['html_url'],
+            'user': {
+                'login': issue['user']['login'],
+                'avatar_url': issue['user']['avatar_url']
+            },
+            'labels': [label['name'] for label in issue.get('labels', [])],
+            'total_comments': total_comments,
+            'cuevasm_comments': cuevasm_comments,
+            'cuevasm_comment_count': len(cuevasm_comments)
+        }
+    
+    def result_header(self) -> Dict[str, Any]:
+        """Extraction metadata written ahead of the issues"""
+        return {
+            'extraction_date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'repository': f"{self.owner}/{self.repo}",
+            'target_user': self.target_user,
+            'reviewers': self.reviewers
+        }
+    
+    def summarize(self, processed_issues: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summary statistics computed in one pass over the issues"""
+        summary = {'total_issues': 0, 'total_cuevasm_comments': 0, 'issues_with_cuevasm_comments': 0}
+        
+        for issue in processed_issues:
+            summary['total_issues'] += 1
+            summary['total_cuevasm_comments'] += issue['cuevasm_comment_count']
+            if issue['cuevasm_comment_count'] > 0:
+                summary['issues_with_cuevasm_comments'] += 1
+        
+        return summary
+    
+    def build_result(self, processed_issues: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Wrap processed issues with extraction metadata and summary statistics"""
+        return {
+            **self.result_header(),
+            'summary': self.summarize(processed_issues),
+            'issues': processed_issues
+        }
+    
+    def _advance_sync_mark(self, issues: List[Dict[str, Any]]):
+        """Move the high-water mark to the newest updated_at seen.
+        
+        Using the server's own timestamps avoids clock skew, and leaving the
+        mark untouched when nothing changed keeps the next ``since`` query
+        identical so it can be answered with a 304.
+        """
+        timestamps = [issue['updated_at'] for issue in issues]
+        if self.sync_state['last_sync']:
+            timestamps.append(self.sync_state['last_sync'])
+        if timestamps:
+            self.sync_state['last_sync'] = max(timestamps, key=to_epoch)
+    
+    def iter_processed_issues(self) -> Iterator[Dict[str, Any]]:
+        """Yield each processed issue as soon as its comments have been fetched"""
+        if self.backend == 'graphql':
+            print("Starting data extraction (GraphQL)...")
+            graphql = GraphQLBackend(self, transport=self.graphql_transport)
+            yield from graphql.iter_processed_issues()
+            print(f"GraphQL queries: {graphql.request_count}")
+            return
+        
         print("Starting data extraction...")
         
         # Get all issues
         issues = self.get_all_issues()
         
         # Process each issue
-        processed_issues = []
+        comment_threads = self.fetch_comment_threads([issue['number'] for issue in issues])
         
-        for issue in issues:
+        for issue, comments in zip(issues, comment_threads):
             issue_number = issue['number']
             print(f"\nProcessing issue #{issue_number}: {issue['title'][:50]}...")
             
-            # Get comments for this issue
-            comments = self.get_issue_comments(issue_number)
             cuevasm_comments = self.extract_cuevasm_comments(comments)
             
             # Process issue data
-            processed_issue = {
-                'number': issue['number'],
-                'title': issue['title'],
-                'body': issue['body'],
-                'state': issue['state'],
-                'created_at': issue['created_at'],
-                'updated_at': issue['updated_at'],
-                'html_url': issue['html_url'],
-                'user': {
-                    'login': issue['user']['login'],
-                    'avatar_url': issue['user']['avatar_url']
-                },
-                'labels': [label['name'] for label in issue.get('labels', [])],
-                'total_comments': len(comments),
-                'cuevasm_comments': cuevasm_comments,
-                'cuevasm_comment_count': len(cuevasm_comments)
-            }
+            processed_issue = self.process_issue(issue, cuevasm_comments, len(comments))
             
-            processed_issues.append(processed_issue)
             print(f"  - Total comments: {len(comments)}")
             print(f"  - cuevasm comments: {len(cuevasm_comments)}")
+            yield processed_issue
         
-        # Summary statistics
-        total_cuevasm_comments = sum(issue['cuevasm_comment_count'] for issue in processed_issues)
-        issues_with_cuevasm_comments = len([issue for issue in processed_issues if issue['cuevasm_comment_count'] > 0])
+        self._advance_sync_mark(issues)
+    
+    def extract_all_data(self) -> Dict[str, Any]:
+        """Extract all issues and cuevasm's comments"""
+        return self.build_result(list(self.iter_processed_issues()))
+    
+    def iter_incremental(self, existing_issues: Callable[[], Iterable[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """Fetch only issues and comments changed since the last sync and merge them.
         
-        result = {
-            'extraction_date': time.strftime('%Y-%m-%d %H:%M:%S'),
-            'repository': f"{self.owner}/{self.repo}",
-            'target_user': self.target_user,
-            'summary': {
-                'total_issues': len(processed_issues),
-                'total_cuevasm_comments': total_cuevasm_comments,
-                'issues_with_cuevasm_comments': issues_with_cuevasm_comments
-            },
-            'issues': processed_issues
-        }
+        ``existing_issues`` returns a fresh iterator over the stored issues each
+        time it is called, so a streamed artifact is re-read rather than held in
+        memory; only changed issues are kept while merging. Issues are listed
+        with ``since=<last sync>``; for each changed issue only comments updated
+        after its previously stored ``updated_at`` are fetched and merged by
+        comment id. Deleted comments are only picked up by a full extraction.
+        """
+        since = self.sync_state.get('last_sync')
+        if not since:
+            print("No previous sync recorded, running full extraction")
+            yield from self.iter_processed_issues()
+            return
+        
+        print(f"Starting incremental extraction (changes since {since})...")
+        
+        known_updated_at = {issue['number']: issue['updated_at'] for issue in existing_issues()}
+        # Issues changed by webhook events since the last sync are refetched as
+        # of their state before the first event (see webhook_receiver.py)
+        for number, updated_at in self.sync_state.pop('webhook_baseline', {}).items():
+            known_updated_at[int(number)] = updated_at
+        changed_issues = self.get_all_issues(since=since)
+        
+        # The issue at the since boundary is returned again; skip unchanged ones
+        dirty_issues = [
+            issue for issue in changed_issues
+            if known_updated_at.get(issue['number']) != issue['updated_at']
+        ]
+        dirty_numbers = {issue['number'] for issue in dirty_issues}
+        existing = {issue['number']: issue for issue in existing_issues() if issue['number'] in dirty_numbers}
+        
+        comment_threads = self.fetch_comment_threads(
+            [issue['number'] for issue in dirty_issues],
+            [known_updated_at.get(issue['number']) for issue in dirty_issues],
+            repository_since=since
+        )
+        
+        updated = {}
+        for issue, comments in zip(dirty_issues, comment_threads):
+            issue_number = issue['number']
+            previous = existing.get(issue_number)
+            
+            print(f"\nUpdating issue #{issue_number}: {issue['title'][:50]}...")
+            
+            if previous is None:
+                comments = comments or []
+                if len(comments) < issue.get('comments', 0):
+                    # New issue with comments older than the repository listing window
+                    comments = self.get_issue_comments(issue_number)
+                cuevasm_comments = self.extract_cuevasm_comments(comments)
+                total_comments = len(comments)
+            else:
+                merged = {c['id']: c for c in previous['cuevasm_comments']}
+                for comment in self.extract_cuevasm_comments(comments or []):
+                    merged[comment['id']] = comment
+                cuevasm_comments = sorted(merged.values(), key=lambda c: to_epoch(c['created_at']))
+                total_comments = issue.get('comments', previous['total_comments'])
+            
+            updated[issue_number] = self.process_issue(issue, cuevasm_comments, total_comments)
+            print(f"  - Total comments: {total_comments}")
+            print(f"  - cuevasm comments: {len(cuevasm_comments)}")
         
-        return result
+        # Keep the original ordering, appending issues that are new
+        for issue in existing_issues():
+            yield updated.pop(issue['number'], issue)
+        yield from updated.values()
+        
+        self._advance_sync_mark(changed_issues)
+        print(f"\nChanged issues: {len(dirty_issues)}, not-modified responses: {self.not_modified_count}")
+    
+    def extract_incremental(self, existing_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge changes since the last sync into already extracted data"""
+        return self.build_result(list(self.iter_incremental(lambda: iter(existing_data['issues']))))
+
+def extract_to_file(extractor: GitHubExtractor, output_file: str, full: bool = False,
+                    restart: bool = False) -> Dict[str, Any]:
+    """Extract into output_file, incrementally when it already exists; returns the summary"""
+    # Every completed page is logged; an interrupted run resumes from the log
+    # and only requests the pages it never finished
+    checkpoint_file = f"{os.path.splitext(output_file)[0]}.checkpoint.jsonl"
+    if restart and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    if extractor.backend == 'rest':
+        extractor.checkpoint = ExtractionCheckpoint(checkpoint_file)
+        if extractor.checkpoint.completed_pages:
+            print(f"Resuming from checkpoint ({extractor.checkpoint.completed_pages} pages already fetched)")
+    
+    if not full and os.path.exists(output_file):
+        stored_reviewers = read_metadata(output_file).get('reviewers', [extractor.target_user])
+        if stored_reviewers != extractor.reviewers:
+            # Comments by newly added reviewers are older than the sync mark
+            print(f"Reviewers changed from {', '.join(stored_reviewers)}; running full extraction")
+            full = True
+    
+    if extractor.backend == 'rest' and not full and os.path.exists(output_file):
+        issues = extractor.iter_incremental(lambda: iter_issues(output_file))
+    else:
+        issues = extractor.iter_processed_issues()
+    
+    if is_sqlite(output_file):
+        # Upsert issue by issue; rows of unchanged issues are left alone
+        summary = write_issues(output_file, extractor.result_header(), issues)
+    elif is_jsonl(output_file):
+        # Stream issues into a partial file as they complete; a crashed run
+        # leaves the previous output intact and a readable partial file
+        partial_file = f"{os.path.splitext(output_file)[0]}.partial.jsonl"
+        with JsonlWriter(partial_file, extractor.result_header()) as writer:
+            for issue in issues:
+                writer.write_issue(issue)
+            summary = extractor.summarize(iter_issues(partial_file))
+            writer.close(summary)
+        os.replace(partial_file, output_file)
+    else:
+        data = extractor.build_result(list(issues))
+        summary = data['summary']
+        write_artifact(output_file, data)
+    
+    if isinstance(extractor.graphql_transport, RecordingTransport):
+        extractor.graphql_transport.save()
+    extractor.save_sync_state()
+    if extractor.checkpoint:
+        extractor.checkpoint.discard()
+    
+    return summary
 
 def main():
-    extractor = GitHubExtractor()
-    data = extractor.extract_all_data()
+    parser = argparse.ArgumentParser(description="Extract SIP-31 grant issues and cuevasm's comments")
+    parser.add_argument('--output', default=data_path(ISSUES_FILE),
+                        help='Path of the extracted data file (.jsonl streams one issue per line, '
+                             '.db or .sqlite upserts into a SQLite store)')
+    parser.add_argument('--state-file', default=None,
+                        help='Sync state file (defaults to <output>.sync.json)')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore existing data and sync state and refetch everything')
+    parser.add_argument('--comment-strategy', choices=COMMENT_STRATEGIES, default='per_issue',
+                        help="Fetch comments per issue or with one repository-wide listing")
+    parser.add_argument('--backend', choices=BACKENDS, default='rest',
+                        help='Extract through the REST or GraphQL API (GraphQL always runs a full extraction)')
+    parser.add_argument('--record-graphql', metavar='FIXTURE',
+                        help='Record GraphQL responses to a fixture file')
+    parser.add_argument('--replay-graphql', metavar='FIXTURE',
+                        help='Answer GraphQL queries offline from a recorded fixture file')
+    parser.add_argument('--restart', action='store_true',
+                        help='Discard the checkpoint of an interrupted run instead of resuming it')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Number of comment threads fetched concurrently (1 = sequential)')
+    parser.add_argument('--repo', default=DEFAULT_REPOSITORY, help='Repository to extract (owner/name)')
+    parser.add_argument('--reviewer', action='append', dest='reviewers',
+                        help=f"Reviewer whose comments are kept; repeat for several (default: {DEFAULT_REVIEWERS[0]})")
+    add_arguments(parser)
+    args = parser.parse_args()
+    
+    output_file = args.output
+    state_file = args.state_file or f"{os.path.splitext(output_file)[0]}.sync.json"
+    
+    if args.full and os.path.exists(state_file):
+        os.remove(state_file)
     
-    # Save to JSON file
-    output_file = '/home/ubuntu/github_issues_data.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    extractor = GitHubExtractor(state_file=state_file, max_workers=args.workers,
+                                comment_strategy=args.comment_strategy, backend=args.backend,
+                                repository=args.repo, reviewers=args.reviewers)
+    
+    if args.replay_graphql:
+        extractor.graphql_transport = ReplayTransport(args.replay_graphql)
+    elif args.record_graphql:
+        extractor.graphql_transport = RecordingTransport(
+            GraphQLBackend(extractor)._http_transport, args.record_graphql)
+    
+    summary = run_instrumented(
+        args, lambda: extract_to_file(extractor, output_file, full=args.full, restart=args.restart))
     
     print(f"\n=== EXTRACTION COMPLETE ===")
     print(f"Data saved to: {output_file}")
-    print(f"Total issues: {data['summary']['total_issues']}")
-    print(f"Total cuevasm comments: {data['summary']['total_cuevasm_comments']}")
-    print(f"Issues with cuevasm comments: {data['summary']['issues_with_cuevasm_comments']}")
+    print(f"Total issues: {summary['total_issues']}")
+    print(f"Total cuevasm comments: {summary['total_cuevasm_comments']}")
+    print(f"Issues with cuevasm comments: {summary['issues_with_cuevasm_comments']}")
+    
+    stats = extractor.scheduler.stats()
+    print(f"\nRequests: {stats['requests']} (retries: {stats['retries']}, "
+          f"waited {stats['wait_seconds']}s, rate-limit waits: {stats['rate_limit_waits']})")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+GraphQL Extraction Backend
+Fetches issues, labels, author avatars and comment threads through the
+GitHub GraphQL API in batched, cursor-paginated queries and produces the
+same processed issue records as the REST extractor
+"""
+
+import json
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+
+ISSUE_FIELDS = """
+    number
+    title
+    body
+    state
+    createdAt
+    updatedAt
+    url
+    author { login avatarUrl }
+    labels(first: 100) { nodes { name } }
+    comments(first: $commentsFirst) {
+      totalCount
+      pageInfo { hasNextPage endCursor }
+      nodes { databaseId body createdAt updatedAt url author { login } }
+    }
+"""
+
+ISSUES_QUERY = """
+query($owner: String!, $repo: String!, $states: [IssueState!], $first: Int!, $commentsFirst: Int!, $after: String) {
+  repository(owner: $owner, name: $repo) {
+    issues(first: $first, after: $after, states: $states, orderBy: {field: CREATED_AT, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {%s}
+    }
+  }
+}
+""" % ISSUE_FIELDS
+
+COMMENTS_QUERY = """
+query($owner: String!, $repo: String!, $number: Int!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $repo) {
+    issue(number: $number) {
+      comments(first: $first, after: $after) {
+        pageInfo { hasNextPage endCursor }
+        nodes { databaseId body createdAt updatedAt url author { login } }
+      }
+    }
+  }
+}
+"""
+
+# A transport takes (query, variables) and returns the decoded JSON response
+Transport = Callable[[str, Dict[str, Any]], Dict[str, Any]]
+
+def _fixture_key(variables: Dict[str, Any]) -> str:
+    return json.dumps(variables, sort_keys=True)
+
+class RecordingTransport:
+    """Wraps a transport and records every exchange to a fixture file"""
+    
+    def __init__(self, transport: Transport, fixture_file: str):
+        self.transport = transport
+        self.fixture_file = fixture_file
+        self.exchanges: List[Dict[str, Any]] = []
+    
+    def __call__(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.transport(query, variables)
+        self.exchanges.append({'variables': variables, 'response': response})
+        return response
+    
+    def save(self):
+        with open(self.fixture_file, 'w', encoding='utf-8') as f:
+            json.dump(self.exchanges, f, indent=2, ensure_ascii=False)
+
+class ReplayTransport:
+    """Answers queries offline from a recorded fixture file"""
+    
+    def __init__(self, fixture_file: str):
+        with open(fixture_file, 'r', encoding='utf-8') as f:
+            exchanges = json.load(f)
+        self.responses = {_fixture_key(e['variables']): e['response'] for e in exchanges}
+        self.request_count = 0
+    
+    def __call__(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        self.request_count += 1
+        key = _fixture_key(variables)
+        if key not in self.responses:
+            raise KeyError(f"No recorded GraphQL response for variables {key}")
+        return self.responses[key]
+
+class GraphQLBackend:
+    def __init__(self, extractor, transport: Optional[Transport] = None,
+                 page_size: int = 50, comments_page_size: int = 100):
+        """
+        extractor supplies the repository, target user, scheduler and the
+        issue normalization shared with the REST path.
+        """
+        self.extractor = extractor
+        self.transport = transport or self._http_transport
+        self.page_size = page_size
+        self.comments_page_size = comments_page_size
+        self.request_count = 0
+    
+    @property
+    def graphql_url(self) -> str:
+        return f"{self.extractor.base_url}/graphql"
+    
+    def _http_transport(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.extractor.scheduler.post(self.graphql_url, json={'query': query, 'variables': variables})
+        
+        if response.status_code != 200:
+            print(f"Error running GraphQL query: {response.status_code}")
+            response.raise_for_status()
+        
+        return response.json()
+    
+    def _query(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        self.request_count += 1
+        result = self.transport(query, variables)
+        
+        if result.get('errors'):
+            messages = '; '.join(error.get('message', '') for error in result['errors'])
+            raise RuntimeError(f"GraphQL query failed: {messages}")
+        
+        return result['data']['repository']
+    
+    def _rest_comment(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a GraphQL comment node onto the REST comment fields we use"""
+        return {
+            'id': node['databaseId'],
+            'body': node['body'],
+            'created_at': node['createdAt'],
+            'updated_at': node['updatedAt'],
+            'html_url': node['url'],
+            'user': {'login': (node.get('author') or {}).get('login', 'ghost')}
+        }
+    
+    def _rest_issue(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a GraphQL issue node onto the REST issue fields we use"""
+        author = node.get('author') or {'login': 'ghost', 'avatarUrl': ''}
+        return {
+            'number': node['number'],
+            'title': node['title'],
+            # REST returns null rather than an empty string for missing bodies
+            'body': node['body'] or None,
+            'state': node['state'].lower(),
+            'created_at': node['createdAt'],
+            'updated_at': node['updatedAt'],
+            'html_url': node['url'],
+            'user': {'login': author['login'], 'avatar_url': author['avatarUrl']},
+            'labels': [{'name': label['name']} for label in node['labels']['nodes']],
+            'comments': node['comments']['totalCount']
+        }
+    
+    def _remaining_comments(self, issue_number: int, after: str) -> List[Dict[str, Any]]:
+        """Page through the rest of a thread longer than the first batch"""
+        comments = []
+        
+        while after:
+            data = self._query(COMMENTS_QUERY, {
+                'owner': self.extractor.owner,
+                'repo': self.extractor.repo,
+                'number': issue_number,
+                'first': self.comments_page_size,
+                'after': after
+            })
+            connection = data['issue']['comments']
+            comments.extend(self._rest_comment(node) for node in connection['nodes'])
+            after = connection['pageInfo']['endCursor'] if connection['pageInfo']['hasNextPage'] else None
+        
+        return comments
+    
+    def _issues_by_state(self, state: str) -> Iterator[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Yield issues in one state with their comment threads, batch by batch"""
+        after = None
+        page = 1
+        
+        while True:
+            print(f"Fetching {state.lower()} issues batch {page} (GraphQL)...")
+            data = self._query(ISSUES_QUERY, {
+                'owner': self.extractor.owner,
+                'repo': self.extractor.repo,
+                'states': [state],
+                'first': self.page_size,
+                'commentsFirst': self.comments_page_size,
+                'after': after
+            })
+            connection = data['issues']
+            
+            for node in connection['nodes']:
+                issue = self._rest_issue(node)
+                comments = [self._rest_comment(c) for c in node['comments']['nodes']]
+                page_info = node['comments']['pageInfo']
+                if page_info['hasNextPage']:
+                    comments.extend(self._remaining_comments(node['number'], page_info['endCursor']))
+                yield issue, comments
+            
+            if not connection['pageInfo']['hasNextPage']:
+                break
+            
+            after = connection['pageInfo']['endCursor']
+            page += 1
+    
+    def iter_processed_issues(self) -> Iterator[Dict[str, Any]]:
+        """Yield every issue as the same record the REST path builds.
+        
+        Open issues come before closed ones, each ordered by creation date,
+        matching the order of the REST listing.
+        """
+        for state in ('OPEN', 'CLOSED'):
+            for issue, comments in self._issues_by_state(state):
+                cuevasm_comments = self.extractor.extract_cuevasm_comments(comments)
+                self.extractor._advance_sync_mark([issue])
+                yield self.extractor.process_issue(issue, cuevasm_comments, len(comments))
+    
+    def fetch_processed_issues(self) -> List[Dict[str, Any]]:
+        """Fetch every issue and build the same records as the REST path"""
+        processed_issues = list(self.iter_processed_issues())
+        print(f"Total issues found: {len(processed_issues)}")
+        return processed_issues
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Instrumentation
+Process-wide run recorder: stage and function wall times, HTTP request
+counts, latencies and bytes, and peak memory, written as a JSON run report
+"""
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows; peak memory is then omitted
+    resource = None
+
+# Upper bounds (milliseconds) of the HTTP latency histogram buckets
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+class RunRecorder:
+    """Accumulates timings and HTTP statistics for one run.
+    
+    Functions are timed by the timed() decorator and requests by a response
+    hook on the extractor's session, so recording costs two clock reads per
+    call and nothing has to be threaded through the call stack. Comment
+    threads are fetched from several threads, hence the lock.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Start a new run, discarding everything recorded so far"""
+        with self._lock:
+            self.started_at = datetime.now().isoformat()
+            self._start = time.perf_counter()
+            self.stages: Dict[str, float] = {}
+            self.functions: Dict[str, list] = {}
+            self.http = {
+                'requests': 0,
+                'bytes': 0,
+                'seconds': 0.0,
+                'max_seconds': 0.0,
+                'status': {},
+                'latency_ms': [0] * (len(LATENCY_BUCKETS_MS) + 1)
+            }
+    
+    def add_stage(self, name: str, seconds: float):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+    
+    def add_call(self, name: str, seconds: float):
+        with self._lock:
+            totals = self.functions.get(name)
+            if totals is None:
+                totals = self.functions[name] = [0, 0.0]
+            totals[0] += 1
+            totals[1] += seconds
+    
+    def record_response(self, response, *args, **kwargs):
+        """requests response hook: count the request, its latency and body size"""
+        seconds = response.elapsed.total_seconds()
+        size = len(response.content or b'')
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS_MS) and seconds * 1000 > LATENCY_BUCKETS_MS[bucket]:
+            bucket += 1
+        
+        with self._lock:
+            http = self.http
+            http['requests'] += 1
+            http['bytes'] += size
+            http['seconds'] += seconds
+            http['max_seconds'] = max(http['max_seconds'], seconds)
+            http['status'][response.status_code] = http['status'].get(response.status_code, 0) + 1
+            http['latency_ms'][bucket] += 1
+    
+    def peak_memory(self) -> Optional[int]:
+        """Peak resident set size of this process in bytes"""
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports kilobytes, macOS bytes
+        return peak if sys.platform == 'darwin' else peak * 1024
+    
+    def report(self, **extra: Any) -> Dict[str, Any]:
+        """Machine-readable summary of the run so far"""
+        with self._lock:
+            http = self.http
+            labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+            functions = sorted(self.functions.items(), key=lambda item: -item[1][1])
+            return {
+                'command': sys.argv,
+                'started_at': self.started_at,
+                'wall_seconds': round(time.perf_counter() - self._start, 3),
+                'stages': {name: round(seconds, 3) for name, seconds in self.stages.items()},
+                'functions': {
+                    name: {
+                        'calls': calls,
+                        'seconds': round(seconds, 4),
+                        'mean_ms': round(seconds * 1000 / calls, 4)
+                    }
+                    for name, (calls, seconds) in functions
+                },
+                'http': {
+                    'requests': http['requests'],
+                    'bytes': http['bytes'],
+                    'seconds': round(http['seconds'], 3),
+                    'mean_ms': round(http['seconds'] * 1000 / http['requests'], 2) if http['requests'] else None,
+                    'max_ms': round(http['max_seconds'] * 1000, 2),
+                    'status': {str(status): count for status, count in sorted(http['status'].items())},
+                    'latency_ms': dict(zip(labels, http['latency_ms']))
+                },
+                'memory': {'peak_rss_bytes': self.peak_memory()},
+                **extra
+            }
+    
+    def write_report(self, path: str, **extra: Any) -> Dict[str, Any]:
+        report = self.report(**extra)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        return report
+
+# The recorder every instrumented module reports to
+recorder = RunRecorder()
+
+class timed:
+    """Record the wall time of a block, or of every call when used as a decorator"""
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc):
+        recorder.add_call(self.name, time.perf_counter() - self._start)
+    
+    def __call__(self, func: Callable) -> Callable:
+        name = self.name
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                recorder.add_call(name, time.perf_counter() - start)
+        
+        return wrapper
+
+def record_response(response, *args, **kwargs):
+    """Session response hook that reports to the process-wide recorder"""
+    recorder.record_response(response)
+
+def add_arguments(parser):
+    """--report and --profile options shared by the command-line entry points"""
+    parser.add_argument('--report', metavar='FILE',
+                        help='Where to write the JSON run report (stage, function and HTTP timings, peak memory)')
+    parser.add_argument('--profile', metavar='FILE',
+                        help='Also run under cProfile and dump the stats to FILE (read with pstats)')
+
+def run_instrumented(args, func: Callable[[], Any]) -> Any:
+    """Run func, honouring the --report and --profile options; returns its result.
+    
+    A JSON-serializable result is included in the report under 'result'.
+    """
+    recorder.reset()
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler:
+        profiler.enable()
+    try:
+        result = func()
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            print(f"Profile written to: {args.profile}")
+    
+    if args.report:
+        os.makedirs(os.path.dirname(os.path.abspath(args.report)), exist_ok=True)
+        recorder.write_report(args.report, result=result)
+        print(f"Run report written to: {args.report}")
+    return result
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Markdown Renderer
+Single-pass Markdown to HTML conversion for issue bodies and comments
+"""
+
+import html
+import re
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from instrumentation import timed
+
+# Bump whenever the generated HTML changes, so cached renders are invalidated
+RENDERER_VERSION = 1
+
+# Block tokens: each line is classified by one match, named by its outer group
+BLOCK = re.compile(
+    r'(?P<blank>\s*$)'
+    r'|(?P<rule>\s{0,3}(?:(?:-\s*){3,}|(?:\*\s*){3,}|(?:_\s*){3,})$)'
+    r'|(?P<item>(?P<indent>\s*)(?P<marker>[-*+]|\d+[.)])\s+(?P<text>.*)$)'
+    r'|(?P<fence>\s*(?P<fence_marker>`{3,}|~{3,})\s*(?P<lang>[\w+-]*))'
+    r'|(?P<heading>\s{0,3}(?P<hashes>#{1,6})\s+(?P<heading_text>.*?)(?:\s+#+)?\s*$)'
+    r'|(?P<quote>\s{0,3}>)'
+)
+TASK = re.compile(r'^\[(?P<done>[ xX])\]\s+')
+QUOTE = re.compile(r'^\s{0,3}>\s?(?P<text>.*)$')
+TABLE_SEPARATOR = re.compile(r'^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$')
+CELL_SPLIT = re.compile(r'(?<!\\)\|')
+
+# Inline tokens, found left to right by one scan over HTML-escaped text; at
+# each position the token kinds below are tried in order and the first that
+# matches wins. A delimited span (code, emphasis, strike, link label) ends at
+# the first valid closer after its opener. Openers are tried left to right,
+# so a closer search reuses the previous one of its kind and openers that are
+# never closed do not each rescan the rest of the line.
+INLINE = re.compile(
+    # Cheap first-character check so most positions are rejected at once
+    r'(?=[\\`!\[*_~]|https?://)'
+    # Escapes and bare URLs are whole tokens; the other alternatives match
+    # one character of an opener, so a failed opener is retried one further
+    r'(?:(?P<escape>\\[\\`*_{}\[\]()#+\-.!|$~])'
+    r'|(?P<code>`)'
+    r'|(?P<image>!(?=\[))'
+    r'|(?P<link>\[)'
+    r'|(?P<url>\bhttps?://(?:[^\s()\[\]&]|&amp;)*[^\s()\[\]&.,;:!?*_])'
+    r'|(?P<strong>\*(?=\*\S)|(?<!\w)_(?=_\S))'
+    r'|(?P<em>(?<!\*)\*(?=[^\s*])|(?<!\w)_(?=[^\s_]))'
+    r'|(?P<strike>~(?=~\S)))'
+)
+# Closer position per emphasis delimiter; underscores need a word boundary outside
+CLOSERS = {
+    '**': re.compile(r'(?<=\S)(?=\*\*)'),
+    '__': re.compile(r'(?<=\S)(?=__(?!\w))'),
+    '*': re.compile(r'(?<=[^\s*])(?=\*(?!\*))'),
+    '_': re.compile(r'(?<=[^\s_])(?=_(?!\w))'),
+    '~~': re.compile(r'(?<=\S)(?=~~)'),
+}
+EMPHASIS = {'strong': ('strong', 2), 'em': ('em', 1), 'strike': ('del', 2)}
+# A link target is '](href)' or '](href "title")'; href runs to the first ')' or space
+HREF_END = re.compile(r'[)\s]')
+TITLE_OPEN = re.compile(r'\s+&quot;')
+NEWLINE = re.compile(r'\n')
+BACKTICK_RUN_END = re.compile(r'(?<=`)(?!`)')
+INLINE_MARKERS = re.compile(r'[\\`\[*_~]|://')
+SAFE_URL = re.compile(r'^(?:https?://|mailto:|#|/)', re.IGNORECASE)
+
+ALIGNMENTS = {(True, True): 'center', (True, False): 'left', (False, True): 'right'}
+
+class _Delimiters:
+    """Closing delimiter searches over one text, reusing earlier results"""
+    
+    def __init__(self, text: str):
+        self.text = text
+        self._last: Dict[Any, Tuple[int, Optional[int], int]] = {}
+        self._newlines = [m.start() for m in NEWLINE.finditer(text)] if '\n' in text else None
+        self._targets: Dict[int, Optional[Tuple[int, str]]] = {}
+    
+    def find(self, target, start: int, end: int) -> Optional[int]:
+        """First position of target (a string or pattern) in text[start:end]
+        
+        Openers are tried left to right, so the last search per target is
+        kept and answers any later one starting inside the span it covered.
+        """
+        last = self._last.get(target)
+        if last and last[0] <= start and last[2] == end and (last[1] is None or start <= last[1]):
+            return last[1]
+        if isinstance(target, str):
+            found: Optional[int] = self.text.find(target, start, end)
+            if found < 0:
+                found = None
+        else:
+            match = target.search(self.text, start, end)
+            found = match.start() if match else None
+        self._last[target] = (start, found, end)
+        return found
+    
+    def line_end(self, position: int) -> int:
+        """Index of the newline ending the line at position, or the text length"""
+        if not self._newlines:
+            return len(self.text)
+        i = bisect_left(self._newlines, position)
+        return self._newlines[i] if i < len(self._newlines) else len(self.text)
+    
+    def link_target(self, close: int) -> Optional[Tuple[int, str]]:
+        """End and href of the '](href "title")' after the label closed at close"""
+        if close not in self._targets:
+            self._targets[close] = self._link_target(close)
+        return self._targets[close]
+    
+    def _link_target(self, close: int) -> Optional[Tuple[int, str]]:
+        text = self.text
+        if not text.startswith('](', close):
+            return None
+        href_end = self.find(HREF_END, close + 2, len(text))
+        if href_end is None or href_end == close + 2:
+            return None
+        href = text[close + 2:href_end]
+        if text[href_end] == ')':
+            return href_end + 1, href
+        title = TITLE_OPEN.match(text, href_end)
+        if not title:
+            return None
+        end = self.find('&quot;)', title.end(), self.line_end(title.end()))
+        return (end + len('&quot;)'), href) if end is not None else None
+
+class MarkdownRenderer:
+    """Renders the Markdown used in grant applications to HTML.
+    
+    Lines are classified once each (fences, headings, rules, lists,
+    blockquotes, tables, paragraphs) and inline text is tokenized by one
+    left-to-right scan whose closing delimiter searches never cover the same
+    text twice, so the cost stays linear even with many unclosed '*' or '['.
+    Emphasis needs a word boundary on the outside, so snake_case names
+    and underscores inside URLs are left alone. Raw HTML is escaped.
+    """
+    
+    @timed('markdown.render')
+    def render(self, text: str) -> str:
+        """Convert Markdown text to HTML"""
+        if not text:
+            return ""
+        
+        lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        out: List[str] = []
+        paragraph: List[str] = []
+        lists: List[Tuple[int, str]] = []  # open (indent, tag) pairs, innermost last
+        list_blank = False
+        i = 0
+        
+        while i < len(lines):
+            line = lines[i]
+            block = BLOCK.match(line)
+            kind = block.lastgroup if block else 'text'
+            
+            if kind == 'blank':
+                if paragraph:
+                    self._flush_paragraph(paragraph, out)
+                list_blank = bool(lists)
+                i += 1
+                continue
+            
+            if lists and kind != 'item':
+                if kind != 'fence' and len(line) - len(line.lstrip()) > lists[0][0]:
+                    # Continuation of the open list item
+                    out.append(('<br><br>' if list_blank else '<br>') + self.render_inline(line.strip()))
+                    list_blank = False
+                    i += 1
+                    continue
+                self._close_lists(lists, out)
+            
+            if kind == 'text':
+                if ('|' in line and i + 1 < len(lines) and '-' in lines[i + 1]
+                        and TABLE_SEPARATOR.match(lines[i + 1])):
+                    self._flush_paragraph(paragraph, out)
+                    i = self._render_table(lines, i, out)
+                else:
+                    paragraph.append(line.strip())
+                    i += 1
+                continue
+            
+            self._flush_paragraph(paragraph, out)
+            
+            if kind == 'item':
+                self._open_item(block, lists, out)
+                list_blank = False
+                i += 1
+            elif kind == 'fence':
+                i = self._render_fence(lines, i, block, out)
+            elif kind == 'heading':
+                level = len(block.group('hashes'))
+                out.append(f"<h{level}>{self.render_inline(block.group('heading_text'))}</h{level}>")
+                i += 1
+            elif kind == 'rule':
+                out.append('<hr>')
+                i += 1
+            else:
+                quoted = []
+                while i < len(lines) and QUOTE.match(lines[i]):
+                    quoted.append(QUOTE.match(lines[i]).group('text'))
+                    i += 1
+                out.append(f"<blockquote>{self.render(chr(10).join(quoted))}</blockquote>")
+        
+        self._flush_paragraph(paragraph, out)
+        self._close_lists(lists, out)
+        return ''.join(out)
+    
+    def _flush_paragraph(self, paragraph: List[str], out: List[str]):
+        """Emit buffered paragraph lines, keeping their line breaks"""
+        if paragraph:
+            out.append('<p>' + self.render_inline('\n'.join(paragraph)).replace('\n', '<br>') + '</p>')
+            paragraph.clear()
+    
+    def _open_item(self, item, lists: List[Tuple[int, str]], out: List[str]):
+        """Start a list item, opening or closing nested lists by indentation"""
+        indent = len(item.group('indent').expandtabs(4))
+        tag = 'ul' if item.group('marker')[0] in '-*+' else 'ol'
+        
+        while lists and lists[-1][0] > indent:
+            out.append(f'</li></{lists.pop()[1]}>')
+        
+        if lists and lists[-1][0] == indent and lists[-1][1] != tag:
+            out.append(f'</li></{lists.pop()[1]}>')
+        
+        if lists and lists[-1][0] == indent:
+            out.append('</li><li>')
+        else:
+            start = ''
+            if tag == 'ol' and not item.group('marker').startswith('1'):
+                start = f' start="{int(item.group("marker")[:-1])}"'
+            out.append(f'<{tag}{start}><li>')
+            lists.append((indent, tag))
+        
+        text = item.group('text')
+        task = TASK.match(text)
+        if task:
+            out.append('&#9745; ' if task.group('done') != ' ' else '&#9744; ')
+            text = text[task.end():]
+        out.append(self.render_inline(text))
+    
+    def _close_lists(self, lists: List[Tuple[int, str]], out: List[str]):
+        """Close every open list"""
+        while lists:
+            out.append(f'</li></{lists.pop()[1]}>')
+    
+    def _render_fence(self, lines: List[str], i: int, fence, out: List[str]) -> int:
+        """Emit a fenced code block verbatim; returns the index after it"""
+        marker = fence.group('fence_marker')
+        lang = fence.group('lang')
+        body = []
+        i += 1
+        while i < len(lines) and not lines[i].strip().startswith(marker):
+            body.append(lines[i])
+            i += 1
+        
+        css = f' class="language-{html.escape(lang)}"' if lang else ''
+        out.append(f"<pre><code{css}>{html.escape(chr(10).join(body))}</code></pre>")
+        return i + 1
+    
+    def _split_cells(self, line: str) -> List[str]:
+        """Split a table row on unescaped pipes"""
+        line = line.strip()
+        if line.startswith('|'):
+            line = line[1:]
+        if line.endswith('|') and not line.endswith('\\|'):
+            line = line[:-1]
+        return [cell.strip() for cell in CELL_SPLIT.split(line)]
+    
+    def _render_table(self, lines: List[str], i: int, out: List[str]) -> int:
+        """Emit a pipe table (header row, separator, body rows); returns the index after it"""
+        header = self._split_cells(lines[i])
+        aligns: List[Optional[str]] = []
+        for cell in self._split_cells(lines[i + 1]):
+            aligns.append(ALIGNMENTS.get((cell.startswith(':'), cell.endswith(':'))))
+        
+        def row(cells: List[str], tag: str) -> str:
+            parts = []
+            for index, cell in enumerate(cells):
+                align = aligns[index] if index < len(aligns) else None
+                style = f' style="text-align:{align}"' if align else ''
+                parts.append(f'<{tag}{style}>{self.render_inline(cell)}</{tag}>')
+            return '<tr>' + ''.join(parts) + '</tr>'
+        
+        body = []
+        i += 2
+        while i < len(lines) and '|' in lines[i] and lines[i].strip():
+            body.append(row(self._split_cells(lines[i]), 'td'))
+            i += 1
+        
+        out.append('<table><thead>' + row(header, 'th') + '</thead>'
+                   + ('<tbody>' + ''.join(body) + '</tbody>' if body else '') + '</table>')
+        return i
+    
+    def render_inline(self, text: str) -> str:
+        """Convert inline Markdown (code, links, emphasis); newlines are kept"""
+        return self._inline(html.escape(text))
+    
+    def _inline(self, text: str) -> str:
+        """HTML for inline tokens of already-escaped text"""
+        if not INLINE_MARKERS.search(text):
+            return text
+        delimiters = _Delimiters(text)
+        out = []
+        done = 0
+        candidate = INLINE.search(text)
+        while candidate:
+            token = self._inline_token(candidate, delimiters)
+            if token:
+                out.append(text[done:candidate.start()])
+                out.append(token[1])
+                done = token[0]
+            candidate = INLINE.search(text, token[0] if token else candidate.end())
+        out.append(text[done:])
+        return ''.join(out)
+    
+    def _inline_token(self, candidate, delimiters: _Delimiters) -> Optional[Tuple[int, str]]:
+        """End and HTML of the inline token starting at a candidate match, if one does"""
+        text = delimiters.text
+        start = candidate.start()
+        kind = candidate.lastgroup
+        
+        if kind == 'escape':
+            return candidate.end(), candidate.group()[1]
+        if kind == 'url':
+            return candidate.end(), self._link(candidate.group(), candidate.group())
+        if kind == 'code':
+            return self._code_span(text, start, delimiters)
+        if kind in ('image', 'link'):
+            return self._link_token(text, start, delimiters)
+        
+        tag, width = EMPHASIS[kind]
+        # The span is one line at least one character long
+        end = delimiters.find(CLOSERS[text[start:start + width]], start + width + 1, delimiters.line_end(start))
+        if end is None:
+            return None
+        return end + width, f'<{tag}>{self._inline(text[start + width:end])}</{tag}>'
+    
+    def _code_span(self, text: str, start: int, delimiters: _Delimiters) -> Optional[Tuple[int, str]]:
+        """Code span opened by the backticks at start, closed by as many on the same line"""
+        run = delimiters.find(BACKTICK_RUN_END, start + 1, len(text)) - start
+        line_end = delimiters.line_end(start)
+        # Longest opening run first, as long as a closer of that width still fits on the line
+        for width in range(min(run, (line_end - start - 1) // 2), 0, -1):
+            end = delimiters.find('`' * width, start + width + 1, line_end)
+            if end is not None:
+                return end + width, f"<code>{text[start + width:end].strip()}</code>"
+        return None
+    
+    def _link_token(self, text: str, start: int, delimiters: _Delimiters) -> Optional[Tuple[int, str]]:
+        """Image or link starting at start: the label runs to the first ']', then '(href)' must follow"""
+        image = text[start] == '!'
+        label_start = start + 2 if image else start + 1
+        close = delimiters.find(']', label_start, len(text))
+        if close is None or (close == label_start and not image):
+            return None
+        target = delimiters.link_target(close)
+        if not target:
+            return None
+        end, href = target
+        label = text[label_start:close]
+        if image:
+            return end, self._link(href, label or href)
+        return end, self._link(href, self._inline(label))
+    
+    def _link(self, href: str, label: str) -> str:
+        """Anchor tag for an escaped link, or just its label if the URL scheme is unsafe"""
+        if not SAFE_URL.match(href):
+            return label
+        return f'<a href="{href}" target="_blank">{label}</a>'
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Incremental Pipeline
+Runs extraction, comment analysis and web processing as one step, passing
+only the issues that changed since the previous run through the analyzer
+and processor
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+from artifacts import DATA_DIR, data_path, issues_path, iter_issues, read_metadata
+from comment_analyzer import AnalysisAggregate, CommentAnalyzer
+from data_processor import SummaryStats, WebDataProcessor, add_date_arguments
+from github_extractor import DEFAULT_REPOSITORY, GitHubExtractor, extract_to_file
+from instrumentation import add_arguments, recorder, run_instrumented
+from request_scheduler import RequestScheduler
+from markdown_renderer import RENDERER_VERSION
+from render_cache import RenderCache
+from search_index import SearchIndex
+from static_output import StaticWriter
+from timestamps import DISPLAY_FORMAT
+
+# Bump whenever analysis or web output changes shape, so the next run rebuilds everything
+PIPELINE_VERSION = 5
+
+def issue_hash(issue: Dict[str, Any]) -> str:
+    """Content hash of an extracted issue"""
+    canonical = json.dumps(issue, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class IncrementalPipeline:
+    """Keeps the analysis report and web data in step with the extracted issues.
+    
+    The state file remembers each issue's updated_at and content hash along
+    with its analysis fragment and summary row. A run only analyzes and
+    renders issues whose updated_at or hash changed, then patches the
+    aggregate counts (decision breakdown, categories, keyword frequencies,
+    summary stats) by subtracting the old contribution and adding the new.
+    """
+    
+    def __init__(self, data_dir: Optional[str] = None, max_workers: int = 8,
+                 repository: str = DEFAULT_REPOSITORY, reviewers: Optional[List[str]] = None,
+                 scheduler: Optional[RequestScheduler] = None, processes: int = 1,
+                 display_timezone: Optional[str] = None, date_format: str = DISPLAY_FORMAT):
+        self.issues_file = issues_path(data_dir)
+        self.analysis_file = data_path('cuevasm_analysis_report.json', data_dir)
+        self.web_file = data_path('web_app_data.json', data_dir)
+        self.web_dir = data_path('web_data', data_dir)
+        self.state_file = data_path('pipeline_state.json', data_dir)
+        self.sync_file = data_path('github_issues_data.sync.json', data_dir)
+        self.render_cache = RenderCache(data_path('render_cache.json', data_dir))
+        self.max_workers = max_workers
+        self.repository = repository
+        self.reviewers = reviewers
+        self.scheduler = scheduler
+        # Worker processes for analyzing and rendering the changed issues
+        self.processes = processes
+        # Search documents and the index built from them; a pipeline kept
+        # running (the webhook receiver) rebuilds it only when they change
+        self._search: Optional[Tuple[List[Tuple[int, Dict[str, str]]], SearchIndex]] = None
+        # Displayed dates are baked into every shard, so changing these rebuilds everything
+        self.date_display = {'timezone': display_timezone or 'UTC', 'date_format': date_format}
+        self.state = self._load_state()
+        # Restored from the state by the first update() or publish()
+        self._aggregate: Optional[AnalysisAggregate] = None
+        self._summary: Optional[SummaryStats] = None
+    
+    def _empty_state(self) -> Dict[str, Any]:
+        return {
+            'pipeline_version': PIPELINE_VERSION,
+            'renderer_version': RENDERER_VERSION,
+            'date_display': self.date_display,
+            'issues': {},
+            'analysis': None,
+            'summary_rows': {},
+            'shards': {}
+        }
+    
+    def _load_state(self) -> Dict[str, Any]:
+        """Load the previous run's state, or start empty if it is missing or outdated"""
+        if not os.path.exists(self.state_file):
+            return self._empty_state()
+        
+        with open(self.state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        
+        if (state.get('pipeline_version') != PIPELINE_VERSION
+                or state.get('renderer_version') != RENDERER_VERSION):
+            print("Pipeline state is from an older version; rebuilding everything")
+            return self._empty_state()
+        if state.get('date_display') != self.date_display:
+            print("Date display settings changed; rebuilding everything")
+            return self._empty_state()
+        
+        # JSON object keys are strings; issue numbers are ints everywhere else
+        state['issues'] = {int(number): entry for number, entry in state['issues'].items()}
+        state['summary_rows'] = {int(number): row for number, row in state['summary_rows'].items()}
+        state['shards'] = {int(number): path for number, path in state['shards'].items()}
+        if state['analysis']:
+            state['analysis']['fragments'] = {
+                int(number): fragment for number, fragment in state['analysis']['fragments'].items()
+            }
+        return state
+    
+    def save_state(self):
+        partial_file = self.state_file + '.partial'
+        with open(partial_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(partial_file, self.state_file)
+    
+    def extract(self, full: bool = False, restart: bool = False) -> Dict[str, Any]:
+        """Bring the issues artifact up to date (incrementally unless full)"""
+        if full and os.path.exists(self.sync_file):
+            os.remove(self.sync_file)
+        extractor = GitHubExtractor(state_file=self.sync_file, max_workers=self.max_workers,
+                                    repository=self.repository, reviewers=self.reviewers,
+                                    scheduler=self.scheduler)
+        return extract_to_file(extractor, self.issues_file, full=full, restart=restart)
+    
+    def previous_web_issues(self) -> Dict[int, Dict[str, Any]]:
+        """Web records from the last run, reused for issues that did not change"""
+        if not self.state['issues'] or not os.path.exists(self.web_file):
+            return {}
+        
+        with open(self.web_file, 'r', encoding='utf-8') as f:
+            return {issue['number']: issue for issue in json.load(f)['issues']}
+    
+    def find_changes(self, web_issues: Dict[int, Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[int], List[int]]:
+        """Split the artifact into dirty issues, removed issue numbers and the issue order"""
+        dirty = []
+        order = []
+        
+        for issue in iter_issues(self.issues_file):
+            order.append(issue['number'])
+            known = self.state['issues'].get(issue['number'])
+            shard = self.state['shards'].get(issue['number'])
+            if (known and shard and issue['number'] in web_issues
+                    and os.path.exists(os.path.join(self.web_dir, shard))
+                    and known['updated_at'] == issue['updated_at']
+                    and known['hash'] == issue_hash(issue)):
+                continue
+            dirty.append(issue)
+        
+        current = set(order)
+        removed = [number for number in self.state['issues'] if number not in current]
+        return dirty, removed, order
+    
+    def run(self, extract: bool = True, full: bool = False, restart: bool = False) -> Dict[str, Any]:
+        """Run every stage; returns counts and per-stage timings"""
+        timings = {}
+        
+        if full:
+            self.state = self._empty_state()
+            self._aggregate = self._summary = None
+        
+        if extract:
+            start = time.perf_counter()
+            self.extract(full=full, restart=restart)
+            timings['extract'] = round(time.perf_counter() - start, 3)
+            recorder.add_stage('extract', timings['extract'])
+        
+        start = time.perf_counter()
+        web_issues = self.previous_web_issues()
+        dirty, removed, order = self.find_changes(web_issues)
+        timings['diff'] = round(time.perf_counter() - start, 3)
+        recorder.add_stage('diff', timings['diff'])
+        
+        return self.apply_changes(dirty, removed, order, web_issues, timings=timings)
+    
+    def _totals(self) -> Tuple[AnalysisAggregate, SummaryStats]:
+        """Analysis totals and summary stats, restored from the state once and patched in memory after that"""
+        if self._aggregate is None:
+            analysis = self.state['analysis']
+            self._aggregate = AnalysisAggregate(**analysis) if analysis else AnalysisAggregate()
+            self._summary = SummaryStats(self.state['summary_rows'])
+        return self._aggregate, self._summary
+    
+    def _processor(self) -> WebDataProcessor:
+        return WebDataProcessor(self.issues_file, self.analysis_file, render_cache=self.render_cache,
+                                processes=self.processes,
+                                display_timezone=self.date_display['timezone'],
+                                date_format=self.date_display['date_format'])
+    
+    def update(self, dirty: List[Dict[str, Any]], removed: List[int], web_issues: Dict[int, Dict[str, Any]],
+               metadata: Optional[Dict[str, Any]] = None, timings: Optional[Dict[str, float]] = None
+               ) -> Dict[str, Any]:
+        """Analyze and render the dirty issues, drop the removed ones and write the dirty issues' detail shards.
+        
+        The work grows with the change, not the repository: the outputs
+        covering every issue (analysis report, web data file, index, search
+        index and the state file) wait for publish(). web_issues holds the
+        previous web records and is updated in place, so a caller that
+        already knows what changed (the webhook receiver) can keep it
+        between calls instead of reading the web data back. metadata
+        defaults to the issues artifact's.
+        """
+        timings = timings if timings is not None else {}
+        metadata = metadata if metadata is not None else read_metadata(self.issues_file)
+        aggregate, summary = self._totals()
+        
+        # Analysis: scan only the dirty issues' comments, patch the totals
+        start = time.perf_counter()
+        for number in removed:
+            aggregate.remove(number)
+        analyzer = CommentAnalyzer.from_issues(dirty, metadata, processes=self.processes)
+        for fragment in analyzer.issue_fragments():
+            aggregate.add(fragment)
+        timings['analyze'] = round(time.perf_counter() - start, 3)
+        recorder.add_stage('analyze', timings['analyze'])
+        
+        # Web data: render only the dirty issues, patch the summary stats and
+        # write their shards; shards of removed issues are pruned by the next
+        # publish, once the index no longer names them
+        start = time.perf_counter()
+        shards = self.state['shards']
+        for number in removed:
+            summary.remove(number)
+            web_issues.pop(number, None)
+            shards.pop(number, None)
+            self.state['issues'].pop(number, None)
+        
+        analysis_lookup = {issue['number']: aggregate.fragments[issue['number']]['summary'] or {} for issue in dirty}
+        writer = StaticWriter(self.web_dir)
+        with self._processor() as processor:
+            for issue, web_issue in zip(dirty, processor.process_issues(dirty, analysis_lookup)):
+                number = issue['number']
+                web_issues[number] = web_issue
+                summary.add(processor.summary_row(issue, analysis_lookup[number]))
+                shards[number] = processor.write_issue_shard(writer, web_issue)
+                self.state['issues'][number] = {'updated_at': issue['updated_at'], 'hash': issue_hash(issue)}
+        timings['process'] = round(time.perf_counter() - start, 3)
+        recorder.add_stage('process', timings['process'])
+        
+        return {
+            'dirty_issues': len(dirty),
+            'removed_issues': len(removed),
+            'files_written': writer.files_written,
+            'timings': timings
+        }
+    
+    def publish(self, order: List[int], web_issues: Dict[int, Dict[str, Any]],
+                timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Rewrite the outputs that cover every issue from the state update() keeps.
+        
+        Writes the analysis report, the web data file, the index and search
+        index (pointing the manifest at them) and then the state file.
+        order is the issues artifact's issue order.
+        """
+        timings = timings if timings is not None else {}
+        aggregate, summary = self._totals()
+        
+        start = time.perf_counter()
+        report = aggregate.report(order)
+        with open(self.analysis_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        
+        writer = StaticWriter(self.web_dir)
+        with self._processor() as processor:
+            ordered = [web_issues[number] for number in sorted(web_issues, reverse=True)]
+            processor.write_web_document(self.web_file, summary.stats, ordered)
+            
+            entries = []
+            for web_issue in ordered:
+                entry = processor.index_entry(web_issue)
+                entry['detail'] = self.state['shards'][web_issue['number']]
+                entries.append(entry)
+            documents = [processor.search_document(web_issue) for web_issue in ordered]
+            if self._search is None or self._search[0] != documents:
+                self._search = (documents, SearchIndex.build(documents))
+            search_index = self._search[1]
+            processor.write_index(writer, summary.stats, entries, search_index)
+        
+        self.state['analysis'] = aggregate.to_state()
+        self.state['summary_rows'] = summary.rows
+        self.save_state()
+        self.render_cache.save()
+        timings['publish'] = round(time.perf_counter() - start, 3)
+        recorder.add_stage('publish', timings['publish'])
+        
+        return {
+            'total_issues': len(order),
+            'files_written': writer.files_written,
+            'summary': summary.stats,
+            'render_cache': self.render_cache.stats(),
+            'timings': timings
+        }
+    
+    def apply_changes(self, dirty: List[Dict[str, Any]], removed: List[int], order: List[int],
+                      web_issues: Dict[int, Dict[str, Any]], metadata: Optional[Dict[str, Any]] = None,
+                      timings: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """update() the changed issues, then publish() every output"""
+        timings = timings if timings is not None else {}
+        updated = self.update(dirty, removed, web_issues, metadata=metadata, timings=timings)
+        published = self.publish(order, web_issues, timings=timings)
+        return {
+            **published,
+            'dirty_issues': updated['dirty_issues'],
+            'removed_issues': updated['removed_issues'],
+            'files_written': updated['files_written'] + published['files_written']
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description='Extract, analyze and process SIP-31 grant issues incrementally')
+    parser.add_argument('--data-dir', default=DATA_DIR,
+                        help='Directory holding the artifacts (defaults to $SIP31_DATA_DIR or the current directory)')
+    parser.add_argument('--skip-extract', action='store_true',
+                        help='Reprocess the existing issues artifact without contacting GitHub')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore all previous state and rebuild everything')
+    parser.add_argument('--restart', action='store_true',
+                        help='Discard the checkpoint of an interrupted extraction instead of resuming it')
+    parser.add_argument('--workers', type=int, default=8,
+                        help='Number of comment threads fetched concurrently (1 = sequential)')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='Worker processes analyzing and rendering changed issues (output is identical)')
+    parser.add_argument('--repo', default=DEFAULT_REPOSITORY, help='Repository to extract (owner/name)')
+    parser.add_argument('--reviewer', action='append', dest='reviewers',
+                        help='Reviewer whose comments are kept; repeat for several (default: cuevasm)')
+    add_date_arguments(parser)
+    add_arguments(parser)
+    args = parser.parse_args()
+    args.report = args.report or data_path('run_report.json', args.data_dir)
+    
+    pipeline = IncrementalPipeline(args.data_dir, max_workers=args.workers,
+                                   repository=args.repo, reviewers=args.reviewers, processes=args.processes,
+                                   display_timezone=args.timezone, date_format=args.date_format)
+    result = run_instrumented(
+        args, lambda: pipeline.run(extract=not args.skip_extract, full=args.full, restart=args.restart))
+    
+    print("\n=== PIPELINE COMPLETE ===")
+    print(f"Issues: {result['total_issues']} ({result['dirty_issues']} changed, {result['removed_issues']} removed)")
+    print(f"Total cuevasm comments: {result['summary']['total_cuevasm_comments']}")
+    print(f"Awarded: {result['summary']['awarded_count']}, In Review: {result['summary']['in_review_count']}, "
+          f"Pending: {result['summary']['pending_count']}")
+    cache_stats = result['render_cache']
+    print(f"Render cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    print("Stage timings: " + ", ".join(f"{stage} {seconds}s" for stage, seconds in result['timings'].items()))
+    print(f"\nAnalysis report: {pipeline.analysis_file}")
+    print(f"Web data: {pipeline.web_file}")
+    print(f"Dashboard payload: {pipeline.web_dir} ({result['files_written']} files written)")
+
+if __name__ == "__main__":
+    main()
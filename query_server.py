@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Query Server
+Local HTTP API over the processed dashboard data: paginated, filterable
+issue listings, per-issue detail and summary endpoints with ETags
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, Any, Optional, Set
+
+from artifacts import DATA_DIR, data_path
+from search_index import SearchIndex
+from static_output import MANIFEST_NAME, minify_json
+from timestamps import to_epoch
+
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 100
+# Filters backed by an exact-match index: query parameter -> values of one index entry
+FACETS = {
+    'status': lambda entry: [entry['status_badge']['type'], entry['status_badge']['text'].lower()],
+    'label': lambda entry: [label.lower() for label in entry['labels']],
+    'decision_status': lambda entry: [entry['decision_status']],
+    'applicant': lambda entry: [entry['applicant']['login'].lower()],
+    'state': lambda entry: [entry['state']],
+    'reviewer': lambda entry: [reviewer.lower() for reviewer in entry.get('reviewers', [])]
+}
+# Date range filters: epoch entry field -> (inclusive lower bound, exclusive upper bound) parameters
+DATE_RANGES = {
+    'created_ts': ('created_after', 'created_before'),
+    'updated_ts': ('updated_after', 'updated_before')
+}
+HASHED_NAME = re.compile(r'\.([0-9a-f]{16})\.json$')
+
+class QueryError(Exception):
+    """A request the API cannot answer; carries the HTTP status"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+class GrantsStore:
+    """In-memory indexes over the dashboard index named by web_data/manifest.json.
+    
+    Each filter value maps to the set of matching issue numbers and each
+    date field to a sorted (epoch seconds, number) list, so a listing is a few set
+    intersections. The manifest is re-checked on every request and the
+    store reloads when the processor has written a new index (its content
+    hash is the data generation).
+    Requests are answered one at a time, which keeps reloads simple and
+    costs little since each takes well under a millisecond.
+    """
+    
+    def __init__(self, web_dir: str):
+        self.web_dir = web_dir
+        self.manifest_file = os.path.join(web_dir, MANIFEST_NAME)
+        self.generation = None
+        self.entries: Dict[int, Dict[str, Any]] = {}
+        self._manifest_mtime = None
+        self._lock = threading.Lock()
+        self._shards: Dict[str, Dict[str, Any]] = {}
+        try:
+            self.refresh()
+        except QueryError:
+            pass  # Requests get 503 until the processor has written web_data/
+    
+    def _read(self, relative: str) -> Any:
+        with open(os.path.join(self.web_dir, relative), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def refresh(self):
+        """Reload the indexes if the manifest changed since the last look;
+        raises QueryError(503) while there is no processed data to serve"""
+        try:
+            mtime = os.stat(self.manifest_file).st_mtime_ns
+            if mtime == self._manifest_mtime:
+                return
+            
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            self._load(manifest)
+        except FileNotFoundError as e:
+            # Reload whatever the processor writes next
+            self._manifest_mtime = None
+            raise QueryError(503, f"No processed data: {e.filename} not found (run data_processor.py)") from e
+        self._manifest_mtime = mtime
+    
+    def _load(self, manifest: Dict[str, Any]):
+        index = self._read(manifest['index'])
+        entries = index['issues']
+        
+        facets: Dict[str, Dict[str, Set[int]]] = {name: {} for name in FACETS}
+        for entry in entries:
+            for name, values in FACETS.items():
+                for value in values(entry):
+                    facets[name].setdefault(value, set()).add(entry['number'])
+        
+        dates = {field: sorted((entry[field], entry['number']) for entry in entries) for field in DATE_RANGES}
+        
+        self.entries = {entry['number']: entry for entry in entries}
+        self.order = [entry['number'] for entry in entries]
+        self.facets = facets
+        self.dates = dates
+        self.index_document = {key: value for key, value in index.items() if key != 'issues'}
+        self.search_index = SearchIndex(self._read(manifest['search']), self._read(manifest['search_positions'])) \
+            if manifest.get('search') else None
+        self.generation = HASHED_NAME.search(manifest['index']).group(1)
+        self._shards = {}
+    
+    def _date_range(self, field: str, lower: str, upper: str) -> Set[int]:
+        """Issue numbers whose field is >= lower and < upper (ISO dates or timestamps, UTC unless offset)"""
+        column = self.dates[field]
+        start = bisect_left(column, (self._epoch_param(lower),)) if lower else 0
+        end = bisect_left(column, (self._epoch_param(upper),)) if upper else len(column)
+        return {number for _, number in column[start:end]}
+    
+    def list_issues(self, query: Dict[str, str]) -> Dict[str, Any]:
+        """One page of index entries matching every filter in query"""
+        matching: Optional[Set[int]] = None
+        
+        def narrow(numbers: Set[int]):
+            nonlocal matching
+            matching = numbers if matching is None else matching & numbers
+        
+        for name in FACETS:
+            if query.get(name):
+                values = [value.strip().lower() for value in query[name].split(',')]
+                narrow(set().union(*(self.facets[name].get(value, set()) for value in values)))
+        
+        for field, (after, before) in DATE_RANGES.items():
+            lower = query.get(after)
+            upper = query.get(before)
+            if lower or upper:
+                narrow(self._date_range(field, lower, upper))
+        
+        if query.get('q'):
+            if self.search_index is None:
+                raise QueryError(400, 'No search index has been built')
+            ranked = [result['number'] for result in self.search_index.search(query['q'], prefix=True)]
+            order = [number for number in ranked if matching is None or number in matching]
+        else:
+            order = [number for number in self.order if matching is None or number in matching]
+        
+        page = self._int_param(query, 'page', 1)
+        per_page = min(self._int_param(query, 'per_page', DEFAULT_PER_PAGE), MAX_PER_PAGE)
+        start = (page - 1) * per_page
+        return {
+            'page': page,
+            'per_page': per_page,
+            'total': len(order),
+            'pages': (len(order) + per_page - 1) // per_page,
+            'issues': [self.entries[number] for number in order[start:start + per_page]]
+        }
+    
+    def _epoch_param(self, value: str) -> int:
+        try:
+            return to_epoch(value)
+        except ValueError:
+            raise QueryError(400, f"Not an ISO 8601 date or timestamp: {value}")
+    
+    def _int_param(self, query: Dict[str, str], name: str, default: int) -> int:
+        try:
+            value = int(query.get(name, default))
+        except ValueError:
+            raise QueryError(400, f"{name} must be an integer")
+        if value < 1:
+            raise QueryError(400, f"{name} must be at least 1")
+        return value
+    
+    def issue_detail(self, number: int) -> Dict[str, Any]:
+        """Detail shard of one issue"""
+        entry = self.entries.get(number)
+        if entry is None:
+            raise QueryError(404, f"Issue #{number} not found")
+        
+        shard = self._shards.get(entry['detail'])
+        if shard is None:
+            shard = self._shards[entry['detail']] = self._read(entry['detail'])
+        return shard
+    
+    def facet_counts(self) -> Dict[str, Dict[str, int]]:
+        """Issue count for every filter value, for building filter menus"""
+        return {
+            name: {value: len(numbers) for value, numbers in sorted(values.items())}
+            for name, values in self.facets.items()
+        }
+    
+    def route(self, path: str, query: Dict[str, str]) -> Any:
+        """Resolve a GET request to its payload; raises QueryError"""
+        with self._lock:
+            self.refresh()
+            return self._route(path, query)
+    
+    def _route(self, path: str, query: Dict[str, str]) -> Any:
+        if path == '/api/issues':
+            return self.list_issues(query)
+        
+        match = re.fullmatch(r'/api/issues/(\d+)', path)
+        if match:
+            return self.issue_detail(int(match.group(1)))
+        
+        if path == '/api/summary':
+            return self.index_document
+        
+        if path == '/api/facets':
+            return self.facet_counts()
+        
+        raise QueryError(404, 'Not Found')
+
+class QueryServer:
+    def __init__(self, store: GrantsStore, host: str = '127.0.0.1', port: int = 8031):
+        self.store = store
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def _make_handler(self):
+        store = self.store
+        
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status: int, body: bytes = b'', etag: Optional[str] = None):
+                self.send_response(status)
+                if body:
+                    self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                if etag:
+                    # Clients keep the response but revalidate it on every use
+                    self.send_header('ETag', etag)
+                    self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.send_header('Access-Control-Expose-Headers', 'ETag')
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                try:
+                    body = minify_json(store.route(parsed.path, query))
+                except QueryError as e:
+                    self._send(e.status, minify_json({'message': str(e)}))
+                    return
+                
+                # Derived from the body itself, so a response keeps its ETag
+                # for as long as its bytes stay the same, across reloads and reruns
+                etag = f'"{hashlib.sha256(body).hexdigest()[:20]}"'
+                if etag in [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]:
+                    self._send(304, etag=etag)
+                else:
+                    self._send(200, body, etag)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+    
+    def start(self) -> 'QueryServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve the processed SIP-31 grant data as a local query API')
+    parser.add_argument('--data-dir', default=DATA_DIR,
+                        help='Directory holding the artifacts (defaults to $SIP31_DATA_DIR or the current directory)')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=8031, help='Port to listen on')
+    args = parser.parse_args()
+    
+    store = GrantsStore(data_path('web_data', args.data_dir))
+    server = QueryServer(store, args.host, args.port)
+    if store.generation is None:
+        print(f"No processed data in {store.web_dir} yet; answering 503 until data_processor.py has run")
+    print(f"Serving {len(store.entries)} issues from {store.web_dir} at {server.url}")
+    print("Endpoints: /api/issues, /api/issues/<number>, /api/summary, /api/facets")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Render Cache
+Persistent, size-bounded LRU cache of rendered issue and comment HTML
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from markdown_renderer import RENDERER_VERSION
+
+class RenderCache:
+    """Maps a hash of (renderer version, kind, source text) to its rendered output.
+    
+    Entries are kept in least- to most-recently used order and the oldest
+    are evicted once max_entries is exceeded. With a path the cache is
+    loaded on creation and written back by save(), so bodies that did not
+    change since the last run are never re-rendered. A renderer version
+    bump changes every key, so stale entries simply age out.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_entries: int = 10000, track_new: bool = False):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[str, str]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # A worker process's copy records what it rendered, for the parent to merge
+        self.new_entries: Optional[Dict[str, str]] = {} if track_new else None
+        
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+                if stored.get('renderer_version') == RENDERER_VERSION:
+                    self.entries.update(stored['entries'])
+            except (ValueError, KeyError, TypeError):
+                print(f"Ignoring unreadable render cache: {path}")
+            self._evict()
+    
+    def _key(self, kind: str, text: str) -> str:
+        """Content hash identifying one rendering of a text"""
+        digest = hashlib.sha256(f"{RENDERER_VERSION}\0{kind}\0".encode('utf-8'))
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _evict(self):
+        """Drop least recently used entries beyond max_entries"""
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+    
+    def render(self, kind: str, text: str, render: Callable[[str], str]) -> str:
+        """Cached render(text); kind separates different renderings of the same text"""
+        key = self._key(kind, text)
+        cached = self.entries.get(key)
+        if cached is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return cached
+        
+        self.misses += 1
+        rendered = render(text)
+        self.entries[key] = rendered
+        if self.new_entries is not None:
+            self.new_entries[key] = rendered
+        self._evict()
+        return rendered
+    
+    def take_new(self) -> Dict[str, str]:
+        """Entries rendered since the last call (only with track_new)"""
+        new_entries, self.new_entries = self.new_entries, {}
+        return new_entries
+    
+    def merge(self, entries: Dict[str, str], hits: int, misses: int):
+        """Fold in a worker's renders and hit/miss counts"""
+        for key, rendered in entries.items():
+            self.entries[key] = rendered
+            self.entries.move_to_end(key)
+        self.hits += hits
+        self.misses += misses
+        self._evict()
+    
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss and eviction counts for this run"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries)
+        }
+    
+    def save(self):
+        """Write the cache back to its path, replacing the previous file atomically"""
+        if not self.path:
+            return
+        
+        partial_file = self.path + '.partial'
+        with open(partial_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'renderer_version': RENDERER_VERSION,
+                'entries': list(self.entries.items())
+            }, f, ensure_ascii=False)
+        os.replace(partial_file, self.path)
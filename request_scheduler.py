@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Rate-Limit-Aware Request Scheduler
+Paces GitHub API requests against the advertised rate-limit budget and
+retries transient failures with jittered exponential backoff
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import requests
+
+# Responses worth retrying: server errors and explicit throttling
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class RequestScheduler:
+    def __init__(self, session: requests.Session, min_interval: float = 60 / 900,
+                 low_water: int = 100, max_retries: int = 5,
+                 backoff_base: float = 1.0, backoff_cap: float = 60.0):
+        """
+        min_interval spaces request starts across all threads; the default
+        keeps GET traffic under GitHub's 900 points/minute secondary limit.
+        Once fewer than low_water requests remain in the primary budget the
+        remainder is spread evenly until the reset time.
+        """
+        self.session = session
+        self.min_interval = min_interval
+        self.low_water = low_water
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._remaining: Optional[int] = None
+        self._reset_at: Optional[float] = None
+        
+        self.counters = {
+            'requests': 0,
+            'retries': 0,
+            'rate_limit_waits': 0,
+            'wait_seconds': 0.0
+        }
+    
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of the request counters"""
+        with self._lock:
+            stats = dict(self.counters)
+            stats['wait_seconds'] = round(stats['wait_seconds'], 3)
+            stats['rate_limit_remaining'] = self._remaining
+            return stats
+    
+    def _sleep(self, seconds: float):
+        if seconds <= 0:
+            return
+        with self._lock:
+            self.counters['wait_seconds'] += seconds
+        time.sleep(seconds)
+    
+    def _reserve_slot(self):
+        """Claim the next request start time and sleep until it arrives"""
+        with self._lock:
+            now = time.time()
+            interval = self.min_interval
+            
+            if self._remaining is not None and self._reset_at is not None:
+                until_reset = max(0.0, self._reset_at - now)
+                if self._remaining <= 0 and until_reset > 0:
+                    # Budget exhausted: nothing can be sent before the reset
+                    self.counters['rate_limit_waits'] += 1
+                    self._next_slot = max(self._next_slot, self._reset_at + 1)
+                elif self._remaining <= self.low_water and until_reset > 0:
+                    self.counters['rate_limit_waits'] += 1
+                    interval = max(interval, until_reset / self._remaining)
+                
+                # Account for requests in flight before their headers come back
+                self._remaining -= 1
+            
+            start = max(now, self._next_slot)
+            self._next_slot = start + interval
+            self.counters['requests'] += 1
+        
+        self._sleep(start - now)
+    
+    def _record_limits(self, response: requests.Response):
+        """Update the budget from X-RateLimit-* response headers"""
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        
+        with self._lock:
+            self._remaining = int(remaining)
+            self._reset_at = float(reset)
+    
+    def _is_retryable(self, response: requests.Response) -> bool:
+        if response.status_code in RETRY_STATUSES:
+            return True
+        if response.status_code == 403:
+            # 403 is also used for primary and secondary (abuse) rate limits
+            return ('Retry-After' in response.headers
+                    or response.headers.get('X-RateLimit-Remaining') == '0'
+                    or 'rate limit' in response.text.lower())
+        return False
+    
+    def _retry_delay(self, response: Optional[requests.Response], attempt: int) -> float:
+        """Delay before the next attempt: honour Retry-After and reset headers,
+        otherwise use full-jitter exponential backoff"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+            if response.headers.get('X-RateLimit-Remaining') == '0' and response.headers.get('X-RateLimit-Reset'):
+                return max(0.0, float(response.headers['X-RateLimit-Reset']) - time.time()) + 1
+        
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+    
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the shared session with pacing and retries"""
+        return self.request('GET', url, **kwargs)
+    
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """POST through the shared session with pacing and retries"""
+        return self.request('POST', url, **kwargs)
+    
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request through the shared session with pacing and retries.
+        
+        Returns the final response; callers decide how to treat non-200s that
+        are not retryable or still failing after max_retries.
+        """
+        attempt = 0
+        
+        while True:
+            self._reserve_slot()
+            
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                response = None
+            
+            if response is not None:
+                self._record_limits(response)
+                if not self._is_retryable(response) or attempt >= self.max_retries:
+                    return response
+            
+            delay = self._retry_delay(response, attempt)
+            status = response.status_code if response is not None else 'connection error'
+            print(f"  Retrying {url} after {status} in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+            
+            with self._lock:
+                self.counters['retries'] += 1
+            self._sleep(delay)
+            attempt += 1
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Search Index
+Inverted index over issue titles, applicants, bodies and cuevasm comments,
+built once at processing time and queried offline or by the dashboard
+"""
+
+import argparse
+import json
+import os
+import re
+import heapq
+from bisect import bisect_left
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+
+from artifacts import DATA_DIR, data_path
+from instrumentation import timed
+
+# Bump whenever tokenizing or the artifact layout changes
+SEARCH_INDEX_VERSION = 2
+
+FIELDS = ['title', 'applicant', 'body', 'comments']
+FIELD_WEIGHTS = [4, 3, 1, 2]
+
+TOKEN = re.compile(r'[a-z0-9]+')
+PHRASE = re.compile(r'"([^"]*)"')
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or that the this to was were will with'.split()
+)
+# Suffixes stripped by stem(), longest first; (suffix, replacement)
+SUFFIXES = [
+    ('ational', 'ate'), ('ization', 'ize'), ('iveness', 'ive'), ('fulness', 'ful'),
+    ('ations', 'ate'), ('ation', 'ate'), ('ments', 'ment'), ('ities', 'ity'),
+    ('sses', 'ss'), ('ies', 'y'), ('ing', ''), ('ed', ''), ('ly', ''), ('es', ''), ('s', '')
+]
+MIN_STEM = 3
+
+def tokenize(text: str) -> List[Tuple[int, str]]:
+    """Lowercased word tokens with their positions; stop words keep their slot"""
+    return [(position, word) for position, word in enumerate(TOKEN.findall(text.lower()))
+            if word not in STOP_WORDS]
+
+def stem(word: str) -> str:
+    """Light suffix-stripping stemmer: 'funding', 'funded' and 'funds' all become 'fund'"""
+    if word.isdigit():
+        return word
+    for suffix, replacement in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) + len(replacement) >= MIN_STEM:
+            if suffix == 's' and word.endswith(('ss', 'us', 'is')):
+                continue
+            if suffix == 'es' and not word.endswith(('shes', 'ches', 'xes', 'zes')):
+                continue
+            return word[:len(word) - len(suffix)] + replacement
+    return word
+
+class SearchIndex:
+    """Terms (stemmed words) mapped to the issues and field positions they occur at.
+    
+    The artifact lists every indexed surface word in sorted order next to
+    its term, so a client can match what is being typed by prefix with a
+    binary search and never needs the issue bodies; the dashboards port
+    stem() to match completed words and phrases the same way.
+    Postings are [issue slot, field, occurrence count], which is all word
+    matching needs. Word positions are only read for "quoted phrases", so
+    they are a separate artifact (positions_data): per term, one [first
+    position, position deltas...] list for each of its postings. The
+    dashboards fetch it on the first phrase.
+    """
+    
+    def __init__(self, data: Dict[str, Any], positions: Optional[Dict[str, Any]] = None):
+        for artifact in (data, positions or data):
+            if artifact.get('version') != SEARCH_INDEX_VERSION:
+                raise ValueError(f"Search index has version {artifact.get('version')}, expected {SEARCH_INDEX_VERSION}")
+        self.numbers: List[int] = data['issues']
+        self.words: List[str] = data['words']
+        self.word_terms: List[int] = data['word_terms']
+        self.terms: List[str] = data['terms']
+        self.postings: List[List[List[int]]] = data['postings']
+        self.positions: Optional[List[List[List[int]]]] = positions['positions'] if positions else None
+        self.term_ids = {term: term_id for term_id, term in enumerate(self.terms)}
+        # Weighted occurrence count per issue slot for each term, so a word
+        # lookup is one dict fetch at query time
+        self.term_scores: List[Dict[int, int]] = []
+        for entries in self.postings:
+            scores: Dict[int, int] = {}
+            for entry in entries:
+                scores[entry[0]] = scores.get(entry[0], 0) + FIELD_WEIGHTS[entry[1]] * entry[2]
+            self.term_scores.append(scores)
+    
+    @classmethod
+    @timed('search_index.build')
+    def build(cls, documents: Iterable[Tuple[int, Dict[str, str]]]) -> 'SearchIndex':
+        """Index (issue number, {field: text}) pairs"""
+        numbers = []
+        word_terms: Dict[str, str] = {}
+        positions: Dict[str, Dict[Tuple[int, int], List[int]]] = {}
+        
+        for slot, (number, fields) in enumerate(documents):
+            numbers.append(number)
+            for field_id, field in enumerate(FIELDS):
+                by_word: Dict[str, List[int]] = {}
+                for position, word in tokenize(fields.get(field) or ''):
+                    by_word.setdefault(word, []).append(position)
+                
+                for word, word_positions in by_word.items():
+                    term = word_terms.get(word)
+                    if term is None:
+                        term = word_terms[word] = stem(word)
+                    term_postings = positions.setdefault(term, {})
+                    # Several words can share a stem ('fund', 'funding')
+                    existing = term_postings.get((slot, field_id))
+                    term_postings[(slot, field_id)] = sorted(existing + word_positions) if existing else word_positions
+        
+        terms = sorted(positions)
+        term_ids = {term: term_id for term_id, term in enumerate(terms)}
+        postings, term_deltas = [], []
+        for term in terms:
+            entries, deltas = [], []
+            for (slot, field_id), term_positions in sorted(positions[term].items()):
+                entries.append([slot, field_id, len(term_positions)])
+                deltas.append([term_positions[0]] + [b - a for a, b in zip(term_positions, term_positions[1:])])
+            postings.append(entries)
+            term_deltas.append(deltas)
+        
+        words = sorted(word_terms)
+        return cls({
+            'version': SEARCH_INDEX_VERSION,
+            'fields': FIELDS,
+            'field_weights': FIELD_WEIGHTS,
+            'stop_words': sorted(STOP_WORDS),
+            'issues': numbers,
+            'words': words,
+            'word_terms': [term_ids[word_terms[word]] for word in words],
+            'terms': terms,
+            'postings': postings
+        }, {'version': SEARCH_INDEX_VERSION, 'positions': term_deltas})
+    
+    @classmethod
+    def load(cls, path: str, positions_path: Optional[str] = None) -> 'SearchIndex':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not positions_path:
+            return cls(data)
+        with open(positions_path, 'r', encoding='utf-8') as f:
+            return cls(data, json.load(f))
+    
+    def to_data(self) -> Dict[str, Any]:
+        return {
+            'version': SEARCH_INDEX_VERSION,
+            'fields': FIELDS,
+            'field_weights': FIELD_WEIGHTS,
+            'stop_words': sorted(STOP_WORDS),
+            'issues': self.numbers,
+            'words': self.words,
+            'word_terms': self.word_terms,
+            'terms': self.terms,
+            'postings': self.postings
+        }
+    
+    def positions_data(self) -> Dict[str, Any]:
+        return {'version': SEARCH_INDEX_VERSION, 'positions': self.positions}
+    
+    def prefix_terms(self, prefix: str) -> List[int]:
+        """Term ids of every indexed word starting with prefix"""
+        term_ids = set()
+        i = bisect_left(self.words, prefix)
+        while i < len(self.words) and self.words[i].startswith(prefix):
+            term_ids.add(self.word_terms[i])
+            i += 1
+        return sorted(term_ids)
+    
+    def _positions(self, term_id: int) -> Dict[Tuple[int, int], List[int]]:
+        """Decode one term's position deltas to absolute positions per (slot, field)"""
+        if self.positions is None:
+            raise ValueError('Phrase search needs the word positions (positions_data)')
+        decoded = {}
+        for entry, deltas in zip(self.postings[term_id], self.positions[term_id]):
+            term_positions = []
+            position = 0
+            for delta in deltas:
+                position += delta
+                term_positions.append(position)
+            decoded[(entry[0], entry[1])] = term_positions
+        return decoded
+    
+    def _term_scores(self, term_ids: List[int]) -> Dict[int, int]:
+        """Weighted occurrence counts per issue slot for any of the given terms"""
+        if len(term_ids) == 1:
+            return self.term_scores[term_ids[0]]
+        
+        scores: Dict[int, int] = {}
+        for term_id in term_ids:
+            for slot, score in self.term_scores[term_id].items():
+                scores[slot] = scores.get(slot, 0) + score
+        return scores
+    
+    def _phrase_scores(self, phrase: str) -> Dict[int, int]:
+        """Weighted counts of the words of phrase occurring in order, per issue slot"""
+        tokens = tokenize(phrase)
+        if not tokens:
+            return {}
+        
+        offsets = [position - tokens[0][0] for position, _ in tokens]
+        term_ids = [self.term_ids.get(stem(word)) for _, word in tokens]
+        if None in term_ids:
+            return {}
+        
+        decoded = [self._positions(term_id) for term_id in term_ids]
+        scores: Dict[int, int] = {}
+        for (slot, field_id), starts in decoded[0].items():
+            matches = set(starts)
+            for offset, term_positions in zip(offsets[1:], decoded[1:]):
+                following = term_positions.get((slot, field_id))
+                if not following:
+                    matches = set()
+                    break
+                matches &= {position - offset for position in following}
+            if matches:
+                scores[slot] = scores.get(slot, 0) + FIELD_WEIGHTS[field_id] * len(matches)
+        return scores
+    
+    def search(self, query: str, prefix: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Issues matching every word and "quoted phrase" of query, best first.
+        
+        Words match by stem; with prefix the last word also matches any
+        indexed word it begins, as the dashboard does while typing.
+        """
+        clauses = [self._phrase_scores(phrase) for phrase in PHRASE.findall(query)]
+        
+        words = tokenize(PHRASE.sub(' ', query))
+        for i, (_, word) in enumerate(words):
+            if prefix and i == len(words) - 1 and not query.rstrip().endswith('"'):
+                term_ids = self.prefix_terms(word)
+            else:
+                term_id = self.term_ids.get(stem(word))
+                term_ids = [term_id] if term_id is not None else []
+            clauses.append(self._term_scores(term_ids))
+        
+        if not clauses:
+            return []
+        
+        # Intersect starting from the rarest clause
+        clauses.sort(key=len)
+        slots = clauses[0].keys()
+        for clause in clauses[1:]:
+            slots = slots & clause.keys()
+        ranked = [(-sum(clause[slot] for clause in clauses), -self.numbers[slot]) for slot in slots]
+        ranked = heapq.nsmallest(limit, ranked) if limit else sorted(ranked)
+        return [{'number': -number, 'score': -score} for score, number in ranked]
+
+def read_manifest_file(web_dir: str, key: str) -> Dict[str, Any]:
+    """Load the file the dashboard manifest currently names under key"""
+    with open(os.path.join(web_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    with open(os.path.join(web_dir, manifest[key]), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_search_index(web_dir: str) -> SearchIndex:
+    """Load the search index and word positions the dashboard manifest currently points at"""
+    return SearchIndex(read_manifest_file(web_dir, 'search'), read_manifest_file(web_dir, 'search_positions'))
+
+def main():
+    parser = argparse.ArgumentParser(description='Search the processed SIP-31 grant issues')
+    parser.add_argument('query', help='Words to match (all must occur); "quoted phrases" match in order')
+    parser.add_argument('--data-dir', default=DATA_DIR,
+                        help='Directory holding the artifacts (defaults to $SIP31_DATA_DIR or the current directory)')
+    parser.add_argument('--limit', type=int, default=20, help='Maximum number of results')
+    args = parser.parse_args()
+    
+    web_dir = data_path('web_data', args.data_dir)
+    index = load_search_index(web_dir)
+    titles = {entry['number']: entry['title'] for entry in read_manifest_file(web_dir, 'index')['issues']}
+    results = index.search(args.query, limit=args.limit)
+    
+    print(f"{len(results)} result(s) for {args.query!r}")
+    for result in results:
+        print(f"  #{result['number']} {titles.get(result['number'], '')} (score {result['score']})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+SQLite Store
+Optional SQLite backend for the issues artifact: issues, labels, cuevasm
+comments, per-comment analysis features and rendered HTML in indexed tables
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+from contextlib import closing
+from typing import Dict, Any, Iterable, Iterator
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS issues (
+    number INTEGER PRIMARY KEY,
+    position INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT,
+    state TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    html_url TEXT NOT NULL,
+    user_login TEXT NOT NULL,
+    user_avatar_url TEXT,
+    total_comments INTEGER NOT NULL,
+    cuevasm_comment_count INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS issues_position ON issues (position);
+CREATE INDEX IF NOT EXISTS issues_updated_at ON issues (updated_at);
+CREATE INDEX IF NOT EXISTS issues_user_login ON issues (user_login);
+CREATE TABLE IF NOT EXISTS labels (
+    issue_number INTEGER NOT NULL REFERENCES issues (number) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (issue_number, position)
+);
+CREATE INDEX IF NOT EXISTS labels_name ON labels (name);
+CREATE TABLE IF NOT EXISTS comments (
+    id INTEGER PRIMARY KEY,
+    issue_number INTEGER NOT NULL REFERENCES issues (number) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    html_url TEXT NOT NULL,
+    reviewer TEXT
+);
+CREATE INDEX IF NOT EXISTS comments_reviewer ON comments (reviewer);
+CREATE INDEX IF NOT EXISTS comments_issue ON comments (issue_number, position);
+CREATE INDEX IF NOT EXISTS comments_created_at ON comments (created_at);
+CREATE TABLE IF NOT EXISTS comment_features (
+    comment_id INTEGER PRIMARY KEY REFERENCES comments (id) ON DELETE CASCADE,
+    updated_at TEXT NOT NULL,
+    length INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    hits TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS comment_features_category ON comment_features (category);
+CREATE INDEX IF NOT EXISTS comment_features_decision ON comment_features (decision);
+CREATE TABLE IF NOT EXISTS rendered_html (
+    issue_number INTEGER NOT NULL REFERENCES issues (number) ON DELETE CASCADE,
+    comment_id INTEGER NOT NULL,
+    html TEXT NOT NULL,
+    PRIMARY KEY (issue_number, comment_id)
+);
+"""
+
+ISSUE_COLUMNS = ('number, title, body, state, created_at, updated_at, html_url, '
+                 'user_login, user_avatar_url, total_comments, cuevasm_comment_count')
+ORDERS = {'position': 'position', 'number_desc': 'number DESC'}
+
+def is_sqlite(path: str) -> bool:
+    return path.endswith(('.db', '.sqlite'))
+
+def content_hash(issue: Dict[str, Any]) -> str:
+    canonical = json.dumps(issue, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+class IssueStore:
+    """Issues artifact kept as SQLite rows instead of one JSON document.
+    
+    Each issue is upserted on its own: unchanged issues (same content hash)
+    are skipped and a changed one only rewrites its own issue, label and
+    comment rows. Issues read back in the same shape the JSON artifacts
+    hold, so the analyzer and processor read either transparently. The
+    database runs in WAL mode, so readers keep a consistent snapshot while
+    an extraction is writing.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            self.conn.execute("INSERT OR IGNORE INTO metadata VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),))
+        version = int(self.conn.execute("SELECT value FROM metadata WHERE key = 'schema_version'").fetchone()[0])
+        if version != SCHEMA_VERSION:
+            self.conn.close()
+            raise ValueError(f"{path} has schema version {version}, expected {SCHEMA_VERSION}; "
+                             "export it with an older version and import it again")
+    
+    def close(self):
+        self.conn.close()
+    
+    def __enter__(self) -> 'IssueStore':
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def set_metadata(self, key: str, value: Any):
+        self.conn.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?)', (key, json.dumps(value, ensure_ascii=False)))
+    
+    def read_metadata(self) -> Dict[str, Any]:
+        """Extraction header fields plus the summary, as in the JSON artifacts"""
+        stored = dict(self.conn.execute("SELECT key, value FROM metadata WHERE key IN ('header', 'summary')"))
+        metadata = json.loads(stored.get('header', '{}'))
+        if 'summary' in stored:
+            metadata['summary'] = json.loads(stored['summary'])
+        return metadata
+    
+    def upsert_issue(self, issue: Dict[str, Any], position: int) -> bool:
+        """Insert or update one issue with its labels and comments; returns whether anything changed"""
+        digest = content_hash(issue)
+        row = self.conn.execute('SELECT position, content_hash FROM issues WHERE number = ?',
+                                (issue['number'],)).fetchone()
+        if row and row[1] == digest:
+            if row[0] != position:
+                self.conn.execute('UPDATE issues SET position = ? WHERE number = ?', (position, issue['number']))
+            return False
+        
+        # Deleting the old row cascades to its labels, comments, features and rendered HTML
+        self.conn.execute('DELETE FROM issues WHERE number = ?', (issue['number'],))
+        self.conn.execute(
+            'INSERT INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (issue['number'], position, issue['title'], issue['body'], issue['state'],
+             issue['created_at'], issue['updated_at'], issue['html_url'],
+             issue['user']['login'], issue['user']['avatar_url'],
+             issue['total_comments'], issue['cuevasm_comment_count'], digest)
+        )
+        self.conn.executemany('INSERT INTO labels VALUES (?, ?, ?)',
+                              [(issue['number'], i, name) for i, name in enumerate(issue['labels'])])
+        self.conn.executemany(
+            'INSERT INTO comments VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [(c['id'], issue['number'], i, c['body'], c['created_at'], c['updated_at'], c['html_url'],
+              c.get('reviewer')) for i, c in enumerate(issue['cuevasm_comments'])]
+        )
+        return True
+    
+    def remove_issue(self, number: int) -> bool:
+        """Delete one issue with its rows; returns whether it was stored"""
+        return self.conn.execute('DELETE FROM issues WHERE number = ?', (number,)).rowcount > 0
+    
+    def remove_issues_except(self, numbers: Iterable[int]) -> int:
+        """Delete every issue not in numbers; returns how many were removed"""
+        keep = set(numbers)
+        removed = [number for (number,) in self.conn.execute('SELECT number FROM issues') if number not in keep]
+        self.conn.executemany('DELETE FROM issues WHERE number = ?', [(number,) for number in removed])
+        return len(removed)
+    
+    def iter_issues(self, order: str = 'position') -> Iterator[Dict[str, Any]]:
+        """Yield issues in the JSON artifact shape, by extraction order or newest number first"""
+        # Rows are fetched as they are yielded, so bodies are never all in memory;
+        # labels and comments come from indexed lookups per issue
+        cursor = self.conn.execute(f'SELECT {ISSUE_COLUMNS} FROM issues ORDER BY {ORDERS[order]}')
+        for row in cursor:
+            number = row[0]
+            labels = [name for (name,) in self.conn.execute(
+                'SELECT name FROM labels WHERE issue_number = ? ORDER BY position', (number,))]
+            comments = []
+            for c in self.conn.execute('SELECT id, body, created_at, updated_at, html_url, reviewer FROM comments '
+                                       'WHERE issue_number = ? ORDER BY position', (number,)):
+                comment = {'id': c[0], 'body': c[1], 'created_at': c[2], 'updated_at': c[3], 'html_url': c[4]}
+                if c[5] is not None:
+                    # Artifacts from before reviewer tagging have no reviewer key
+                    comment['reviewer'] = c[5]
+                comments.append(comment)
+            yield {
+                'number': number,
+                'title': row[1],
+                'body': row[2],
+                'state': row[3],
+                'created_at': row[4],
+                'updated_at': row[5],
+                'html_url': row[6],
+                'user': {'login': row[7], 'avatar_url': row[8]},
+                'labels': labels,
+                'total_comments': row[9],
+                'cuevasm_comments': comments,
+                'cuevasm_comment_count': row[10]
+            }
+    
+    def summary(self) -> Dict[str, Any]:
+        """Extraction summary computed in SQL"""
+        total, comments, with_comments = self.conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(cuevasm_comment_count), 0), '
+            'COALESCE(SUM(cuevasm_comment_count > 0), 0) FROM issues'
+        ).fetchone()
+        return {
+            'total_issues': total,
+            'total_cuevasm_comments': comments,
+            'issues_with_cuevasm_comments': with_comments
+        }
+    
+    def save_comment_features(self, features: Iterable[Any]):
+        """Store the analyzer's per-comment features (CommentFeatures objects)"""
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO comment_features '
+                'SELECT id, updated_at, ?, ?, ?, ? FROM comments WHERE id = ?',
+                [(f.length, f.category, f.decision, json.dumps(f.hit_counts()), f.comment_id) for f in features]
+            )
+    
+    def save_rendered(self, web_issue: Dict[str, Any]):
+        """Store the rendered body HTML of an issue (comment_id 0) and of its comments"""
+        rows = [(web_issue['number'], 0, web_issue['body_html'])]
+        rows.extend((web_issue['number'], c['id'], c['body_html']) for c in web_issue['cuevasm_comments'])
+        with self.conn:
+            self.conn.execute('DELETE FROM rendered_html WHERE issue_number = ?', (web_issue['number'],))
+            self.conn.executemany('INSERT INTO rendered_html VALUES (?, ?, ?)', rows)
+
+def write_issues(path: str, header: Dict[str, Any], issues: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Upsert issues into a store in one transaction and drop the ones not seen.
+    
+    Like replacing a JSON artifact, a crashed run leaves the previous
+    contents intact. Returns the summary, computed in SQL.
+    """
+    with closing(IssueStore(path)) as store:
+        with store.conn:
+            numbers = []
+            changed = 0
+            for position, issue in enumerate(issues):
+                numbers.append(issue['number'])
+                changed += store.upsert_issue(issue, position)
+            removed = store.remove_issues_except(numbers)
+            summary = store.summary()
+            store.set_metadata('header', header)
+            store.set_metadata('summary', summary)
+    print(f"SQLite store {path}: {changed} issues written, {removed} removed, "
+          f"{len(numbers) - changed} unchanged")
+    return summary
+
+def main():
+    from artifacts import iter_issues, read_metadata, write_artifact
+    
+    parser = argparse.ArgumentParser(description='Convert issues artifacts between JSON and SQLite')
+    parser.add_argument('source', help='Artifact to read (.json, .jsonl, .db or .sqlite)')
+    parser.add_argument('target', help='Artifact to write (.json, .jsonl, .db or .sqlite)')
+    args = parser.parse_args()
+    
+    issues = iter_issues(args.source)
+    if not args.target.endswith(('.jsonl', '.db', '.sqlite')):
+        issues = list(issues)  # a single JSON document is written in one go
+    write_artifact(args.target, {**read_metadata(args.source), 'issues': issues})
+    print(f"Copied {args.source} to {args.target}")
+
+if __name__ == "__main__":
+    main()
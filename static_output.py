@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Static Output
+Writes dashboard files minified, precompressed and under content-hashed names
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, Optional
+
+from instrumentation import timed
+
+try:
+    import brotli
+except ImportError:  # optional: without it no .br siblings are written
+    brotli = None
+
+MANIFEST_NAME = 'manifest.json'
+HASHED_FILE = re.compile(r'\.[0-9a-f]{16}\.json(?P<suffix>(?:\.gz|\.br)?)$')
+
+def minify_json(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+class StaticWriter:
+    """Writes files as <name>.<content hash>.json with .gz and .br siblings.
+    
+    A hashed file never changes, so a static host can serve it with
+    immutable caching; only the small manifest naming the current index
+    needs revalidating. Files whose hash already exists are neither
+    compressed nor rewritten.
+    """
+    
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.bytes = {'raw': 0, 'gzip': 0, 'brotli': 0}
+        self.files_written = 0
+    
+    def _write_bytes(self, path: str, payload: bytes):
+        partial_file = path + '.partial'
+        with open(partial_file, 'wb') as f:
+            f.write(payload)
+        os.replace(partial_file, path)
+    
+    @timed('static_output.write')
+    def write(self, name: str, data: Any) -> str:
+        """Write data under a content-hashed name; returns the path relative to output_dir"""
+        payload = minify_json(data)
+        digest = hashlib.sha256(payload).hexdigest()[:16]
+        relative = f"{name}.{digest}.json"
+        path = os.path.join(self.output_dir, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.bytes['raw'] += len(payload)
+        
+        if os.path.exists(path):
+            # Written before with the same content; only its sizes are counted
+            for encoding, suffix in (('gzip', '.gz'), ('brotli', '.br')):
+                if os.path.exists(path + suffix):
+                    self.bytes[encoding] += os.path.getsize(path + suffix)
+            return relative
+        
+        # mtime=0 keeps the gzip bytes a pure function of the content
+        compressed = {'gzip': gzip.compress(payload, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed['brotli'] = brotli.compress(payload, quality=11)
+        for encoding, data_bytes in compressed.items():
+            self.bytes[encoding] += len(data_bytes)
+        
+        self._write_bytes(path + '.gz', compressed['gzip'])
+        if 'brotli' in compressed:
+            self._write_bytes(path + '.br', compressed['brotli'])
+        # The uncompressed file goes last: its presence marks a complete set
+        self._write_bytes(path, payload)
+        self.files_written += 1
+        return relative
+    
+    def write_manifest(self, index: str, search: str, search_positions: str, generated_at: str) -> Dict[str, Any]:
+        """Point manifest.json at the current index, search index and its word
+        positions (the one file served with revalidation)"""
+        manifest = {
+            'index': index,
+            'search': search,
+            'search_positions': search_positions,
+            'generated_at': generated_at
+        }
+        self._write_bytes(os.path.join(self.output_dir, MANIFEST_NAME), minify_json(manifest))
+        return manifest
+    
+    def prune(self, keep: Iterable[str]):
+        """Delete hashed files (and their siblings) that are not in keep.
+        
+        The previous index and the shards it names are kept for one more
+        generation, so a browser holding the old index can still open issues.
+        """
+        keep = set(keep)
+        previous = read_manifest(self.output_dir)
+        previous_index = os.path.join(self.output_dir, previous['index']) if previous else None
+        if previous_index and os.path.exists(previous_index):
+            keep.update([previous['index'], previous.get('search'), previous.get('search_positions')])
+            with open(previous_index, 'r', encoding='utf-8') as f:
+                keep.update(entry['detail'] for entry in json.load(f)['issues'] if entry.get('detail'))
+        
+        for root, _, names in os.walk(self.output_dir):
+            for name in names:
+                match = HASHED_FILE.search(name)
+                if not match:
+                    continue
+                path = os.path.join(root, name)
+                relative = os.path.relpath(path, self.output_dir).replace(os.sep, '/')
+                if relative[:len(relative) - len(match.group('suffix'))] not in keep:
+                    os.remove(path)
+
+def file_sizes(output_dir: str, relative: str) -> Dict[str, int]:
+    """Bytes of a written file and of its compressed siblings (brotli 0 when absent)"""
+    path = os.path.join(output_dir, relative)
+    return {
+        'raw': os.path.getsize(path),
+        'gzip': os.path.getsize(path + '.gz'),
+        'brotli': os.path.getsize(path + '.br') if os.path.exists(path + '.br') else 0
+    }
+
+def read_manifest(output_dir: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Stub GitHub API Server
+Serves extracted issue data back through the GitHub issues/comments REST
+endpoints and the GraphQL queries used by the GraphQL backend, so the
+extractor can be exercised and timed without touching the real API
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from typing import List, Dict, Any, Optional, Tuple
+
+class StubGitHubServer:
+    """Comment threads are rebuilt from the processed issues when requested
+    rather than held in memory, so the stub can serve synthetic repositories
+    of 10^5 issues; the repository-wide listing keeps only a sorted index."""
+    
+    def __init__(self, data: Dict[str, Any], latency: float = 0.0, host: str = '127.0.0.1', port: int = 0):
+        self.owner, self.repo = data['repository'].split('/')
+        self.target_user = data['target_user']
+        self.latency = latency
+        self.issues = [self._raw_issue(issue) for issue in data['issues']]
+        self.issues_by_state = {
+            state: [issue for issue in self.issues if issue['state'] == state] for state in ('open', 'closed')
+        }
+        self.issues_by_state['all'] = self.issues
+        self._processed = {issue['number']: issue for issue in data['issues']}
+        self._comment_index = None
+        self.request_count = 0
+        self.not_modified_count = 0
+        self._lock = threading.Lock()
+        
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def _raw_issue(self, issue: Dict[str, Any]) -> Dict[str, Any]:
+        """Rebuild the REST API issue shape from a processed issue"""
+        return {
+            'number': issue['number'],
+            'title': issue['title'],
+            'body': issue['body'],
+            'state': issue['state'],
+            'created_at': issue['created_at'],
+            'updated_at': issue['updated_at'],
+            'html_url': issue['html_url'],
+            'user': dict(issue['user']),
+            'labels': [{'name': name} for name in issue['labels']],
+            'comments': issue['total_comments']
+        }
+    
+    def _raw_comment(self, issue: Dict[str, Any], index: int) -> Dict[str, Any]:
+        """Comment index of an issue's thread (unsorted): the stored reviewer
+        comments first, then filler comments from the applicant up to the recorded total"""
+        issue_url = f"https://api.github.com/repos/{self.owner}/{self.repo}/issues/{issue['number']}"
+        reviewer_comments = issue['cuevasm_comments']
+        if index < len(reviewer_comments):
+            comment = reviewer_comments[index]
+            return {**{key: value for key, value in comment.items() if key != 'reviewer'},
+                    'user': {'login': comment.get('reviewer', self.target_user)},
+                    'issue_url': issue_url}
+        
+        # Filler must not be attributed to the reviewer, even on their own issues
+        filler_login = issue['user']['login'] if issue['user']['login'] != self.target_user else 'grant-applicant'
+        index -= len(reviewer_comments)
+        comment_id = issue['number'] * 100000 + index
+        return {
+            'id': comment_id,
+            'body': f"Applicant follow-up {index + 1}",
+            'created_at': issue['created_at'],
+            'updated_at': issue['created_at'],
+            'html_url': f"{issue['html_url']}#issuecomment-{comment_id}",
+            'user': {'login': filler_login},
+            'issue_url': issue_url
+        }
+    
+    def thread(self, issue_number: int) -> Optional[List[Dict[str, Any]]]:
+        """An issue's full comment thread in API order, or None if there is no such issue"""
+        issue = self._processed.get(issue_number)
+        if issue is None:
+            return None
+        count = max(issue['total_comments'], len(issue['cuevasm_comments']))
+        comments = [self._raw_comment(issue, index) for index in range(count)]
+        return sorted(comments, key=lambda c: (c['created_at'], c['id']))
+    
+    def _repository_comments(self) -> List[Tuple[str, int, str, int, int]]:
+        """(created_at, id, updated_at, issue number, thread index) of every comment, in listing order"""
+        if self._comment_index is None:
+            index = []
+            for issue in self._processed.values():
+                for position in range(max(issue['total_comments'], len(issue['cuevasm_comments']))):
+                    comment = self._raw_comment(issue, position)
+                    index.append((comment['created_at'], comment['id'], comment['updated_at'], issue['number'], position))
+            index.sort()
+            self._comment_index = index
+        return self._comment_index
+    
+    def _paginate(self, items: List[Dict[str, Any]], query: Dict[str, str]) -> List[Dict[str, Any]]:
+        page = int(query.get('page', 1))
+        per_page = int(query.get('per_page', 30))
+        return items[(page - 1) * per_page:page * per_page]
+    
+    def route(self, path: str, query: Dict[str, str]) -> Optional[Any]:
+        """Resolve a GET request to a JSON payload, or None for 404"""
+        prefix = f"/repos/{self.owner}/{self.repo}"
+        
+        if path == f"{prefix}/issues":
+            issues = self.issues_by_state.get(query.get('state', 'open'), [])
+            if 'since' in query:
+                issues = [i for i in issues if i['updated_at'] >= query['since']]
+            return self._paginate(issues, query)
+        
+        if path == f"{prefix}/issues/comments":
+            comments = self._repository_comments()
+            if 'since' in query:
+                comments = [c for c in comments if c[2] >= query['since']]
+            return [self._raw_comment(self._processed[number], position)
+                    for _, _, _, number, position in self._paginate(comments, query)]
+        
+        match = re.fullmatch(rf"{re.escape(prefix)}/issues/(\d+)/comments", path)
+        if match:
+            comments = self.thread(int(match.group(1)))
+            if comments is None:
+                return None
+            if 'since' in query:
+                comments = [c for c in comments if c['updated_at'] >= query['since']]
+            return self._paginate(comments, query)
+        
+        return None
+    
+    def _connection(self, items: List[Dict[str, Any]], first: int, after: Optional[str], to_node) -> Dict[str, Any]:
+        """Build a cursor-paginated GraphQL connection; cursors are offsets"""
+        offset = int(after) if after else 0
+        page = items[offset:offset + first]
+        return {
+            'totalCount': len(items),
+            'pageInfo': {'hasNextPage': offset + first < len(items), 'endCursor': str(offset + len(page))},
+            'nodes': [to_node(item) for item in page]
+        }
+    
+    def _graphql_comment(self, comment: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'databaseId': comment['id'],
+            'body': comment['body'],
+            'createdAt': comment['created_at'],
+            'updatedAt': comment['updated_at'],
+            'url': comment['html_url'],
+            'author': {'login': comment['user']['login']}
+        }
+    
+    def _graphql_issue(self, issue: Dict[str, Any], comments_first: int) -> Dict[str, Any]:
+        return {
+            'number': issue['number'],
+            'title': issue['title'],
+            'body': issue['body'] or '',
+            'state': issue['state'].upper(),
+            'createdAt': issue['created_at'],
+            'updatedAt': issue['updated_at'],
+            'url': issue['html_url'],
+            'author': {'login': issue['user']['login'], 'avatarUrl': issue['user']['avatar_url']},
+            'labels': {'nodes': [dict(label) for label in issue['labels']]},
+            'comments': self._connection(self.thread(issue['number']), comments_first, None, self._graphql_comment)
+        }
+    
+    def graphql(self, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer the backend's issue and comment queries from their variables"""
+        if 'number' in variables:
+            thread = self.thread(variables['number']) or []
+            connection = self._connection(thread, variables['first'], variables.get('after'), self._graphql_comment)
+            return {'data': {'repository': {'issue': {'comments': connection}}}}
+        
+        states = [state.lower() for state in variables.get('states') or ['OPEN', 'CLOSED']]
+        issues = [i for i in self.issues if i['state'] in states]
+        comments_first = variables['commentsFirst']
+        connection = self._connection(issues, variables['first'], variables.get('after'),
+                                      lambda issue: self._graphql_issue(issue, comments_first))
+        return {'data': {'repository': {'issues': connection}}}
+    
+    def _make_handler(self):
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            def _begin(self):
+                with server._lock:
+                    server.request_count += 1
+                if server.latency:
+                    time.sleep(server.latency)
+            
+            def _send_json(self, payload: Optional[Any], conditional: bool = False):
+                body = json.dumps(payload if payload is not None else {'message': 'Not Found'}).encode('utf-8')
+                # Like GitHub, listings carry an ETag and a matching If-None-Match gets a bodiless 304
+                etag = f'"{hashlib.sha1(body).hexdigest()}"' if conditional and payload is not None else None
+                if etag and self.headers.get('If-None-Match') == etag:
+                    with server._lock:
+                        server.not_modified_count += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200 if payload is not None else 404)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                if etag:
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def do_GET(self):
+                self._begin()
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                self._send_json(server.route(parsed.path, query), conditional=True)
+            
+            def do_POST(self):
+                self._begin()
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b'{}')
+                if urlparse(self.path).path != '/graphql':
+                    self._send_json(None)
+                    return
+                self._send_json(server.graphql(request.get('variables') or {}))
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+    
+    def start(self) -> 'StubGitHubServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+    
+    def __enter__(self) -> 'StubGitHubServer':
+        return self.start()
+    
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Synthetic Grant Repository
+Generates extracted-issue data shaped like the SIP-31 application template,
+at any size, for benchmarks and load tests
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional
+
+from artifacts import write_artifact
+
+# Relative frequency of each status label, close to the real repository's mix
+LABEL_MIX = {
+    'Awarded': 12,
+    'Recommended for DeGrants': 9,
+    'In Review': 4,
+    'Pending Final Applicant Feedback': 2,
+    'New Application - Needs Review': 2,
+    'Proceeding via Alternate Funding': 2,
+    'Retracted': 1,
+    'Incomplete': 1,
+    'Automatically Closed (Past Deadline)': 1
+}
+CLOSED_LABELS = {'Retracted', 'Incomplete', 'Automatically Closed (Past Deadline)', 'Proceeding via Alternate Funding'}
+# Share of awarded grants also labelled as underway
+IN_PROGRESS_SHARE = 0.1
+# Distinct applicants per issue; the rest apply more than once
+APPLICANT_SHARE = 0.8
+
+WORDS = (
+    'stacks bitcoin wallet contract clarity defi liquidity protocol developer tooling sdk indexer '
+    'bridge oracle governance community education onboarding analytics dashboard api explorer '
+    'security audit testnet mainnet integration users growth ecosystem builders infrastructure'
+).split()
+
+# Reviewer comments cycle through every category and decision the analyzer recognises
+REVIEWER_COMMENTS = [
+    "Thanks for the application! The committee will review this week.",
+    "Could you clarify the budget breakdown per milestone? Please provide more detail on the team.",
+    "We're happy to award the first milestone of this grant. Approved!",
+    "Milestone 1 update received, progress looks good. Payouts pending signatures.",
+    "After review the committee has concerns about the timeline and risk; this one is rejected for now.",
+    "The application is incomplete, we need more information on previous work and traction.",
+    "What is the expected impact on the ecosystem? How will you measure user growth?",
+    "We recommend you consider a smaller scope first; feedback from the committee is attached.",
+    "Awarded via DeGrants, congratulations to the team.",
+    "Status check: has the milestone been completed?"
+]
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+def _paragraph(rng: random.Random, size: int) -> str:
+    """Roughly size characters of filler sentences"""
+    sentences = []
+    length = 0
+    while length < size:
+        sentence = _sentence(rng, rng.randint(6, 16))
+        sentences.append(sentence)
+        length += len(sentence) + 1
+    return ' '.join(sentences)
+
+def application_body(rng: random.Random, number: int, login: str, body_size: int) -> str:
+    """An issue body following the SIP-31 application template, about body_size characters long"""
+    project = f"{rng.choice(WORDS).capitalize()}{rng.choice(WORDS).capitalize()}"
+    budget = rng.randrange(5, 250) * 1000
+    milestones = rng.randint(2, 4)
+    # Template scaffolding is ~1,200 characters; free text fills the rest
+    free_text = max(body_size - 1200, 200) // (4 + milestones)
+    
+    lines = [
+        "## Applicant Information",
+        f"- **Email:** {login}@example.com  ",
+        f"- **Twitter:** [@{login}](https://x.com/{login})  ",
+        f"- **Main project/association:** [{project}](https://example.com/{project.lower()})  ",
+        f"- **Notable ecosystem achievements or impact:**  ",
+        f"  - {_paragraph(rng, free_text)}  ",
+        "",
+        "## Grant Overview",
+        f"- **Grant Name:** _{project} Grant #{number}_  ",
+        f"- **Total Budget (USD, STX, or BTC):** ${budget:,} USD  ",
+        f"- **Grant Goal (in one sentence):** {_sentence(rng, 12)}  ",
+        f"- **Grant Audience:** _{_sentence(rng, 8)}_  ",
+        f"- **Grant Team:** _[@{login}](https://github.com/{login}/)_  ",
+        "",
+        "## Grant Mission, Impact, Risks, and Traction",
+        f"- **Grant Mission:**  ",
+        f"  _{_paragraph(rng, free_text)}_  ",
+        "",
+        f"- **Grant Impact:**  ",
+        f"  _{_paragraph(rng, free_text)}_  ",
+        "",
+        f"- **Grant Risks:**  ",
+        f"  - {_sentence(rng, 10)}  ",
+        f"  - {_sentence(rng, 10)}  ",
+        "",
+        f"- **Traction:**  ",
+        f"  - **Active users:** {rng.randrange(0, 5000)}  ",
+        f"  - **Waitlist:** {rng.randrange(0, 500)}  ",
+        "",
+        "## Grant Roadmap & Deliverables",
+        "- **Milestones:**  "
+    ]
+    for milestone in range(1, milestones + 1):
+        lines.append(f"  - **Milestone {milestone}** ({budget // milestones:,} USD): {_paragraph(rng, free_text)}  ")
+    lines += [
+        "",
+        "## Links",
+        f"- Repository: https://github.com/{login}/{project.lower()}_{rng.choice(WORDS)}",
+        f"- Docs: `https://docs.example.com/{project.lower()}`"
+    ]
+    return '\n'.join(lines)
+
+def generate_repository(issue_count: int, seed: int = 31, mean_comments: float = 5.0,
+                        reviewer_share: float = 0.5, body_size: int = 4000,
+                        label_mix: Optional[Dict[str, int]] = None,
+                        reviewers: Optional[List[str]] = None,
+                        repository: str = 'stacksgov/sip31-interim-grants') -> Dict[str, Any]:
+    """Extracted data for a synthetic grant repository, as github_extractor writes it.
+    
+    Each issue gets a thread of about mean_comments comments of which
+    reviewer_share are by the reviewers; the stub server fills the rest in.
+    The same arguments always produce the same data.
+    """
+    rng = random.Random(seed)
+    label_mix = label_mix or LABEL_MIX
+    labels = list(label_mix)
+    weights = [label_mix[label] for label in labels]
+    reviewers = reviewers or ['cuevasm']
+    start = datetime(2025, 9, 1, tzinfo=timezone.utc)
+    span = 365 * 24 * 3600
+    
+    def timestamp(moment: datetime) -> str:
+        return moment.strftime('%Y-%m-%dT%H:%M:%SZ')
+    
+    issues = []
+    for number in range(1, issue_count + 1):
+        applicant_id = rng.randrange(max(1, int(issue_count * APPLICANT_SHARE)))
+        applicant = f"builder{applicant_id}"
+        created = start + timedelta(seconds=span * number // max(issue_count, 1) + rng.randrange(3600))
+        label = rng.choices(labels, weights)[0]
+        issue_labels = [label]
+        if label == 'Awarded' and rng.random() < IN_PROGRESS_SHARE:
+            issue_labels.insert(0, 'In Progress')
+        
+        total_comments = min(int(rng.expovariate(1 / mean_comments)), 60) if mean_comments else 0
+        reviewer_count = sum(1 for _ in range(total_comments) if rng.random() < reviewer_share)
+        html_url = f"https://github.com/{repository}/issues/{number}"
+        
+        comments = []
+        moment = created
+        for index in range(reviewer_count):
+            moment += timedelta(seconds=rng.randrange(3600, 14 * 24 * 3600))
+            # Above the stub's filler comment ids (issue number * 100000 + index)
+            comment_id = 10 ** 11 + number * 100 + index
+            comment = {
+                'id': comment_id,
+                'body': rng.choice(REVIEWER_COMMENTS),
+                'created_at': timestamp(moment),
+                'updated_at': timestamp(moment),
+                'html_url': f"{html_url}#issuecomment-{comment_id}"
+            }
+            if len(reviewers) > 1:
+                comment['reviewer'] = rng.choice(reviewers)
+            comments.append(comment)
+        
+        issues.append({
+            'number': number,
+            'title': f"SIP-031 Interim Grant - {_sentence(rng, 4)[:-1]}",
+            'body': application_body(rng, number, applicant, body_size),
+            'state': 'closed' if label in CLOSED_LABELS else 'open',
+            'created_at': timestamp(created),
+            'updated_at': timestamp(moment + timedelta(seconds=rng.randrange(3600))),
+            'html_url': html_url,
+            'user': {
+                'login': applicant,
+                'avatar_url': f"https://avatars.githubusercontent.com/u/{90000000 + applicant_id}?v=4"
+            },
+            'labels': issue_labels,
+            'total_comments': total_comments,
+            'cuevasm_comments': comments,
+            'cuevasm_comment_count': len(comments)
+        })
+    
+    data = {
+        'extraction_date': timestamp(start),
+        'repository': repository,
+        'target_user': reviewers[0],
+        'summary': {
+            'total_issues': len(issues),
+            'total_cuevasm_comments': sum(issue['cuevasm_comment_count'] for issue in issues),
+            'issues_with_cuevasm_comments': sum(1 for issue in issues if issue['cuevasm_comment_count'])
+        },
+        'issues': issues
+    }
+    if len(reviewers) > 1:
+        data['reviewers'] = reviewers
+    return data
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic SIP-31 grant repository')
+    parser.add_argument('issues', type=int, help='Number of issues')
+    parser.add_argument('--output', default='synthetic_issues_data.jsonl',
+                        help='Artifact to write (.jsonl, .json or .db)')
+    parser.add_argument('--seed', type=int, default=31, help='Random seed')
+    parser.add_argument('--mean-comments', type=float, default=5.0, help='Mean comments per issue')
+    parser.add_argument('--reviewer-share', type=float, default=0.5, help='Share of comments written by reviewers')
+    parser.add_argument('--body-size', type=int, default=4000, help='Approximate issue body length in characters')
+    parser.add_argument('--reviewer', action='append', dest='reviewers', help='Reviewer login (repeatable)')
+    args = parser.parse_args()
+    
+    data = generate_repository(args.issues, seed=args.seed, mean_comments=args.mean_comments,
+                               reviewer_share=args.reviewer_share, body_size=args.body_size,
+                               reviewers=args.reviewers)
+    write_artifact(args.output, data)
+    print(f"Wrote {data['summary']['total_issues']} issues with "
+          f"{data['summary']['total_cuevasm_comments']} reviewer comments to {args.output}")
+
+if __name__ == "__main__":
+    main()
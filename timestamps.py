@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Timestamps
+Parses GitHub's ISO 8601 timestamps once into epoch seconds and formats
+them for display through a bounded cache, in UTC or any IANA timezone
+"""
+
+import calendar
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, Optional
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python < 3.9: only UTC display is available
+    ZoneInfo = None
+
+DISPLAY_FORMAT = '%B %d, %Y at %I:%M %p'
+# Distinct timestamps kept parsed / formatted; a repository's issues and
+# comments share few enough that a full run is served from the caches
+PARSE_CACHE_SIZE = 65536
+FORMAT_CACHE_SIZE = 16384
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def to_epoch(iso_date: str) -> int:
+    """Epoch seconds of an ISO 8601 timestamp; naive timestamps are taken as UTC.
+    
+    GitHub's own form ('2025-09-03T05:08:09Z') is sliced into integers
+    without building a datetime; anything else (offsets, fractions, plain
+    dates) goes through datetime.fromisoformat. Raises ValueError when the
+    string is not a timestamp.
+    """
+    if len(iso_date) == 20 and iso_date[10] == 'T' and iso_date[19] == 'Z':
+        return calendar.timegm((int(iso_date[0:4]), int(iso_date[5:7]), int(iso_date[8:10]),
+                                int(iso_date[11:13]), int(iso_date[14:16]), int(iso_date[17:19])))
+    moment = datetime.fromisoformat(iso_date.replace('Z', '+00:00'))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+def to_iso(epoch: int) -> str:
+    """The '+00:00' ISO form of epoch seconds, as datetime.isoformat() writes it"""
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+def display_zone(name: Optional[str]):
+    """tzinfo for an IANA timezone name; None or 'UTC' means UTC"""
+    if not name or name.upper() == 'UTC':
+        return timezone.utc
+    if ZoneInfo is None:
+        raise ValueError(f"Timezone {name!r} needs Python 3.9 or newer; only UTC is available")
+    try:
+        return ZoneInfo(name)
+    except (KeyError, ValueError):
+        raise ValueError(f"Unknown timezone: {name!r}")
+
+class DateFormatter:
+    """Formats epoch seconds for display in one timezone, memoizing the results.
+    
+    Issues are updated when they are commented on, so the same timestamps
+    recur across an issue, its comments and its activity summary; each is
+    formatted once. When the cache is full the oldest entries are dropped.
+    """
+    
+    def __init__(self, display_timezone: Optional[str] = None, date_format: str = DISPLAY_FORMAT,
+                 max_entries: int = FORMAT_CACHE_SIZE):
+        self.timezone = display_timezone or 'UTC'
+        self.zone = display_zone(display_timezone)
+        self.date_format = date_format
+        self.max_entries = max_entries
+        self._formatted: Dict[int, str] = {}
+    
+    def format(self, epoch: int) -> str:
+        formatted = self._formatted.get(epoch)
+        if formatted is None:
+            if len(self._formatted) >= self.max_entries:
+                del self._formatted[next(iter(self._formatted))]
+            formatted = self._formatted[epoch] = datetime.fromtimestamp(epoch, self.zone).strftime(self.date_format)
+        return formatted
+    
+    def format_iso(self, iso_date: str) -> str:
+        """Format an ISO timestamp, returning it unchanged if it cannot be parsed"""
+        try:
+            return self.format(to_epoch(iso_date))
+        except (TypeError, ValueError):
+            return iso_date
+    
+    def settings(self) -> Dict[str, str]:
+        return {'timezone': self.timezone, 'date_format': self.date_format}
@@ -0,0 +1,539 @@
+#!/usr/bin/env python3
+"""
+Webhook Receiver
+Applies GitHub issues, issue_comment and label webhook events to the stored
+issues and refreshes the analysis report and dashboard data for just the
+issues they touch, so the dashboard stays current without polling
+"""
+
+import argparse
+import copy
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Iterator, Optional, Set, Tuple
+
+from artifacts import (DATA_DIR, append_issues, issues_path, is_jsonl, iter_records, iter_issues, read_metadata,
+                       write_artifact)
+from data_processor import add_date_arguments
+from github_extractor import DEFAULT_REPOSITORY, DEFAULT_REVIEWERS, GitHubExtractor
+from pipeline import IncrementalPipeline
+from sqlite_store import IssueStore, is_sqlite
+from timestamps import DISPLAY_FORMAT, to_epoch
+
+EVENTS = ('issues', 'issue_comment', 'label')
+# Seconds between a flush and the rewrite of the outputs covering every issue
+DEFAULT_PUBLISH_INTERVAL = 2.0
+# Issue actions after which the issue is no longer in the repository
+REMOVING_ACTIONS = ('deleted', 'transferred')
+
+class WebhookError(Exception):
+    """An event the receiver refuses; carries the HTTP status"""
+    
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Check GitHub's X-Hub-Signature-256 header (HMAC-SHA256 of the raw body)"""
+    expected = 'sha256=' + hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature or '')
+
+def iter_recorded_events(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """(event name, payload) of every delivery in a recording"""
+    for record_type, data in iter_records(path):
+        if record_type == 'event':
+            yield data['event'], data['payload']
+
+class WebhookReceiver:
+    """Keeps the issues artifact and the pipeline outputs in step with webhook events.
+    
+    Events are normalized by the extractor's own process_issue and
+    extract_cuevasm_comments, so an issue updated from events is stored
+    exactly as an extraction would store it. The issues and their web
+    records stay in memory between events and each event is handed to
+    IncrementalPipeline.apply_changes as the few issues it touched, skipping
+    the diff over the whole artifact.
+    
+    Applying an event to the issues takes microseconds, and a flush only
+    writes what the touched issues own: their rows (a SQLite upsert, or
+    records appended to a JSON Lines artifact) and their detail shards.
+    Events that arrive while a flush is being written are written together
+    by the next one, and each event's issue and shard are on disk by the
+    time handle() returns. The outputs covering every issue (index, search
+    index, web data file, analysis report) grow with the repository, so
+    they are published at most once per publish_interval seconds and a
+    burst of events costs one rewrite.
+    
+    Events do not move the extractor's sync mark. Instead each touched
+    issue's pre-event updated_at is kept in the sync state, so the next
+    incremental extraction (a reconciliation) refetches those comment threads
+    and picks up anything the events missed.
+    """
+    
+    def __init__(self, data_dir: Optional[str] = None, repository: Optional[str] = None,
+                 reviewers: Optional[List[str]] = None, record_file: Optional[str] = None,
+                 display_timezone: Optional[str] = None, date_format: str = DISPLAY_FORMAT,
+                 publish_interval: float = DEFAULT_PUBLISH_INTERVAL):
+        issues_file = issues_path(data_dir)
+        metadata = read_metadata(issues_file) if os.path.exists(issues_file) else {}
+        # Defaults follow the stored extraction, whose reviewers the stored comments were filtered by
+        self.repository = repository or metadata.get('repository', DEFAULT_REPOSITORY)
+        self.reviewers = list(reviewers or metadata.get('reviewers') or DEFAULT_REVIEWERS)
+        
+        self.pipeline = IncrementalPipeline(data_dir, repository=self.repository, reviewers=self.reviewers,
+                                            display_timezone=display_timezone, date_format=date_format)
+        # Used only to normalize payloads and hold the sync state; it makes no requests
+        self.extractor = GitHubExtractor(state_file=self.pipeline.sync_file, repository=self.repository,
+                                         reviewers=self.reviewers)
+        self.record_file = record_file
+        # _lock guards the issues and pending changes; _flush_lock serializes writing them out
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Set[int] = set()
+        self._pending_removed: Set[int] = set()
+        # Flushed changes not yet in the index, search index and web data file;
+        # with publish_interval 0 they are published by every flush
+        self.publish_interval = publish_interval
+        self._unpublished = False
+        self._publish_timer: Optional[threading.Timer] = None
+        # Records appended to a JSON Lines artifact since it was last written whole
+        self._appended = 0
+        # Set when a baseline was added or dropped, so the sync state needs saving
+        self._sync_changed = False
+        self.stats = {'received': 0, 'applied': 0, 'ignored': 0, 'flushes': 0, 'publishes': 0, 'seconds': 0.0}
+        self._load()
+    
+    def _load(self):
+        """Read the stored issues and bring the pipeline outputs up to date with them"""
+        issues_file = self.pipeline.issues_file
+        if os.path.exists(issues_file):
+            self.metadata = read_metadata(issues_file)
+            self.issues = {issue['number']: issue for issue in iter_issues(issues_file)}
+        else:
+            self.metadata = {**self.extractor.result_header(), 'summary': self.extractor.summarize([])}
+            self.issues = {}
+        self.extractor.sync_state = self.extractor._load_sync_state()
+        
+        self.web_issues = self.pipeline.previous_web_issues()
+        if self.issues:
+            dirty, removed, order = self.pipeline.find_changes(self.web_issues)
+            if dirty or removed:
+                self.pipeline.apply_changes(dirty, removed, order, self.web_issues, metadata=self.metadata)
+    
+    def handle(self, event: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply one event and write it out; returns what it changed and how long that took"""
+        start = time.perf_counter()
+        with self._lock:
+            self.stats['received'] += 1
+            result = {'event': event, 'action': payload.get('action')}
+            reason = self._ignore_reason(event, payload)
+            if reason:
+                self.stats['ignored'] += 1
+                return {**result, 'ignored': reason}
+            
+            if event == 'issues':
+                changed, removed = self._apply_issue_event(payload)
+            elif event == 'issue_comment':
+                changed, removed = self._apply_comment_event(payload)
+            else:
+                changed, removed = self._apply_label_event(payload)
+            if self.record_file:
+                # Only events that applied cleanly, so a recording always replays
+                with open(self.record_file, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'type': 'event', 'data': {'event': event, 'payload': payload}},
+                                       ensure_ascii=False) + '\n')
+            
+            for issue in changed:
+                self._pending.add(issue['number'])
+                self._pending_removed.discard(issue['number'])
+            for number in removed:
+                self._pending_removed.add(number)
+                self._pending.discard(number)
+            if changed or removed:
+                self.stats['applied'] += 1
+        
+        if changed or removed:
+            self.flush()
+        seconds = time.perf_counter() - start
+        with self._lock:
+            self.stats['seconds'] += seconds
+        return {
+            **result,
+            'changed': [issue['number'] for issue in changed],
+            'removed': removed,
+            'seconds': round(seconds, 4)
+        }
+    
+    def flush(self) -> int:
+        """Write every pending change to the issues artifact and the touched issues' shards,
+        and schedule a publish.
+        
+        Returns the number of issues written; 0 when a concurrent flush
+        already wrote them.
+        """
+        with self._flush_lock:
+            with self._lock:
+                changed = [self.issues[number] for number in sorted(self._pending)]
+                removed = sorted(self._pending_removed)
+                self._pending, self._pending_removed = set(), set()
+                if not changed and not removed:
+                    return 0
+                self._store(changed, removed)
+                metadata = dict(self.metadata)
+            
+            self.pipeline.update(changed, removed, self.web_issues, metadata=metadata)
+            self.stats['flushes'] += 1
+            self._unpublished = True
+            if self.publish_interval <= 0:
+                self._publish()
+            elif self._publish_timer is None:
+                self._publish_timer = threading.Timer(self.publish_interval, self.publish)
+                self._publish_timer.daemon = True
+                self._publish_timer.start()
+            return len(changed) + len(removed)
+    
+    def publish(self) -> bool:
+        """Rewrite the index, search index, web data file and analysis report
+        if anything was flushed since the last publish; returns whether it was"""
+        with self._flush_lock:
+            return self._publish()
+    
+    def _publish(self) -> bool:
+        if self._publish_timer:
+            self._publish_timer.cancel()
+            self._publish_timer = None
+        if not self._unpublished:
+            return False
+        with self._lock:
+            order = list(self.issues)
+        self.pipeline.publish(order, self.web_issues)
+        self._unpublished = False
+        self.stats['publishes'] += 1
+        return True
+    
+    def _ignore_reason(self, event: str, payload: Dict[str, Any]) -> Optional[str]:
+        if event not in EVENTS:
+            return f"unsupported event {event!r}"
+        if payload.get('repository', {}).get('full_name', '').lower() != self.repository.lower():
+            return 'other repository'
+        if 'pull_request' in payload.get('issue', {}):
+            # The extractor skips pull requests, which the issues API also lists
+            return 'pull request'
+        return None
+    
+    def _baseline(self, number: int):
+        """Remember the issue as last reconciled, before the first event touches it"""
+        baseline = self.extractor.sync_state.setdefault('webhook_baseline', {})
+        if str(number) not in baseline:
+            previous = self.issues.get(number)
+            baseline[str(number)] = previous['updated_at'] if previous else None
+            self._sync_changed = True
+    
+    def _is_stale(self, previous: Optional[Dict[str, Any]], raw_issue: Dict[str, Any]) -> bool:
+        """Deliveries can arrive out of order; an older copy of the issue must not win"""
+        return previous is not None and to_epoch(raw_issue['updated_at']) < to_epoch(previous['updated_at'])
+    
+    def _apply_issue_event(self, payload: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        raw_issue = payload['issue']
+        number = raw_issue['number']
+        previous = self.issues.get(number)
+        
+        if payload['action'] in REMOVING_ACTIONS:
+            if previous is None:
+                return [], []
+            del self.issues[number]
+            baseline = self.extractor.sync_state.get('webhook_baseline', {})
+            if str(number) in baseline:
+                del baseline[str(number)]
+                self._sync_changed = True
+            return [], [number]
+        
+        if self._is_stale(previous, raw_issue):
+            return [], []
+        
+        self._baseline(number)
+        comments = previous['cuevasm_comments'] if previous else []
+        issue = self.extractor.process_issue(raw_issue, comments, raw_issue.get('comments', 0))
+        self.issues[number] = issue
+        return [issue], []
+    
+    def _apply_comment_event(self, payload: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        raw_issue = payload['issue']
+        number = raw_issue['number']
+        previous = self.issues.get(number)
+        
+        merged = {comment['id']: comment for comment in (previous['cuevasm_comments'] if previous else [])}
+        if payload['action'] == 'deleted':
+            merged.pop(payload['comment']['id'], None)
+        else:
+            for comment in self.extractor.extract_cuevasm_comments([payload['comment']]):
+                merged[comment['id']] = comment
+        comments = sorted(merged.values(), key=lambda c: to_epoch(c['created_at']))
+        
+        self._baseline(number)
+        if self._is_stale(previous, raw_issue):
+            # Keep the newer issue fields, but the comment change still applies
+            issue = {**previous, 'cuevasm_comments': comments, 'cuevasm_comment_count': len(comments)}
+        else:
+            issue = self.extractor.process_issue(raw_issue, comments, raw_issue.get('comments', 0))
+        if issue == previous:
+            return [], []
+        self.issues[number] = issue
+        return [issue], []
+    
+    def _apply_label_event(self, payload: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """Rename or drop a repository label on every issue carrying it"""
+        action = payload['action']
+        if action == 'edited':
+            old_name = payload.get('changes', {}).get('name', {}).get('from')
+            new_name = payload['label']['name']
+        elif action == 'deleted':
+            old_name, new_name = payload['label']['name'], None
+        else:
+            return [], []
+        if not old_name or old_name == new_name:
+            return [], []
+        
+        changed = []
+        for number, issue in self.issues.items():
+            if old_name in issue['labels']:
+                labels = [new_name if label == old_name else label for label in issue['labels']]
+                issue = {**issue, 'labels': [label for label in labels if label is not None]}
+                self.issues[number] = issue
+                changed.append(issue)
+        return changed, []
+    
+    def _store(self, changed: List[Dict[str, Any]], removed: List[int]):
+        """Write the touched issues to the issues artifact and new baselines to the sync state"""
+        self.metadata['summary'] = self.extractor.summarize(self.issues.values())
+        header = {key: value for key, value in self.metadata.items() if key != 'summary'}
+        issues_file = self.pipeline.issues_file
+        
+        if is_sqlite(issues_file):
+            positions = {number: position for position, number in enumerate(self.issues)}
+            with IssueStore(issues_file) as store:
+                with store.conn:
+                    for issue in changed:
+                        store.upsert_issue(issue, positions[issue['number']])
+                    for number in removed:
+                        store.remove_issue(number)
+                    store.set_metadata('header', header)
+                    store.set_metadata('summary', self.metadata['summary'])
+        elif is_jsonl(issues_file) and self._appended + len(changed) + len(removed) <= len(self.issues):
+            # Only the touched issues are appended (see artifacts.py); once the
+            # appended records would outnumber the issues the file is written
+            # whole instead, so reading it never costs more than twice as much
+            self._appended += append_issues(issues_file, changed, removed, self.metadata['summary'])
+        else:
+            # A single-document artifact can only be rewritten. Written aside
+            # and swapped in, as the extractor does, so readers never see half a file
+            base, extension = os.path.splitext(issues_file)
+            partial_file = f"{base}.partial{extension}"
+            write_artifact(partial_file, {**header, 'issues': list(self.issues.values()),
+                                          'summary': self.metadata['summary']})
+            os.replace(partial_file, issues_file)
+            self._appended = 0
+        if self._sync_changed:
+            self.extractor.save_sync_state()
+            self._sync_changed = False
+    
+    def reconcile(self) -> Dict[str, Any]:
+        """Run an incremental extraction and write what it changed; catches missed events.
+        
+        The extraction works on a snapshot of the issues and sync state, so
+        events keep being applied while it fetches; the locks are only taken
+        to swap its results in. An issue an event touched in the meantime
+        keeps the event's version and its baseline, so the next
+        reconciliation refetches it.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            snapshot = dict(self.issues)
+            sync_state = copy.deepcopy(self.extractor.sync_state)
+        
+        extractor = GitHubExtractor(max_workers=self.pipeline.max_workers, repository=self.repository,
+                                    reviewers=self.reviewers, scheduler=self.pipeline.scheduler)
+        extractor.sync_state = sync_state
+        fetched = {issue['number']: issue for issue in extractor.iter_incremental(lambda: iter(snapshot.values()))}
+        extract_seconds = time.perf_counter() - start
+        
+        with self._lock:
+            # Issues are replaced, never mutated, so identity tells what events changed
+            touched = {number for number, issue in self.issues.items() if snapshot.get(number) is not issue}
+            removed_by_events = set(snapshot) - set(self.issues)
+            issues = {number: self.issues[number] if number in touched else issue
+                      for number, issue in fetched.items() if number not in removed_by_events}
+            for number in touched:
+                issues.setdefault(number, self.issues[number])
+            changed = [number for number, issue in issues.items()
+                       if number not in touched and snapshot.get(number) is not issue]
+            removed = [number for number in snapshot if number not in issues and number not in removed_by_events]
+            
+            baseline = {number: updated_at
+                        for number, updated_at in self.extractor.sync_state.get('webhook_baseline', {}).items()
+                        if int(number) in touched}
+            if baseline:
+                extractor.sync_state['webhook_baseline'] = baseline
+            self.extractor.sync_state = extractor.sync_state
+            self.issues = issues
+            self.metadata.update(extractor.result_header())
+            
+            for number in changed:
+                self._pending.add(number)
+                self._pending_removed.discard(number)
+            for number in removed:
+                self._pending_removed.add(number)
+                self._pending.discard(number)
+            if changed or removed:
+                self._sync_changed = True
+            else:
+                # Nothing to write, but keep the advanced sync mark and validators
+                self.extractor.save_sync_state()
+        
+        self.flush()
+        return {
+            'total_issues': len(issues),
+            'dirty_issues': len(changed),
+            'removed_issues': len(removed),
+            'timings': {'extract': round(extract_seconds, 3), 'total': round(time.perf_counter() - start, 3)}
+        }
+    
+    def replay(self, path: str) -> List[Dict[str, Any]]:
+        """Apply every event of a recording, in order, then publish"""
+        results = [self.handle(event, payload) for event, payload in iter_recorded_events(path)]
+        self.publish()
+        return results
+
+class WebhookServer:
+    def __init__(self, receiver: WebhookReceiver, host: str = '127.0.0.1', port: int = 8032,
+                 secret: Optional[str] = None):
+        self.receiver = receiver
+        self.secret = secret
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+    
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def _make_handler(self):
+        receiver = self.receiver
+        secret = self.secret
+        
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status: int, payload: Any):
+                body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def _receive(self) -> Dict[str, Any]:
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if secret and not verify_signature(secret, body, self.headers.get('X-Hub-Signature-256')):
+                    raise WebhookError(401, 'Bad signature')
+                event = self.headers.get('X-GitHub-Event')
+                if not event:
+                    raise WebhookError(400, 'Missing X-GitHub-Event header')
+                if event == 'ping':
+                    return {'event': 'ping', 'zen': 'pong'}
+                try:
+                    payload = json.loads(body)
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    raise WebhookError(400, 'Body is not JSON')
+                try:
+                    return receiver.handle(event, payload)
+                except (KeyError, TypeError, ValueError) as e:
+                    raise WebhookError(400, f"Malformed {event} payload: {e!r}")
+            
+            def do_POST(self):
+                try:
+                    result = self._receive()
+                except WebhookError as e:
+                    self._send(e.status, {'message': str(e)})
+                    return
+                self._send(200, result)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        return Handler
+    
+    def start(self) -> 'WebhookServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply GitHub webhook events to the SIP-31 grant data as they arrive')
+    parser.add_argument('--data-dir', default=DATA_DIR,
+                        help='Directory holding the artifacts (defaults to $SIP31_DATA_DIR or the current directory)')
+    parser.add_argument('--repo', help='Repository whose events are applied (default: the stored extraction\'s)')
+    parser.add_argument('--reviewer', action='append', dest='reviewers',
+                        help='Reviewer whose comments are kept; repeat for several (default: the stored extraction\'s)')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to listen on')
+    parser.add_argument('--port', type=int, default=8032, help='Port to listen on')
+    parser.add_argument('--secret', default=os.environ.get('GITHUB_WEBHOOK_SECRET'),
+                        help='Webhook secret used to verify X-Hub-Signature-256 (default: $GITHUB_WEBHOOK_SECRET)')
+    parser.add_argument('--record', metavar='FILE', help='Append every received event to FILE (JSON Lines)')
+    parser.add_argument('--replay', metavar='FILE', help='Apply the events recorded in FILE and exit')
+    parser.add_argument('--reconcile-every', type=float, metavar='HOURS',
+                        help='Also run an incremental extraction this often to catch missed events')
+    parser.add_argument('--publish-every', type=float, default=DEFAULT_PUBLISH_INTERVAL, metavar='SECONDS',
+                        help='Rewrite the index, search index and web data at most this often; 0 after every event '
+                             '(default: %(default)s)')
+    add_date_arguments(parser)
+    args = parser.parse_args()
+    
+    receiver = WebhookReceiver(args.data_dir, repository=args.repo, reviewers=args.reviewers,
+                               record_file=args.record, display_timezone=args.timezone,
+                               date_format=args.date_format, publish_interval=args.publish_every)
+    
+    if args.replay:
+        for result in receiver.replay(args.replay):
+            if 'ignored' in result:
+                print(f"{result['event']}.{result['action']}: ignored ({result['ignored']})")
+            else:
+                print(f"{result['event']}.{result['action']}: changed {result['changed']}, "
+                      f"removed {result['removed']} in {result['seconds'] * 1000:.1f}ms")
+        stats = receiver.stats
+        print(f"\nReplayed {stats['received']} events ({stats['applied']} applied, {stats['ignored']} ignored) "
+              f"in {stats['seconds']:.3f}s, published {stats['publishes']} times")
+        return
+    
+    server = WebhookServer(receiver, args.host, args.port, secret=args.secret)
+    print(f"Receiving {receiver.repository} events for {len(receiver.issues)} issues at {server.url}")
+    if not args.secret:
+        print("No webhook secret set; deliveries are not verified")
+    
+    stop = threading.Event()
+    if args.reconcile_every:
+        def reconcile_periodically():
+            while not stop.wait(args.reconcile_every * 3600):
+                result = receiver.reconcile()
+                print(f"Reconciled: {result['dirty_issues']} issues changed, {result['removed_issues']} removed")
+        threading.Thread(target=reconcile_periodically, daemon=True).start()
+    
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped")
+    finally:
+        stop.set()
+        server.httpd.server_close()
+        receiver.publish()
+
+if __name__ == "__main__":
+    main()